@@ -1,5 +1,6 @@
 import pygame
 from utils.geometry import distance, direction_vector
+from utils.spatial import KICK_RANGE, PASS_RANGE, contact_point
 
 class AIController:
     def __init__(self, player, role="striker"):
@@ -39,11 +40,13 @@ class AIController:
                 self.player.kick_ball(ball)
 
         else:
-            self._move_toward(ball_pos)
+            # Topun şu anki yerine değil, yetişilebilecek en erken noktaya koş
+            _, ix, iy = ball.intercept(self.player)
+            self._move_toward((ix, iy))
             if can_act_on_ball:
-                if teammate and distance(player_pos, (teammate.x, teammate.y)) < 120:
+                if teammate and self._near(teammate, PASS_RANGE):
                     self.player.pass_to(teammate, ball)
-                elif distance(player_pos, ball_pos) < 25:
+                elif self._near(ball, 25):
                     self.player.kick_ball(ball)
 
     def _play_defender(self, player_pos, ball_pos, teammate, ball, can_act_on_ball, ball_owner):
@@ -54,15 +57,23 @@ class AIController:
 
         if ball_owner and ball_owner.team != self.player.team and ball.x < 400:
             self._move_toward((ball_owner.x - 20, ball_owner.y))
-        elif distance(player_pos, ball_pos) < 40:
+        elif self._near(ball, KICK_RANGE):
             self._move_toward(ball_pos)
 
-        if can_act_on_ball and distance(player_pos, ball_pos) < 25:
+        if can_act_on_ball and self._near(ball, 25):
             if teammate:
                 self.player.pass_to(teammate, ball)
             else:
                 self.player.kick_ball(ball)
 
+    def _near(self, other, radius):
+        """Yakınlık testi: indeks varsa ızgara sorgusu, yoksa doğrudan mesafe.
+        İki yol da temas noktalarını (oyuncu ayağı, top merkezi) ölçer."""
+        index = self.player.index
+        if index is not None:
+            return other in index.near(self.player, radius)
+        return distance(contact_point(self.player), contact_point(other)) < radius
+
     def _move_toward(self, target_pos):
         dx, dy = direction_vector((self.player.x, self.player.y), target_pos)
 
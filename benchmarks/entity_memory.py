@@ -0,0 +1,63 @@
+"""
+Entity memory – bytes per match, slotted vs dict-backed
+=======================================================
+
+Builds many matches (one Ball, one Stadium, two Teams of N players) and
+measures allocated bytes with ``tracemalloc``.  The "dict" column uses
+clones of the same classes with ``__slots__`` stripped, i.e. the layout
+before entities were slotted.
+
+    python -m benchmarks.entity_memory
+"""
+
+from __future__ import annotations
+
+import gc
+import tracemalloc
+
+from core.ball import Ball
+from core.player import Player
+from core.stadium import Stadium
+from core.team import Team
+
+MATCHES = 5_000
+
+
+def _dict_backed(cls: type) -> type:
+    """Copy of *cls* without ``__slots__`` (instances get a ``__dict__``)."""
+    skip = {"__slots__", "__dict__", "__weakref__", *cls.__slots__}
+    ns = {k: v for k, v in vars(cls).items() if k not in skip}
+    return type(cls.__name__, (), ns)
+
+
+def _build(classes: dict[str, type], n_per_side: int) -> list:
+    B, P, T, S = classes["ball"], classes["player"], classes["team"], classes["stadium"]
+    return [(B(400, 300), S(800, 560),
+             T("red",  [P(100, 280, "red",  True, f"R{i}") for i in range(n_per_side)]),
+             T("blue", [P(660, 280, "blue", True, f"B{i}") for i in range(n_per_side)]))
+            for _ in range(MATCHES)]
+
+
+def bytes_per_match(classes: dict[str, type], n_per_side: int) -> float:
+    gc.collect()
+    tracemalloc.start()
+    base = tracemalloc.get_traced_memory()[0]
+    matches = _build(classes, n_per_side)
+    used = tracemalloc.get_traced_memory()[0] - base
+    tracemalloc.stop()
+    del matches
+    return used / MATCHES
+
+
+def main() -> None:
+    slotted = dict(ball=Ball, player=Player, team=Team, stadium=Stadium)
+    legacy  = {k: _dict_backed(c) for k, c in slotted.items()}
+    print(f"{'players/side':>13}{'dict B/match':>15}{'slots B/match':>15}{'saved':>8}")
+    for n in (1, 5, 11):
+        before = bytes_per_match(legacy, n)
+        after  = bytes_per_match(slotted, n)
+        print(f"{n:>13}{before:>15,.0f}{after:>15,.0f}{1 - after / before:>8.0%}")
+
+
+if __name__ == "__main__":
+    main()
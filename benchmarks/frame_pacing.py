@@ -0,0 +1,81 @@
+"""
+Frame pacing – sync vs threaded agent decisions
+===============================================
+
+Runs the game-loop work (AI controller + physics, no rendering) at 60 FPS
+for each ``AgentController`` mode.  The policy is the exported NumPy actor
+plus a synthetic per-call delay drawn from a heavy-tailed distribution,
+which emulates inference on a low-end CPU (median ~6 ms, occasional
+30–60 ms stalls).  Reported per mode: frame work time p50/p99, frames over
+the 16.7 ms budget, and action staleness in frames.
+
+    python -m benchmarks.frame_pacing [--frames 600] [--median-ms 6]
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import time
+
+import numpy as np
+
+from controllers.agent_controller import AgentController
+from core.ball import Ball
+from core.player import Player
+from rl_agent.numpy_policy import DEFAULT_OUT, NumpyPolicy
+
+FRAME = 1 / 60
+
+
+def slow_policy(median_ms: float, seed: int = 0):
+    pi = NumpyPolicy.load(DEFAULT_OUT)
+    rng = random.Random(seed)
+
+    def act(obs):
+        time.sleep(rng.lognormvariate(0, 0.8) * median_ms / 1000)
+        return int(pi.predict(obs)[0][0])
+    return act
+
+
+def run(mode: str, frames: int, median_ms: float, k: int = 2) -> dict:
+    ball = Ball(400, 320)
+    blue = Player(700, 300, "blue", True, "AI")
+    ctrl = AgentController(blue, slow_policy(median_ms), mode, k=k, budget_ms=4.0)
+    work = []
+    for f in range(frames):
+        t0 = time.perf_counter()
+        obs = np.array([[blue.x, blue.y - 40, ball.x, ball.y - 40,
+                         ball.vel_x / 10, ball.vel_y / 10]], np.float32)
+        ctrl.observe(obs, f)
+        ctrl.apply(ctrl.action(f), ball)
+        ball.move()
+        dt = time.perf_counter() - t0
+        work.append(dt * 1e3)
+        time.sleep(max(0.0, FRAME - dt))
+    ctrl.stop()
+    work.sort()
+    s = ctrl.stats()
+    return dict(mode=mode if mode not in ("sync", "every_k") else f"{mode} (k={k})",
+                p50=work[len(work) // 2], p99=work[int(len(work) * 0.99)],
+                late=sum(w > FRAME * 1e3 for w in work),
+                stale_mean=s["staleness_mean"], stale_max=s["staleness_max"],
+                decisions=s["decisions"])
+
+
+def main() -> None:
+    p = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    p.add_argument("--frames", type=int, default=600)
+    p.add_argument("--median-ms", type=float, default=6.0)
+    a = p.parse_args()
+    print(f"{'mode':<16}{'work p50':>9}{'p99 ms':>8}{'late':>6}"
+          f"{'stale μ':>9}{'max':>5}{'decisions':>11}")
+    for mode, k in (("sync", 1), ("sync", 2), ("every_frame", 1),
+                    ("every_k", 2), ("budget", 1)):
+        r = run(mode, a.frames, a.median_ms, k)
+        print(f"{r['mode']:<16}{r['p50']:>9.2f}{r['p99']:>8.2f}{r['late']:>6}"
+              f"{r['stale_mean']:>9.2f}{r['stale_max']:>5}{r['decisions']:>11}")
+
+
+if __name__ == "__main__":
+    main()
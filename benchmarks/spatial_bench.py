@@ -0,0 +1,93 @@
+"""
+Spatial hash vs brute force – proximity query benchmark
+=======================================================
+
+Each simulated frame moves every player one step, then runs the queries
+the game makes: players in kick range of the ball (40 px) and, for every
+player, opponents in tackle range (25 px) and teammates in pass range
+(120 px).  Brute force is the current O(n²) loop over all players.
+
+    python -m benchmarks.spatial_bench
+"""
+
+from __future__ import annotations
+
+import random
+import time
+
+from core.ball import Ball
+from core.player import Player
+from utils.spatial import (
+    KICK_RANGE, PASS_RANGE, TACKLE_RANGE, SpatialHash, contact_point,
+)
+
+DIRS = ("up", "down", "left", "right")
+
+
+def _world(n_entities: int, seed: int = 0):
+    rng = random.Random(seed)
+    ball = Ball(400, 300)
+    players = [Player(rng.uniform(0, 760), rng.uniform(0, 560),
+                      "red" if i % 2 else "blue")
+               for i in range(n_entities - 1)]
+    return rng, ball, players
+
+
+def _brute(ball, players) -> int:
+    hits = 0
+    for p in players:
+        px, py = contact_point(p)
+        if (px - ball.x) ** 2 + (py - ball.y) ** 2 < KICK_RANGE ** 2:
+            hits += 1
+        for q in players:
+            if q is p:
+                continue
+            qx, qy = contact_point(q)
+            d2 = (px - qx) ** 2 + (py - qy) ** 2
+            if q.team != p.team and d2 < TACKLE_RANGE ** 2:
+                hits += 1
+            elif q.team == p.team and d2 < PASS_RANGE ** 2:
+                hits += 1
+    return hits
+
+
+def _indexed(index, ball, players) -> int:
+    hits = len(index.query(ball.x, ball.y, KICK_RANGE, exclude=ball))
+    for p in players:
+        other = "red" if p.team == "blue" else "blue"
+        hits += len(index.near(p, TACKLE_RANGE, team=other))
+        hits += len(index.near(p, PASS_RANGE, team=p.team))
+    return hits
+
+
+def run(n_entities: int, frames: int = 200) -> dict:
+    results = {}
+    for mode in ("brute", "grid"):
+        rng, ball, players = _world(n_entities)
+        index = None
+        if mode == "grid":
+            index = SpatialHash()
+            for e in (ball, *players):
+                index.insert(e)
+        moves = [[rng.choice(DIRS) for _ in players] for _ in range(frames)]
+        total = 0
+        t0 = time.perf_counter()
+        for step in moves:
+            for p, d in zip(players, step):
+                p.move(d)
+            total += _brute(ball, players) if index is None else _indexed(index, ball, players)
+        results[mode] = (time.perf_counter() - t0) / frames * 1e6
+        results[mode + "_hits"] = total
+    assert results["brute_hits"] == results["grid_hits"], "index disagrees with brute force"
+    return results
+
+
+def main() -> None:
+    print(f"{'entities':>9}{'brute µs/frame':>16}{'grid µs/frame':>16}{'speed-up':>10}")
+    for n in (2, 22, 100, 250, 500):
+        r = run(n, frames=200 if n <= 100 else 40)
+        print(f"{n:>9}{r['brute']:>16,.1f}{r['grid']:>16,.1f}{r['brute'] / r['grid']:>9.1f}×")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,360 @@
+"""
+Simulation micro-benchmarks with regression tracking
+====================================================
+
+Times the hot paths of the simulation and the agent at several sizes:
+
+    ball.move / player.move / player.kick_ball   (n entities per call)
+    env.step / env.reset                        (FootballEnv)
+    vecenv.step / vecenv.reset                  (FootballVecEnv, n envs)
+    dummyvec.step                               (DummyVecEnv of n FootballEnv)
+    vecnorm.step                                (VecNormalize over FootballVecEnv)
+    ppo.predict / numpy.predict                 (batch of n observations)
+
+Each case is calibrated to run ≥ ``--min-time`` per repeat; the report
+gives ns per operation (one entity / env step / observation).  Results
+go to ``benchmarks/results/<commit>.json`` (``-dirty`` if the tree has
+local changes).  ``--compare`` checks the *best* repeat of every case
+against a stored baseline – the minimum is the least noisy estimate on
+a shared machine – and exits 1 if any case is slower by more than
+``--threshold``.  Flagged cases are re-measured ``--confirm`` times first
+(best of all runs), so one noisy repeat does not fail the check.
+
+    python -m benchmarks.suite                         # run + save
+    python -m benchmarks.suite --save-baseline         # … and store as baseline
+    python -m benchmarks.suite --compare               # flag regressions
+    python -m benchmarks.suite -k vecenv --quick       # subset, fewer repeats
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Callable
+
+import numpy as np
+
+ROOT        = Path(__file__).resolve().parent.parent
+RESULTS_DIR = ROOT / "benchmarks" / "results"
+BASELINE    = RESULTS_DIR / "baseline.json"
+DIRS        = ("up", "down", "left", "right")
+
+# name → (sizes, setup(size) → (op, ops per call))
+Case = Callable[[int], tuple[Callable[[], object], int]]
+CASES: dict[str, tuple[tuple[int, ...], Case]] = {}
+
+
+def case(name: str, sizes: tuple[int, ...]):
+    def register(fn: Case) -> Case:
+        CASES[name] = (sizes, fn)
+        return fn
+    return register
+
+
+# ------------------------------------------------------------------ #
+#                             ENTITIES                               #
+# ------------------------------------------------------------------ #
+@case("ball.move", (1, 22, 1000))
+def _ball_move(n):
+    from core.ball import Ball
+    rng = np.random.default_rng(0)
+    balls = [Ball(*rng.uniform(50, 550, 2)) for _ in range(n)]
+    for b in balls:
+        b.vel_x, b.vel_y = rng.uniform(-5, 5, 2)
+
+    def op():
+        for b in balls:
+            b.move()
+            if abs(b.vel_x) + abs(b.vel_y) < 0.5:     # keep the balls rolling
+                b.vel_x, b.vel_y = 4.0, -3.0
+    return op, n
+
+
+@case("player.move", (1, 22, 1000))
+def _player_move(n):
+    from core.player import Player
+    rng = np.random.default_rng(0)
+    players = [Player(*rng.uniform(0, 560, 2), "blue") for _ in range(n)]
+    dirs = [DIRS[i % 4] for i in range(n)]
+
+    def op():
+        for p, d in zip(players, dirs):
+            p.move(d)
+        dirs.append(dirs.pop(0))
+    return op, n
+
+
+@case("player.kick_ball", (1, 22, 1000))
+def _player_kick(n):
+    from core.ball import Ball
+    from core.player import Player
+    pairs = [(Player(400, 300, "blue"), Ball(420, 345)) for _ in range(n)]
+
+    def op():
+        for p, b in pairs:
+            b.x, b.y, b.vel_x, b.vel_y = 420, 345, 0, 0
+            p.kick_ball(b)
+    return op, n
+
+
+# ------------------------------------------------------------------ #
+#                           ENVIRONMENTS                             #
+# ------------------------------------------------------------------ #
+def _actions(n: int, steps: int = 256) -> np.ndarray:
+    return np.random.default_rng(0).integers(0, 6, (steps, n))
+
+
+@case("env.step", (1,))
+def _env_step(n):
+    from rl_agent.environment import FootballEnv
+    env = FootballEnv(phase=2)
+    acts = iter(np.resize(_actions(1).ravel(), 1 << 20).tolist())
+
+    def op():
+        _, _, term, trunc, _ = env.step(next(acts))
+        if term or trunc:
+            env.reset()
+    return op, 1
+
+
+@case("env.reset", (1,))
+def _env_reset(n):
+    from rl_agent.environment import FootballEnv
+    env = FootballEnv(phase=2)
+    return env.reset, 1
+
+
+@case("vecenv.step", (1, 16, 256))
+def _vecenv_step(n):
+    from rl_agent.vec_env import FootballVecEnv
+    env = FootballVecEnv(n, phase=2, seed=0)
+    env.reset()
+    acts = _actions(n)
+    i = [0]
+
+    def op():
+        env.step(acts[i[0] % len(acts)])
+        i[0] += 1
+    return op, n
+
+
+@case("vecenv.reset", (1, 16, 256))
+def _vecenv_reset(n):
+    from rl_agent.vec_env import FootballVecEnv
+    env = FootballVecEnv(n, phase=2, seed=0)
+    return env.reset, n
+
+
+@case("dummyvec.step", (1, 16))
+def _dummyvec_step(n):
+    from stable_baselines3.common.vec_env import DummyVecEnv
+    from rl_agent.environment import FootballEnv
+    env = DummyVecEnv([lambda: FootballEnv(phase=2)] * n)
+    env.reset()
+    acts = _actions(n)
+    i = [0]
+
+    def op():
+        env.step(acts[i[0] % len(acts)])
+        i[0] += 1
+    return op, n
+
+
+@case("vecnorm.step", (1, 16, 256))
+def _vecnorm_step(n):
+    from stable_baselines3.common.vec_env import VecNormalize
+    from rl_agent.vec_env import FootballVecEnv
+    env = VecNormalize(FootballVecEnv(n, phase=2, seed=0), clip_obs=10.0)
+    env.reset()
+    acts = _actions(n)
+    i = [0]
+
+    def op():
+        env.step(acts[i[0] % len(acts)])
+        i[0] += 1
+    return op, n
+
+
+# ------------------------------------------------------------------ #
+#                             INFERENCE                              #
+# ------------------------------------------------------------------ #
+def _obs(n: int) -> np.ndarray:
+    from rl_agent.vec_env import FootballVecEnv
+    return FootballVecEnv(n, phase=2, seed=0).reset()
+
+
+@case("ppo.predict", (1, 16, 256))
+def _ppo_predict(n):
+    from stable_baselines3 import PPO
+    path = ROOT / "models" / "final_agent.zip"
+    if path.exists():
+        model = PPO.load(path, device="cpu")
+    else:                                         # same architecture, random weights
+        from rl_agent.model import create_model
+        from rl_agent.vec_env import FootballVecEnv
+        model = create_model(FootballVecEnv(1), tensorboard_log=None, verbose=0)
+    obs = _obs(n)
+    return (lambda: model.predict(obs, deterministic=True)), n
+
+
+@case("numpy.predict", (1, 16, 256))
+def _numpy_predict(n):
+    from rl_agent.numpy_policy import DEFAULT_OUT, NumpyPolicy
+    pi = NumpyPolicy.load(DEFAULT_OUT)
+    obs = _obs(n)
+    return (lambda: pi.predict(obs)), n
+
+
+# ------------------------------------------------------------------ #
+#                              RUNNER                                #
+# ------------------------------------------------------------------ #
+def _time(op: Callable[[], object], ops: int, repeat: int,
+          min_time: float) -> list[float]:
+    """ns per operation for each of *repeat* calibrated runs."""
+    op()                                          # warm-up (lazy init, caches)
+    loops = 1
+    while True:
+        t0 = time.perf_counter()
+        for _ in range(loops):
+            op()
+        dt = time.perf_counter() - t0
+        if dt >= min_time:
+            break
+        loops = max(loops * 2, int(loops * min_time / max(dt, 1e-9) * 1.2))
+    runs = [dt]
+    for _ in range(repeat - 1):
+        t0 = time.perf_counter()
+        for _ in range(loops):
+            op()
+        runs.append(time.perf_counter() - t0)
+    return [r / (loops * ops) * 1e9 for r in runs]
+
+
+def run(pattern: str = "", repeat: int = 5, min_time: float = 0.2) -> dict[str, dict]:
+    results = {}
+    for name, (sizes, setup) in CASES.items():
+        for n in sizes:
+            key = f"{name}[n={n}]"
+            if pattern not in key:
+                continue
+            op, ops = setup(n)
+            ns = _time(op, ops, repeat, min_time)
+            results[key] = dict(min_ns=min(ns), median_ns=statistics.median(ns),
+                                repeats=len(ns))
+            print(f"  {key:<28}{results[key]['median_ns']:>14,.0f} ns/op"
+                  f"   (min {results[key]['min_ns']:,.0f})")
+    return results
+
+
+def _git(*args: str) -> str:
+    try:
+        return subprocess.run(["git", *args], cwd=ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+def commit_key() -> str:
+    sha = _git("rev-parse", "--short", "HEAD") or "nogit"
+    dirty = _git("status", "--porcelain", "--untracked-files=no")
+    return sha + ("-dirty" if dirty else "")
+
+
+def machine() -> dict[str, str]:
+    import torch
+    return dict(python=platform.python_version(), numpy=np.__version__,
+                torch=torch.__version__, torch_threads=str(torch.get_num_threads()),
+                cpu=platform.processor() or platform.machine(), system=platform.system())
+
+
+def compare(current: dict, baseline: dict, threshold: float) -> list[str]:
+    """Print a per-case comparison; returns the regressed case names."""
+    regressed = []
+    if current["machine"] != baseline.get("machine"):
+        print("⚠ baseline was recorded on a different machine / software stack")
+    print(f"\n{'case':<28}{'baseline':>12}{'now':>12}{'Δ':>9}   vs {baseline['commit']}")
+    for key, now in current["results"].items():
+        old = baseline["results"].get(key)
+        if old is None:
+            print(f"{key:<28}{'—':>12}{now['min_ns']:>12,.0f}{'new':>9}")
+            continue
+        ratio = now["min_ns"] / old["min_ns"]
+        flag = ""
+        if ratio > 1 + threshold:
+            flag = "  REGRESSION"
+            regressed.append(key)
+        elif ratio < 1 - threshold:
+            flag = "  faster"
+        print(f"{key:<28}{old['min_ns']:>12,.0f}{now['min_ns']:>12,.0f}"
+              f"{ratio - 1:>+9.1%}{flag}")
+    return regressed
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    p = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    p.add_argument("-k", dest="pattern", default="", help="only cases containing this")
+    p.add_argument("--repeat", type=int, default=5)
+    p.add_argument("--min-time", type=float, default=0.2, help="seconds per repeat")
+    p.add_argument("--quick", action="store_true", help="3 repeats × 0.05 s")
+    p.add_argument("--save-baseline", action="store_true")
+    p.add_argument("--compare", nargs="?", const=BASELINE, type=Path, default=None,
+                   help="baseline JSON (default: benchmarks/results/baseline.json)")
+    p.add_argument("--threshold", type=float, default=0.10,
+                   help="relative slowdown counted as a regression")
+    p.add_argument("--confirm", type=int, default=2,
+                   help="re-runs of a flagged case before it counts")
+    return p.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> None:
+    args = parse_args(argv)
+    if args.quick:
+        args.repeat, args.min_time = 3, 0.05
+    baseline = None
+    if args.compare is not None:                  # fail now, not after the whole suite
+        if not Path(args.compare).exists():
+            sys.exit(f"no baseline at {args.compare} – run "
+                     f"`python -m benchmarks.suite --save-baseline` first")
+        baseline = json.loads(Path(args.compare).read_text())
+    key = commit_key()
+    print(f"commit {key}")
+    results = run(args.pattern, args.repeat, args.min_time)
+    doc = dict(commit=key, date=time.strftime("%Y-%m-%dT%H:%M:%S"),
+               machine=machine(), repeat=args.repeat, min_time=args.min_time,
+               results=results)
+    if baseline is not None:
+        for _ in range(args.confirm):
+            slow = [k for k, r in results.items() if k in baseline["results"]
+                    and r["min_ns"] > baseline["results"][k]["min_ns"] * (1 + args.threshold)]
+            if not slow:
+                break
+            print(f"re-measuring {len(slow)} slower case(s)…")
+            for k in slow:
+                again = run(k, args.repeat, args.min_time)[k]
+                if again["min_ns"] < results[k]["min_ns"]:
+                    results[k] = again
+
+    RESULTS_DIR.mkdir(parents=True, exist_ok=True)
+    out = RESULTS_DIR / f"{key}.json"
+    out.write_text(json.dumps(doc, indent=2))
+    print(f"→ {out.relative_to(ROOT)}")
+    if args.save_baseline:
+        BASELINE.write_text(json.dumps(doc, indent=2))
+        print(f"→ {BASELINE.relative_to(ROOT)}")
+
+    if baseline is not None:
+        regressed = compare(doc, baseline, args.threshold)
+        if regressed:
+            print(f"\n❌ {len(regressed)} regression(s) over {args.threshold:.0%}")
+            sys.exit(1)
+        print("\n✅ no regressions")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+import threading
+import time
+import traceback
+from collections import Counter
+
+# Ajan kararını oyun döngüsünden ayırır.
+#
+#   sync        – karar oyun döngüsünde, her k karede bir (eski davranış)
+#   every_frame – karar iş parçacığında, her yeni gözlem için
+#   every_k     – karar iş parçacığında, her k. karenin gözlemi için
+#   budget      – iş parçacığı her gözlem için karar verir; döngü bu karenin
+#                 kararını en fazla `budget_ms` bekler, yetişmezse son
+#                 kararı kullanır
+#
+# Oyun döngüsü her kare `observe(obs, frame)` ile son gözlemi yayınlar ve
+# `action(frame)` ile en güncel kararı alır; thread modlarında hiçbiri
+# çıkarımı beklemez (budget hariç, o da sınırlı süre).  Bayatlık (staleness)
+# = kullanıldığı kare − kararın dayandığı gözlemin karesi.
+#
+# Thread modlarında politika hata verirse (ör. hot-swap sırasında) iş
+# parçacığı ölmez: hata sayılır (`errors`, ilki yazdırılır), o gözlem için
+# no-op (0) yayınlanır ve sonraki gözlemde yeniden denenir.
+
+MODES = ("sync", "every_frame", "every_k", "budget")
+_MOVES = {1: "up", 2: "down", 3: "left", 4: "right"}
+
+
+class AgentController:
+    def __init__(self, player, policy, mode="sync", k=1, budget_ms=4.0):
+        """
+        policy    : obs -> int aksiyon (ör. PolicySlot.act)
+        k         : sync / every_k için karar aralığı (kare)
+        budget_ms : budget modunda karenin kararını bekleme sınırı
+        """
+        if mode not in MODES:
+            raise ValueError(f"unknown agent mode {mode!r}; choose from {MODES}")
+        self.player = player
+        self.policy = policy
+        self.mode = mode
+        self.k = max(1, int(k))
+        self.budget = budget_ms / 1000.0
+
+        self._latest = (0, -1)             # (aksiyon, gözlem karesi) – atomik tuple
+        self._obs = None                   # (obs, kare) – son yayınlanan gözlem
+        self._cond = threading.Condition()
+        self._stop = False
+        self._thread = None
+
+        self.staleness = Counter()         # kare gecikmesi -> kullanım sayısı
+        self.decide_ms = []                # karar süreleri (ms)
+        self.waited_ms = 0.0               # budget modunda toplam bekleme
+        self.errors = 0                    # iş parçacığında başarısız kararlar
+        if mode != "sync":
+            self._thread = threading.Thread(target=self._run, name="agent", daemon=True)
+            self._thread.start()
+
+    # ── oyun döngüsü tarafı ──
+    def observe(self, obs, frame):
+        if self.mode == "sync":
+            if frame % self.k == 0:
+                self._decide(obs, frame)
+            return
+        if self.mode == "every_k" and frame % self.k:
+            return
+        with self._cond:
+            self._obs = (obs, frame)
+            self._cond.notify()
+
+    def action(self, frame):
+        act, src = self._latest
+        if self.mode == "budget" and src < frame:
+            t0 = time.perf_counter()
+            with self._cond:
+                self._cond.wait_for(lambda: self._latest[1] >= frame, timeout=self.budget)
+            self.waited_ms += (time.perf_counter() - t0) * 1e3
+            act, src = self._latest
+        if src >= 0:
+            self.staleness[frame - src] += 1
+        return act
+
+    def apply(self, act, ball):
+        if act in _MOVES:
+            self.player.move(_MOVES[act])
+        elif act == 5:
+            self.player.kick_ball(ball)
+
+    def stop(self):
+        with self._cond:
+            self._stop = True
+            self._cond.notify()
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+
+    # ── karar iş parçacığı ──
+    def _decide(self, obs, frame):
+        t0 = time.perf_counter()
+        act = self.policy(obs)
+        self.decide_ms.append((time.perf_counter() - t0) * 1e3)
+        with self._cond:
+            self._latest = (act, frame)
+            self._cond.notify_all()
+
+    def _run(self):
+        done = -1
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._stop or
+                                    (self._obs is not None and self._obs[1] > done))
+                if self._stop:
+                    return
+                obs, frame = self._obs
+            try:
+                self._decide(obs, frame)
+            except Exception:
+                self.errors += 1
+                if self.errors == 1:
+                    print("⚠ agent decision failed – playing no-op until it recovers")
+                    traceback.print_exc()
+                with self._cond:           # bayat karar yerine no-op
+                    self._latest = (0, frame)
+                    self._cond.notify_all()
+            done = frame
+
+    # ── ölçüm ──
+    def stats(self):
+        uses = sum(self.staleness.values()) or 1
+        lat = sorted(self.decide_ms) or [0.0]
+        return dict(
+            mode=self.mode,
+            decisions=len(self.decide_ms),
+            decide_ms_p50=lat[len(lat) // 2],
+            decide_ms_p99=lat[min(len(lat) - 1, int(len(lat) * 0.99))],
+            staleness_mean=sum(s * n for s, n in self.staleness.items()) / uses,
+            staleness_max=max(self.staleness, default=0),
+            staleness_hist=dict(sorted(self.staleness.items())),
+            waited_ms=self.waited_ms,
+            errors=self.errors,
+        )
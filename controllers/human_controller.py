@@ -1,4 +1,5 @@
 import pygame
+from utils.spatial import TACKLE_RANGE
 
 class HumanController:
     def __init__(self, player, control_scheme):
@@ -24,11 +25,17 @@ class HumanController:
             self.try_tackle(ball, opponent_team)
 
     def try_tackle(self, ball, opponents):
-        for opponent in opponents.players:
+        index = self.player.index
+        if index is not None:
+            # Uzamsal indeks: sadece yakın hücrelerdeki rakipler
+            candidates = index.near(self.player, TACKLE_RANGE, team=opponents.name)
+        else:
+            candidates = opponents.players
+        for opponent in candidates:
             dx = self.player.x - opponent.x
             dy = self.player.y - opponent.y
             dist = (dx ** 2 + dy ** 2) ** 0.5
-            if dist < 25 and opponent.has_ball:
+            if dist < TACKLE_RANGE and opponent.has_ball:
                 # Topu kap
                 opponent.has_ball = False
                 self.player.has_ball = True
@@ -36,4 +43,6 @@ class HumanController:
                 ball.vel_y = 0
                 ball.x = self.player.x
                 ball.y = self.player.y
+                if ball.index is not None:
+                    ball.index.update(ball)
                 break
@@ -1,18 +1,12 @@
 # C:\Users\yigit\OneDrive\Desktop\aigame\AI-Football-Game\core\ball.py
-
-import os
-import pygame
-
-# Dosya yolunu belirle
-_BASE_DIR    = os.path.dirname(__file__)                    # ...\AI-Football-Game\core
-_PROJECT_DIR = os.path.dirname(_BASE_DIR)                  # ...\AI-Football-Game
-ROOT_DIR     = os.path.dirname(_PROJECT_DIR)               # ...\aigame
-_ASSET_DIR   = os.path.join(ROOT_DIR, "assets")            # ...\aigame\assets
-BALL_FILE    = os.path.join(_ASSET_DIR, "ball.png")
+#
+# Saf simülasyon katmanı: pygame import edilmez.  Sprite çizimi
+# ui/sprites.py içindedir (sunum katmanı).
 
 class Ball:
-    # Sadece bir kez yüklensin diye class-level cache
-    _sprite = None
+    # __dict__ yok: binlerce maç bellekte tutulurken nesne başı yük küçük kalır
+    __slots__ = ("x", "y", "radius", "vel_x", "vel_y",
+                 "max_speed", "friction", "index")
 
     def __init__(self, x, y, radius=6):
         """
@@ -26,13 +20,7 @@ class Ball:
         self.vel_y = 0
         self.max_speed = 5
         self.friction = 0.97
-
-        # Sprite'ı yükle + ölçekle (radius*2 = çap)
-        if Ball._sprite is None:
-            img = pygame.image.load(BALL_FILE).convert_alpha()
-            size = (radius * 3, radius * 3)
-            Ball._sprite = pygame.transform.scale(img, size)
-        self.sprite = Ball._sprite
+        self.index = None          # utils.spatial.SpatialHash (isteğe bağlı)
 
     def move(self):
         # Mevcut hareket, sürtünme ve duvar sekme mantığı
@@ -67,6 +55,21 @@ class Ball:
                 self.x = 800 - self.radius
                 self.vel_x *= -1
 
+        if self.index is not None:
+            self.index.update(self)
+
+    def step(self, dt=1.0):
+        """
+        Sabit adımlı, sürekli çarpışmalı hareket (bkz. core/physics.py).
+        Büyük dt'de de direk/duvar/kale çizgisi kaçmaz; gol olduysa
+        "left" / "right" döner, yoksa None.
+        """
+        from core.physics import step_ball
+        goal = step_ball(self, dt)
+        if self.index is not None:
+            self.index.update(self)
+        return goal
+
     def kick(self, power_x, power_y):
         self.vel_x += power_x
         self.vel_y += power_y
@@ -76,9 +79,28 @@ class Ball:
             self.vel_x *= scale
             self.vel_y *= scale
 
+    # ── kapalı-form yörünge (bkz. core/trajectory.py) ──
+    def predict(self, k):
+        """k kare sonraki (x, y) – k kez move() çağırmadan."""
+        from core.trajectory import predict
+        return predict(self, k)
+
+    def time_to_stop(self):
+        """Top durana kadar kalan kare sayısı."""
+        from core.trajectory import time_to_stop
+        return time_to_stop(self)
+
+    def crossing_x(self, x_line):
+        """x = x_line çizgisini ilk geçtiği (kare, y) ya da None."""
+        from core.trajectory import crossing_x
+        return crossing_x(self, x_line)
+
+    def intercept(self, player, speed=None, reach=0.0):
+        """Oyuncunun topa en erken yetiştiği (kare, x, y)."""
+        from core.trajectory import intercept
+        return intercept(self, player, speed, reach)
+
     def draw(self, screen):
-        """Top sprite’ını merkez konumuna göre blit’ler."""
-        # Sprite’ın üst-sol köşe koordinatını hesapla
-        blit_x = int(self.x - self.radius)
-        blit_y = int(self.y - self.radius)
-        screen.blit(self.sprite, (blit_x, blit_y))
+        """Top sprite’ını çizer (pygame yalnızca burada, tembel yüklenir)."""
+        from ui.sprites import draw_ball
+        draw_ball(screen, self)
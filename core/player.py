@@ -1,23 +1,15 @@
 # C:\Users\yigit\OneDrive\Desktop\aigame\AI-Football-Game\core\player.py
-
-import os
-import pygame
-
-# Dosya yollarını tanımlıyoruz
-_BASE_DIR      = os.path.dirname(__file__)                  # ...\AI-Football-Game\core
-_PROJECT_DIR   = os.path.dirname(_BASE_DIR)                 # ...\AI-Football-Game
-ROOT_DIR       = os.path.dirname(_PROJECT_DIR)              # ...\aigame
-_ASSET_DIR     = os.path.join(ROOT_DIR, "assets")           # ...\aigame\assets
-SPRITE_FILES   = {
-    "red":  os.path.join(_ASSET_DIR, "sprite_team1.png"),
-    "blue": os.path.join(_ASSET_DIR, "sprite_team2.png"),
-}
-KICK_SOUND    = os.path.join(_ASSET_DIR, "kick.wav")
+#
+# Saf simülasyon katmanı: pygame import edilmez.  Sprite ve vuruş sesi
+# ui/sprites.py içindedir; ses sadece `Player.on_kick` kancası kuruluysa çalar.
 
 class Player:
-    # Sprite ve vuruş sesi sınıf bazında cache’lenir
-    _sprite_cache = {}
-    _kick_sound   = None
+    # Vuruş olayı kancası (sunum katmanı ses için kurar, eğitimde None)
+    on_kick = None
+
+    # __dict__ yok (bkz. Ball); on_kick sınıf niteliği olarak kalır
+    __slots__ = ("x", "y", "team", "is_ai", "player_id", "speed",
+                 "width", "height", "has_ball", "index")
 
     def __init__(self, x, y, team, is_ai=False, player_id=""):
         self.x = x
@@ -27,38 +19,32 @@ class Player:
         self.player_id = player_id
         self.speed = 2.5
 
-        # Lazy-load ve ölçekleme: 50×50 sprite
-        if team not in Player._sprite_cache:
-            img = pygame.image.load(SPRITE_FILES[team]).convert_alpha()
-            Player._sprite_cache[team] = pygame.transform.scale(img, (50, 50))
-        self.sprite = Player._sprite_cache[team]
-
-        # Boyutlar artık sprite ile uyumlu
+        # Boyutlar sprite ile uyumlu (50×50 sprite, 40×40 gövde)
         self.width  = 40
         self.height = 40
 
-        # Lazy-load vuruş sesi
-        if Player._kick_sound is None:
-            Player._kick_sound = pygame.mixer.Sound(KICK_SOUND)
-            Player._kick_sound.set_volume(0.5)
-
         self.has_ball = False
+        self.index = None          # utils.spatial.SpatialHash (isteğe bağlı)
 
-    def move(self, direction):
+    def move(self, direction, dt=1.0):
+        # dt: kare cinsinden adım (sabit adımlı fizik için, varsayılan 1 kare)
         min_x, max_x = 0, 800 - self.width
         min_y, max_y = 0, 600 - self.height
+        step = self.speed * dt
 
         if direction == "up":
-            self.y -= self.speed
+            self.y -= step
         elif direction == "down":
-            self.y += self.speed
+            self.y += step
         elif direction == "left":
-            self.x -= self.speed
+            self.x -= step
         elif direction == "right":
-            self.x += self.speed
+            self.x += step
 
         self.x = max(min_x, min(self.x, max_x))
         self.y = max(min_y, min(self.y, max_y))
+        if self.index is not None:
+            self.index.update(self)
 
     def kick_ball(self, ball):
         # Ayak noktasına göre çarpışma
@@ -72,7 +58,8 @@ class Player:
             power = 2.5
             self.has_ball = False
             ball.kick(dx / dist * power, dy / dist * power)
-            Player._kick_sound.play()
+            if Player.on_kick is not None:
+                Player.on_kick(self)
 
     def pass_to(self, teammate, ball):
         # Ayak noktasına göre pas
@@ -89,7 +76,8 @@ class Player:
         self.has_ball = False
         teammate.has_ball = True
         ball.kick(dx / dist_to_ball * power, dy / dist_to_ball * power)
-        Player._kick_sound.play()
+        if Player.on_kick is not None:
+            Player.on_kick(self)
 
     def dribble(self, ball):
         # Ayak noktasına göre dripling
@@ -105,8 +93,5 @@ class Player:
 
     def draw(self, screen):
         """ Oyuncu sprite’ını ve isteğe bağlı ID’sini çizer. """
-        screen.blit(self.sprite, (int(self.x), int(self.y)))
-        if self.player_id:
-            font     = pygame.font.SysFont(None, 16)
-            txt_surf = font.render(self.player_id, True, (255, 255, 255))
-            screen.blit(txt_surf, (self.x, self.y - 12))
+        from ui.sprites import draw_player
+        draw_player(screen, self)
@@ -1,4 +1,7 @@
 class Stadium:
+    __slots__ = ("width", "height", "score_red", "score_blue", "winner",
+                 "last_out_type", "last_out_pos")
+
     def __init__(self, width, height):
         self.width = width
         self.height = height
@@ -35,7 +38,15 @@ class Stadium:
         pygame.draw.rect(screen, white, (0, self.height // 2 - penalty_box_height // 2, penalty_box_width, penalty_box_height), 2)
         pygame.draw.rect(screen, white, (self.width - penalty_box_width, self.height // 2 - penalty_box_height // 2, penalty_box_width, penalty_box_height), 2)
 
-    def check_goal(self, ball):
+    def check_goal(self, ball, event=None):
+        # event: Ball.step'in döndürdüğü sürekli çarpışma sonucu ("left"/"right").
+        # Verilirse adım içindeki gerçek çizgi geçişi kullanılır.
+        if event == "left":
+            self.score_blue += 1
+            return "blue"
+        if event == "right":
+            self.score_red += 1
+            return "red"
         if 220 < ball.y < 380:
             if ball.x <= 0:
                 self.score_blue += 1
@@ -1,4 +1,6 @@
 class Team:
+    __slots__ = ("name", "players")
+
     def __init__(self, name, players):
         self.name = name            # "red" or "blue"
         self.players = players      # List of Player objects
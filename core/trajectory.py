@@ -0,0 +1,234 @@
+# C:\Users\yigit\OneDrive\Desktop\aigame\AI-Football-Game\core\trajectory.py
+#
+# Ball.move'un kapalı-form (analitik) çözümü.  Kare kare simülasyon yerine
+# k kare sonraki konum, durma süresi, kale çizgisini geçiş noktası ve
+# oyuncu için en erken kesişme noktası O(duvar sekmesi) sürede hesaplanır.
+#
+# Ball.move her karede:  p += v;  v *= f;  |v| < 0.05 ise v = 0;  duvar kontrolü
+# Yani her eksen için k kare sonra (durmadan önce):
+#     p_k = p_0 + v_0 · (1 - f^k) / (1 - f)
+# Duvar sekmesi hızın sadece işaretini değiştirir, büyüklüğün azalma
+# takvimi (ve durma karesi) aynı kalır.  Top en fazla v/(1-f) ≈ 167 px
+# yol alabildiği için her sorgu birkaç parçalı adımda biter.
+
+import copy
+import math
+
+FIELD_W, FIELD_H = 800, 600          # Ball.move duvarları
+GOAL_TOP, GOAL_BOTTOM = 240, 360     # kale ağzı (x duvarında boşluk)
+STOP_V = 0.05                        # Ball.move'daki küçük hız eşiği
+
+
+# ─────────────────────────── TEK EKSEN YARDIMCILARI ────────────────────────
+def frames_to_stop(v, friction):
+    """Eksen hızı v'nin kaç karede 0'a kırpılacağı (hareket eden kare sayısı)."""
+    if v == 0:
+        return 0
+    n = math.log(STOP_V / abs(v)) / math.log(friction)
+    s = max(1, math.floor(n) + 1)
+    while s > 1 and abs(v) * friction ** (s - 1) < STOP_V:
+        s -= 1
+    while abs(v) * friction ** s >= STOP_V:
+        s += 1
+    return s
+
+
+def _disp(v, j, s, friction):
+    """j kare sonraki yer değiştirme (s = kalan hareket karesi)."""
+    m = min(j, s)
+    return v * (1 - friction ** m) / (1 - friction)
+
+
+def _vel(v, j, s, friction):
+    return v * friction ** j if j < s else 0
+
+
+def _first_cross(p, v, s, friction, limit, below, strict):
+    """
+    p + disp(j) ilk hangi j >= 1 karede *limit*'i geçer?  (yoksa None)
+    below=True → p <= limit (strict: p < limit), aksi halde p >= limit.
+    """
+    def hit(j):
+        q = p + _disp(v, j, s, friction)
+        if below:
+            return q < limit if strict else q <= limit
+        return q > limit if strict else q >= limit
+
+    if hit(1):
+        return 1
+    toward = v < 0 if below else v > 0
+    if not toward or s <= 1 or not hit(s):
+        return None
+    # f^j = 1 - d·(1-f)/v  →  j = log(...)/log f
+    arg = 1 - (limit - p) * (1 - friction) / v
+    j = max(1, math.ceil(math.log(arg) / math.log(friction) - 1e-9)) if arg > 0 else s
+    j = min(j, s)
+    while j > 1 and hit(j - 1):
+        j -= 1
+    while not hit(j):
+        j += 1
+    return j
+
+
+# ─────────────────────────── PARÇALI YÖRÜNGE ───────────────────────────────
+class _Path:
+    """Ball.move'u olaydan olaya (duvar/kale) atlayarak ilerletir."""
+
+    def __init__(self, ball):
+        self.f = ball.friction
+        self.r = ball.radius
+        self.n = 0
+        self.x, self.y = float(ball.x), float(ball.y)
+        self.vx, self.vy = float(ball.vel_x), float(ball.vel_y)
+        self.sx = frames_to_stop(self.vx, self.f)
+        self.sy = frames_to_stop(self.vy, self.f)
+
+    def _in_mouth(self, y):
+        return GOAL_TOP <= y <= GOAL_BOTTOM
+
+    def _y_event(self):
+        f, r = self.f, self.r
+        if self.vy == 0 and r <= self.y <= FIELD_H - r:
+            return None                          # duran top, duvar kırpması etkisiz
+        c = [_first_cross(self.y, self.vy, self.sy, f, r, True, False),
+             _first_cross(self.y, self.vy, self.sy, f, FIELD_H - r, False, False)]
+        c = [j for j in c if j is not None]
+        return min(c) if c else None
+
+    def _x_event(self):
+        f, r = self.f, self.r
+        if self.vx == 0 and self.vy == 0:
+            if r <= self.x <= FIELD_W - r or self._in_mouth(self.y):
+                return None
+        # Kale ağzındayken x duvarı yok: top ağızdan çıkınca duvar devreye girer
+        if self.x - r < 0 or self.x + r > FIELD_W:
+            c = [_first_cross(self.y, self.vy, self.sy, f, GOAL_TOP, True, True),
+                 _first_cross(self.y, self.vy, self.sy, f, GOAL_BOTTOM, False, True)]
+            c = [j for j in c if j is not None]
+            return min(c) if c else None
+        c = [_first_cross(self.x, self.vx, self.sx, f, r, True, True),
+             _first_cross(self.x, self.vx, self.sx, f, FIELD_W - r, False, True)]
+        c = [j for j in c if j is not None]
+        return min(c) if c else None
+
+    def _advance(self, j):
+        f = self.f
+        self.x += _disp(self.vx, j, self.sx, f)
+        self.y += _disp(self.vy, j, self.sy, f)
+        self.vx = _vel(self.vx, j, self.sx, f)
+        self.vy = _vel(self.vy, j, self.sy, f)
+        self.sx = max(0, self.sx - j)
+        self.sy = max(0, self.sy - j)
+        self.n += j
+
+    def _apply_walls(self):
+        """Ball.move'daki duvar kontrolünün aynısı (önce y, sonra x)."""
+        r = self.r
+        if self.y - r <= 0:
+            self.y, self.vy = r, -self.vy
+        elif self.y + r >= FIELD_H:
+            self.y, self.vy = FIELD_H - r, -self.vy
+        if not self._in_mouth(self.y):
+            if self.x - r < 0:
+                self.x, self.vx = r, -self.vx
+            elif self.x + r > FIELD_W:
+                self.x, self.vx = FIELD_W - r, -self.vx
+
+    def next_event(self, limit):
+        """Bir sonraki olay karesine (en fazla *limit*) kadar ilerle."""
+        cand = [j for j in (self._y_event(), self._x_event()) if j is not None]
+        j = min(cand) if cand else None
+        if j is None or self.n + j > limit:
+            self._advance(limit - self.n)
+            return False
+        self._advance(j)
+        self._apply_walls()
+        return True
+
+    def run_to(self, k):
+        while self.n < k:
+            self.next_event(k)
+        return self
+
+
+# ─────────────────────────────── PUBLIC API ────────────────────────────────
+def predict_state(ball, k):
+    """k kare sonraki (x, y, vel_x, vel_y) – k kez Ball.move çağırmakla aynı."""
+    p = _Path(ball).run_to(int(k))
+    return p.x, p.y, p.vx, p.vy
+
+
+def predict(ball, k):
+    """k kare sonraki top merkezi (x, y)."""
+    x, y, _, _ = predict_state(ball, k)
+    return x, y
+
+
+def time_to_stop(ball):
+    """Topun tamamen durmasına kalan kare sayısı (sekmeler süreyi değiştirmez)."""
+    return max(frames_to_stop(ball.vel_x, ball.friction),
+               frames_to_stop(ball.vel_y, ball.friction))
+
+
+def crossing_x(ball, x_line):
+    """
+    Top merkezinin x = x_line çizgisini ilk geçtiği (kare, y); geçmiyorsa None.
+    Örn. crossing_x(ball, 0) → sol kale çizgisi.  Duvar sekmeleri hesaba katılır.
+    """
+    p = _Path(ball)
+    stop = time_to_stop(ball)
+    while p.n < stop:
+        before = copy.copy(p)
+        below = p.x > x_line
+        j = _first_cross(p.x, p.vx, p.sx, p.f, x_line, below, False)
+        p.next_event(stop)
+        if j is None or before.n + j > p.n:
+            continue
+        if before.n + j < p.n:                  # serbest hareket sırasında
+            before._advance(j)
+            return before.n, before.y
+        if (p.x <= x_line) if below else (p.x >= x_line):
+            return p.n, p.y                     # olay karesinde, sekmeden sonra
+    return None
+
+
+def intercept(ball, player, speed=None, reach=0.0):
+    """
+    Oyuncunun ayak noktasının topa ulaşabileceği en erken kare.
+    Dönüş: (k, x, y) – k kare sonra top (x, y)'de ve oyuncu oraya yetişir.
+
+    Player.move her karede eksen başına `speed` px ilerler (çapraz hareket
+    iki eksende birden), bu yüzden erişim Chebyshev mesafesiyle ölçülür.
+    *reach*: ayak–top temas toleransı (ör. vuruş için 40 px altı).
+    """
+    speed = player.speed if speed is None else speed
+    fx = player.x + player.width / 2
+    fy = player.y + player.height
+
+    def gap(k):
+        x, y = predict(ball, k)
+        return max(abs(x - fx), abs(y - fy)) - speed * k - reach, x, y
+
+    # Top oyuncudan hızlıyken gap monoton değil → kısa doğrusal tarama
+    v = max(abs(ball.vel_x), abs(ball.vel_y))
+    k0 = 0
+    if v > speed:
+        k0 = math.ceil(math.log(speed / v) / math.log(ball.friction))
+    for k in range(k0 + 1):
+        g, x, y = gap(k)
+        if g <= 0:
+            return k, x, y
+
+    # Sonrasında gap azalan → ikili arama
+    t = time_to_stop(ball)
+    sx, sy = predict(ball, t)
+    hi = max(k0, t) + math.ceil(max(abs(sx - fx), abs(sy - fy)) / speed) + 1
+    lo = k0
+    while hi - lo > 1:
+        mid = (lo + hi) // 2
+        if gap(mid)[0] <= 0:
+            hi = mid
+        else:
+            lo = mid
+    _, x, y = gap(hi)
+    return hi, x, y
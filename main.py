@@ -4,12 +4,12 @@ main.py – Human (RED) vs PPO Agent (BLUE) • 1-v-1 Football
 """
 
 from __future__ import annotations
+import time; T_START = time.perf_counter()        # time-to-first-frame origin
 import os, sys, random
+from collections import deque
 from pathlib import Path
 import numpy as np
 import pygame
-from stable_baselines3 import PPO
-from stable_baselines3.common.vec_env import DummyVecEnv, VecNormalize
 
 # ── project / asset directories ───────────────────────────────────
 PROJECT_ROOT = Path(__file__).resolve().parent
@@ -24,10 +24,14 @@ from core.ball           import Ball
 from core.player         import Player
 from core.team           import Team
 from controllers.human_controller import HumanController
+from controllers.agent_controller import AgentController
 from ui.menu             import Menu
 from ui.score_panel      import ScorePanel
+from ui.sprites          import enable_kick_sound
 from utils.save_load     import save_game, load_game, list_users
-from rl_agent.environment import FootballEnv
+from utils.spatial       import SpatialHash
+from utils.loader        import BackgroundLoader
+from utils.recorder      import TrajectoryRecorder, key_mask, state_of
 
 # ── window & match constants ─────────────────────────────────────
 W, H       = 800, 600
@@ -35,6 +39,12 @@ TOP_MARGIN = ScorePanel.H               # 40 px HUD bar
 FIELD_H    = H - TOP_MARGIN
 MATCH_MS   = 180_000                    # 3 minutes
 FPS        = 60
+AGENT_FRAME_SKIP = 1                    # agent decides every k frames (repeat)
+AGENT_OBS_POOL   = "last"               # last / max / stack – match training
+AGENT_MODE       = "sync"               # sync / every_frame / every_k / budget
+AGENT_BUDGET_MS  = 4.0                  # budget mode: max wait for this frame's action
+RECORD_MATCHES   = True                 # stream every frame to recordings/ (utils.recorder)
+RECORDINGS_DIR   = PROJECT_ROOT / "recordings"
 
 # ── pygame init ──────────────────────────────────────────────────
 os.environ.pop("SDL_VIDEODRIVER", None)
@@ -44,24 +54,83 @@ screen = pygame.display.set_mode((W, H))
 pygame.display.set_caption("GOALAI Football 1-v-1")
 clock = pygame.time.Clock()
 
-# ── graphics & sounds ────────────────────────────────────────────
-pitch_img = pygame.transform.scale(
-    pygame.image.load(ASSETS_DIR / "pitch.png").convert(), (W, FIELD_H)
-)
-goal_sounds = [pygame.mixer.Sound(ASSETS_DIR / f)
-               for f in ("goal_cheer1.wav", "goal_cheer2.wav")]
-for s in goal_sounds: s.set_volume(0.7)
+# ── PPO agent ────────────────────────────────────────────────────
+# models/registry.json indexes every checkpoint (hash, phase, vecnorm).  The
+# registry default plays first – the pinned entry, else the latest registered
+# (a fresh NumPy export beats its .zip, so the torch import is skipped).
+# Keys 1–9 swap the opponent mid-match through a PolicySlot (LRU-cached,
+# background load on a miss).  Runs on the loader thread.
+def load_agent() -> dict:
+    from rl_agent.environment import pool_obs       # pulls in gymnasium
+    from rl_agent.registry import ModelRegistry, PolicySlot
+    registry = ModelRegistry(MODELS_DIR)
+    registry.scan()
+    slot = PolicySlot(registry)
+    print("✅ loading agent:", slot.current.entry["path"])
+    return dict(registry=registry, slot=slot, pool_obs=pool_obs)
+
+def prefetch_models() -> None:
+    """Warm the LRU with the other NumPy exports (difficulty levels).  SB3
+    zips are left to their 1–9 key so startup never imports torch."""
+    registry = loader.get("agent")["registry"]
+    numpy = [e for e in registry.entries() if e["kind"] == "numpy"]
+    for e in numpy[-registry.capacity:]:
+        registry.load(e["name"])
+
+def load_goal_sounds() -> list:
+    sounds = [pygame.mixer.Sound(ASSETS_DIR / f)
+              for f in ("goal_cheer1.wav", "goal_cheer2.wav")]
+    for s in sounds: s.set_volume(0.7)
+    return sounds
 
-pygame.mixer.music.load(ASSETS_DIR / "menu_music.mp3")
-pygame.mixer.music.set_volume(0.1)
-pygame.mixer.music.play(-1)
+# ── background loading (runs while the menu is up) ───────────────
+# surfaces are decoded + scaled off-thread; convert() happens on this thread
+loader = BackgroundLoader()
+Menu.queue_assets(loader)
+loader.add("pitch", lambda: pygame.transform.scale(
+    pygame.image.load(ASSETS_DIR / "pitch.png"), (W, FIELD_H)))
+loader.add("goal_sounds", load_goal_sounds)
+loader.add("kick_sound", enable_kick_sound)
+loader.add("agent", load_agent)
+loader.add("prefetch", prefetch_models, optional=True)   # not waited on
+loader.start()
+
+music_file = ASSETS_DIR / "menu_music.mp3"
+if music_file.exists():
+    pygame.mixer.music.load(music_file)
+    pygame.mixer.music.set_volume(0.1)
+    pygame.mixer.music.play(-1)
 
 # ── menu ─────────────────────────────────────────────────────────
-menu = Menu(screen)
+menu = Menu(screen, loader)
 username, cont = menu.run(bool(list_users()))
 if username is None:
     pygame.quit(); sys.exit()
 pygame.mixer.music.stop()
+print(f"⏱ first menu frame {1e3 * (menu.first_frame_t - T_START):.0f} ms after start")
+
+def wait_for(name: str):
+    """Block on a loader job, keeping the window responsive."""
+    font = pygame.font.Font(None, 36)
+    while not loader.is_done(name):
+        for e in pygame.event.get():
+            if e.type == pygame.QUIT: pygame.quit(); sys.exit()
+        screen.fill(Menu.BLUE_BG)
+        msg = font.render("Loading AI…", True, Menu.TXT_COLOR)
+        screen.blit(msg, msg.get_rect(center=(W//2, H//2)))
+        pygame.display.flip(); clock.tick(30)
+    return loader.get(name)
+
+runtime       = wait_for("agent")
+registry      = runtime["registry"]
+slot          = runtime["slot"]
+pool_obs      = runtime["pool_obs"]
+slot.on_swap  = lambda pol: print("🔁 opponent →", pol.name)
+pitch_img     = wait_for("pitch").convert()
+goal_sounds   = wait_for("goal_sounds")
+wait_for("kick_sound")
+print(f"⏱ agent ready {1e3 * (time.perf_counter() - T_START):.0f} ms after start  "
+      + "  ".join(f"{k} {1e3 * v:.0f} ms" for k, v in loader.timings.items()))
 
 # ── entities ─────────────────────────────────────────────────────
 stadium = Stadium(W, FIELD_H)
@@ -71,6 +140,14 @@ START_RED, START_BLUE = (100, TOP_MARGIN+FIELD_H//2), (700, TOP_MARGIN+FIELD_H//
 red_p  = Player(*START_RED,  "red",  False, "You")
 blue_p = Player(*START_BLUE, "blue", True,  "AI")
 red_t, blue_t = Team("red",[red_p]), Team("blue",[blue_p])
+# sync decides inline every AGENT_FRAME_SKIP frames; the other modes decide
+# on a worker thread so slow inference never delays a frame
+agent_ctrl = AgentController(blue_p, slot.act, AGENT_MODE,
+                             k=AGENT_FRAME_SKIP, budget_ms=AGENT_BUDGET_MS)
+
+# proximity index (kick / tackle / pass range queries); move() keeps it fresh
+index = SpatialHash()
+for e in (ball, red_p, blue_p): index.insert(e)
 
 human_ctrl = HumanController(red_p, {
     "up":pygame.K_w, "down":pygame.K_s,
@@ -78,22 +155,9 @@ human_ctrl = HumanController(red_p, {
     "kick":pygame.K_LSHIFT, "pass":pygame.K_e, "tackle":pygame.K_q
 })
 
-# ── PPO agent ────────────────────────────────────────────────────
-ckpt = max(MODELS_DIR.glob("*.zip"), key=os.path.getmtime)
-print("✅ loading agent:", ckpt.name)
-agent: PPO = PPO.load(ckpt, device="cpu")
-
-venv = DummyVecEnv([lambda: FootballEnv(phase=2)])
-vec_file = MODELS_DIR / "final_vecnorm.pkl"
-if vec_file.exists():
-    venv = VecNormalize.load(vec_file, venv)
-    venv.training = False; venv.norm_reward = False
-    print("✅ VecNormalize loaded")
-else:
-    print("⚠ VecNormalize not found – raw obs will be used")
-
 # ── HUD / score panel ────────────────────────────────────────────
 font_hud = pygame.font.Font(None, 46)
+font_ai  = pygame.font.Font(None, 22)           # current opponent model label
 panel = ScorePanel(W, font_hud)
 
 # ── confetti helper (unchanged) ──────────────────────────────────
@@ -162,6 +226,7 @@ if cont and (sav := load_game(username)):
     ball.x, ball.y = sav["ball"]
     red_p.x, red_p.y = sav["red"]
     blue_p.x, blue_p.y = sav["blue"]
+    index.update_all()
     stadium.score_red = sav["score_red"]; stadium.score_blue = sav["score_blue"]
     start_ms = pygame.time.get_ticks() - sav.get("elapsed_ms", 0)
 
@@ -171,8 +236,18 @@ snapshot = lambda:{ "ball":(ball.x,ball.y), "red":(red_p.x,red_p.y),
                     "score_blue":stadium.score_blue,
                     "elapsed_ms":pygame.time.get_ticks()-start_ms }
 
+# ── match recording (row = state at frame start + that frame's actions) ──
+recorder = None
+if RECORD_MATCHES:
+    recorder = TrajectoryRecorder(
+        RECORDINGS_DIR / f"match_{username}_{time.strftime('%Y%m%d-%H%M%S')}",
+        source="match", user=username, model=slot.name, fps=FPS)
+goals_total = 0
+
 # ── main loop ────────────────────────────────────────────────────
 running=True
+frame_no=0
+obs_hist = deque(maxlen=max(2, AGENT_FRAME_SKIP))
 while running:
     clock.tick(FPS)
     keys=pygame.key.get_pressed()
@@ -183,6 +258,8 @@ while running:
             stadium.score_red=stadium.score_blue=0
             ball.x,ball.y=W//2,TOP_MARGIN+FIELD_H//2
             red_p.x,red_p.y=START_RED; blue_p.x,blue_p.y=START_BLUE
+            index.update_all()
+            obs_hist.clear()                 # fresh pooling history, like env.reset
             start_ms=pygame.time.get_ticks()
         elif act=="save_quit":
             save_game(snapshot(),username); break
@@ -190,22 +267,26 @@ while running:
 
     for e in pygame.event.get():
         if e.type==pygame.QUIT: save_game(snapshot(),username); running=False
+        # 1–9: swap the AI policy (never blocks; loads in background on a miss)
+        if e.type==pygame.KEYDOWN and pygame.K_1<=e.key<=pygame.K_9:
+            models=registry.entries()
+            if e.key-pygame.K_1<len(models): slot.request(models[e.key-pygame.K_1]["name"])
 
     # time-up?
     if pygame.time.get_ticks()-start_ms>=MATCH_MS:
         save_game(snapshot(),username); break
 
     # user & agent
-    human_ctrl.handle_input(keys,ball)
-    obs=np.array([[blue_p.x,blue_p.y,ball.x,ball.y,
-                   ball.vel_x/10,ball.vel_y/10]],np.float32)
-    if isinstance(venv,VecNormalize): obs=venv.normalize_obs(obs)
-    act=int(agent.predict(obs,deterministic=True)[0])
-    if act==1: blue_p.move("up")
-    elif act==2: blue_p.move("down")
-    elif act==3: blue_p.move("left")
-    elif act==4: blue_p.move("right")
-    elif act==5: blue_p.kick_ball(ball)
+    state = state_of(blue_p,ball,red_p) if recorder else None
+    human_ctrl.handle_input(keys,ball,opponent_team=blue_t)
+    obs_hist.append(np.array([blue_p.x,blue_p.y,ball.x,ball.y,
+                              ball.vel_x/10,ball.vel_y/10],np.float32))
+    if AGENT_MODE!="sync" or frame_no%AGENT_FRAME_SKIP==0:   # sync: else repeat
+        agent_ctrl.observe(pool_obs(list(obs_hist),AGENT_OBS_POOL,AGENT_FRAME_SKIP)[None],
+                           frame_no)
+    blue_act=agent_ctrl.action(frame_no)
+    agent_ctrl.apply(blue_act,ball)
+    frame_no+=1
 
     # physics
     ball.move()
@@ -219,12 +300,19 @@ while running:
     # ----------------------------------------------------------------------
 
     # goal?
-    if stadium.check_goal(ball):
+    scored=stadium.check_goal(ball)
+    if recorder:
+        recorder.add(frame_no-1,state,blue_act,key_mask(keys,human_ctrl.controls),
+                     done=bool(scored),episode=goals_total)
+    if scored:
+        goals_total+=1
         panel.trigger(stadium.score_red,stadium.score_blue)
         play_goal_effect()
         stadium.reset_ball_position(ball)
         ball.x,ball.y=W//2,TOP_MARGIN+FIELD_H//2
         red_p.x,red_p.y=START_RED; blue_p.x,blue_p.y=START_BLUE
+        index.update_all()
+        obs_hist.clear()                     # kick-off: no pre-goal frames in max/stack
 
     # draw
     panel.draw(screen,stadium.score_red,stadium.score_blue,clock)
@@ -235,7 +323,20 @@ while running:
 
     screen.blit(pitch_img,(0,TOP_MARGIN))
     ball.draw(screen); red_t.draw(screen); blue_t.draw(screen)
+    ai_lbl=f"AI: {slot.name}"+(f" → {slot.pending}…" if slot.pending else
+                               f" ({slot.error[0]} failed)" if slot.error else "")
+    screen.blit(font_ai.render(ai_lbl,True,(255,255,255)),(8,H-20))
     pygame.display.flip()
 
+agent_ctrl.stop()
+if recorder:
+    recorder.close()
+    print(f"🎞 recorded {recorder.rows} frames → {recorder.path}  "
+          f"({1e6*recorder.add_s/max(recorder.rows,1):.1f} µs/frame)")
+s=agent_ctrl.stats()
+print(f"🤖 agent [{s['mode']}] {s['decisions']} decisions, "
+      f"p50 {s['decide_ms_p50']:.2f} ms / p99 {s['decide_ms_p99']:.2f} ms, "
+      f"staleness mean {s['staleness_mean']:.2f} max {s['staleness_max']} frames"
+      + (f", {s['errors']} failed" if s['errors'] else ""))
 pygame.quit()
 print("🏁 Game ended – thanks for playing!")
\ No newline at end of file
@@ -0,0 +1,446 @@
+"""
+Behavior-cloning warm start from recorded matches
+=================================================
+
+Human matches recorded by ``main.py`` (``utils.recorder``) are turned into
+``(observation, action)`` pairs in ``FootballEnv``'s spaces, the 2×256
+policy network of ``create_model`` is fitted to them offline, and the
+result is saved as a regular PPO zip + VecNormalize pickle that
+``train_curriculum --init-model`` starts phase 0 from.
+
+Mapping a match row
+-------------------
+The human plays **red**, attacking the *right* goal; the agent plays blue
+towards the left.  Red rows are mirrored into the agent's frame:
+
+    player x  → W − red_x − width      ball x → W − ball_x      ball vx → −vx
+    y unchanged (minus TOP_MARGIN, as in ``FootballEnv._obs``)
+
+``red_keys`` holds every key pressed on that frame, the env takes one
+action:
+
+* kick with the ball within ``FOOT_R`` → 5 (a kick out of range does
+  nothing, so it maps to the no-op)
+* one direction → up 1 / down 2, and mirrored: red-left → 4, red-right → 3
+* two axes (diagonal) → the axis along which the ball is farther away;
+  opposite keys cancel
+* nothing → 0
+
+Training recordings (``source="train"``) already hold blue-frame states
+and ``blue_action`` and are used as they are.
+
+Training
+--------
+Observation statistics of the demonstrations seed ``VecNormalize.obs_rms``
+with their full sample count: the cloned layers only work on inputs
+normalised the way they were trained, so PPO's rollouts may move the
+statistics only slowly.  The actor is trained with Adam on the negative log-likelihood of the
+demonstrated actions plus a small entropy bonus, in mini-batches, with a
+held-out split for the accuracy report.  The value head is left alone.
+
+``--synthetic N`` records *N* episodes of a scripted red player through
+the same ``TrajectoryRecorder`` / key-mask path as ``main.py`` – useful
+when no human matches are at hand.  ``--compare`` trains the curriculum
+from scratch and from the clone and prints the global step at which each
+first reaches ``--target`` goal rate (``callbacks.GoalRateCallback``).
+
+    python -m rl_agent.behavior_cloning recordings/match_*
+    python -m rl_agent.behavior_cloning --synthetic 400
+    python -m rl_agent.behavior_cloning recordings/synthetic --compare \\
+        --phase-steps 40000,80000,120000 --target 0.5
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import time
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from rl_agent.environment import FIELD_H, FOOT_R, H, MAX_STEPS, MAX_V, TOP_MARGIN, W
+from utils.recorder import KEY_BITS, Recording, TrajectoryRecorder
+
+MODEL_DIR   = Path("models")
+SYNTH_DIR   = Path("recordings") / "synthetic"
+PLAYER_W    = PLAYER_H = 40                    # core.player.Player sprite size
+
+
+# ------------------------------------------------------------------ #
+#                     RECORDING → (obs, action)                      #
+# ------------------------------------------------------------------ #
+def keys_to_action(keys: np.ndarray, dx: np.ndarray, dy: np.ndarray) -> np.ndarray:
+    """
+    Env actions (blue frame) for red ``KEY_BITS`` masks; *dx*, *dy* are
+    foot-to-ball deltas in the red frame, used to pick one axis of a
+    diagonal and whether a kick can reach the ball.
+    """
+    keys = keys.astype(np.int64)
+    held = lambda name: (keys & KEY_BITS[name]) != 0
+    horiz = held("right").astype(np.int8) - held("left")        # +1 = red right
+    vert  = held("down").astype(np.int8) - held("up")           # +1 = down
+    use_h = (horiz != 0) & ((vert == 0) | (np.abs(dx) >= np.abs(dy)))
+    act = np.zeros(len(keys), np.int64)
+    act[vert < 0] = 1
+    act[vert > 0] = 2
+    act[use_h & (horiz > 0)] = 3                # red right = blue left
+    act[use_h & (horiz < 0)] = 4
+    act[held("kick") & (np.hypot(dx, dy) < FOOT_R)] = 5
+    return act
+
+
+def match_samples(rows: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Mirrored red-player observations and actions of ``source="match"`` rows."""
+    rows = rows[np.isfinite(rows["red_x"])]
+    px = W - rows["red_x"] - PLAYER_W
+    dx = rows["ball_x"] - (rows["red_x"] + PLAYER_W / 2)
+    dy = rows["ball_y"] - (rows["red_y"] + PLAYER_H)
+    obs = np.stack([px, rows["red_y"] - TOP_MARGIN,
+                    W - rows["ball_x"], rows["ball_y"] - TOP_MARGIN,
+                    np.clip(-rows["ball_vx"] / MAX_V, -1, 1),
+                    np.clip(rows["ball_vy"] / MAX_V, -1, 1)], axis=1)
+    return obs.astype(np.float32), keys_to_action(rows["red_keys"], dx, dy)
+
+
+def train_samples(rows: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Blue observations and actions of ``source="train"`` rows."""
+    rows = rows[rows["blue_action"] >= 0]
+    obs = np.stack([rows["blue_x"], rows["blue_y"] - TOP_MARGIN,
+                    rows["ball_x"], rows["ball_y"] - TOP_MARGIN,
+                    np.clip(rows["ball_vx"] / MAX_V, -1, 1),
+                    np.clip(rows["ball_vy"] / MAX_V, -1, 1)], axis=1)
+    return obs.astype(np.float32), rows["blue_action"].astype(np.int64)
+
+
+def load_demos(paths: list[Path]) -> tuple[np.ndarray, np.ndarray]:
+    """All (obs, action) pairs of the recordings at *paths*, chunk by chunk."""
+    obs, acts = [], []
+    for path in paths:
+        rec = Recording(path)
+        convert = train_samples if rec.meta.get("source") == "train" else match_samples
+        for chunk in rec:
+            o, a = convert(np.asarray(chunk))
+            obs.append(o)
+            acts.append(a)
+        print(f"  {path}: {len(rec):,} rows ({rec.meta.get('source')})")
+    if not obs:
+        raise ValueError("no recordings given")
+    return np.concatenate(obs), np.concatenate(acts)
+
+
+# ------------------------------------------------------------------ #
+#                     SCRIPTED RED DEMONSTRATOR                      #
+# ------------------------------------------------------------------ #
+def _demo_keys(p, ball) -> list[str]:
+    """Keys a red player attacking the right goal would hold this frame."""
+    fx, fy = p.x + PLAYER_W / 2, p.y + PLAYER_H
+    gx, gy = W, TOP_MARGIN + FIELD_H / 2
+    ax, ay = gx - ball.x, gy - ball.y
+    n = max(np.hypot(ax, ay), 1e-6)
+    tx = ball.x - 12 * ax / n                                 # just behind the ball,
+    ty = min(max(ball.y - 12 * ay / n, PLAYER_H), H)          # where a foot can be
+    # kick well inside reach (a clone's few-pixel errors must not turn
+    # "kick" into an out-of-range no-op it keeps repeating) and goalwards
+    dist = np.hypot(ball.x - fx, ball.y - fy)
+    if dist < FOOT_R - 12 and (ball.x - fx) * ax + (ball.y - fy) * ay > 0.5 * dist * n:
+        return ["kick"]
+    keys = []
+    if abs(tx - fx) > 2:
+        keys.append("right" if tx > fx else "left")
+    if abs(ty - fy) > 2:
+        keys.append("down" if ty > fy else "up")
+    if not keys:                        # target unreachable (ball against a wall)
+        keys = ["kick"] if dist < FOOT_R - 12 else ["right" if ball.x > fx else "left"]
+    return keys
+
+
+def record_synthetic(path: Path, episodes: int, *, noise: float = 0.01,
+                     seed: int = 0) -> Path:
+    """
+    Record *episodes* of the scripted red player (phase-2 spawns, mirrored)
+    as a ``source="match"`` recording in ``main.py``'s format.
+
+    With probability *noise* per frame a 10–60 frame perturbation starts
+    in which random keys are *executed* while the scripted keys are still
+    *recorded*: the ball comes to rest, the player drifts off its line,
+    and the demos show how to recover – states a clean script never
+    visits but a clone soon does.
+    """
+    from core.ball import Ball
+    from core.player import Player
+
+    rng = random.Random(seed)
+    frame, scored = 0, 0
+    with TrajectoryRecorder(path, source="match", synthetic=True,
+                            noise=noise, seed=seed) as rec:
+        for ep in range(episodes):
+            ball = Ball(W - rng.randint(50, 750), rng.randint(TOP_MARGIN + 50, H - 50))
+            red = Player(W - 700 - PLAYER_W, TOP_MARGIN + FIELD_H // 2, team="red")
+            burst, burst_keys = 0, []
+            for t in range(MAX_STEPS):
+                state = (np.nan, np.nan, red.x, red.y,    # no blue player
+                         ball.x, ball.y, ball.vel_x, ball.vel_y)
+                keys = _demo_keys(red, ball)
+                if not burst and rng.random() < noise:
+                    burst = rng.randint(10, 60)
+                    burst_keys = rng.sample(("up", "down", "left", "right"),
+                                            rng.randint(0, 1))
+                if burst:
+                    burst -= 1
+                for k in burst_keys if burst else keys:
+                    if k == "kick":
+                        red.kick_ball(ball)
+                    else:
+                        red.move(k)
+                ball.move()
+                done = ball.x >= W - 5 or ball.x <= 5 or t == MAX_STEPS - 1
+                rec.add(frame, state, keys=sum(KEY_BITS[k] for k in keys),
+                        done=done, episode=ep)
+                frame += 1
+                if done:
+                    scored += ball.x >= W - 5
+                    break
+    print(f"🎞 {episodes} scripted episodes, {frame:,} frames, "
+          f"{scored / max(episodes, 1):.0%} scored → {path}")
+    return Path(path)
+
+
+# ------------------------------------------------------------------ #
+#                            TRAINING                                #
+# ------------------------------------------------------------------ #
+def clone_policy(obs: np.ndarray, actions: np.ndarray, *, epochs: int = 20,
+                 batch_size: int = 512, lr: float = 1e-3, ent_coef: float = 1e-3,
+                 val_frac: float = 0.1, seed: int = 0, verbose: int = 1):
+    """
+    Fit ``create_model``'s actor to (*obs*, *actions*).  Returns
+    ``(model, vec_stats, report)``; *vec_stats* carries the demo obs stats.
+    """
+    import torch
+    from stable_baselines3.common.vec_env import VecNormalize
+
+    from rl_agent.model import create_model
+    from rl_agent.vec_env import FootballVecEnv
+
+    torch.manual_seed(seed)
+    stats = VecNormalize(FootballVecEnv(1, seed=seed), norm_obs=True,
+                         norm_reward=True, clip_obs=10.0)
+    stats.obs_rms.mean = obs.mean(0).astype(np.float64)
+    stats.obs_rms.var = obs.var(0).astype(np.float64)
+    stats.obs_rms.count = len(obs)
+    model = create_model(stats, tensorboard_log=None, seed=seed, verbose=0)
+    policy = model.policy
+
+    rng = np.random.default_rng(seed)
+    idx = rng.permutation(len(obs))
+    n_val = int(len(obs) * val_frac)
+    x = torch.as_tensor(stats.normalize_obs(obs), device=policy.device)
+    y = torch.as_tensor(actions, device=policy.device)
+    val, tr = idx[:n_val], idx[n_val:]
+    params = [*policy.mlp_extractor.policy_net.parameters(),
+              *policy.action_net.parameters()]
+    if policy.features_extractor is not None:
+        params += list(policy.features_extractor.parameters())
+    opt = torch.optim.Adam(params, lr=lr)
+
+    def accuracy(sel: np.ndarray) -> float:
+        if not len(sel):
+            return float("nan")
+        with torch.no_grad():
+            pred = policy.get_distribution(x[sel]).distribution.probs.argmax(1)
+        return float((pred == y[sel]).float().mean())
+
+    policy.set_training_mode(True)
+    t0 = time.perf_counter()
+    for epoch in range(epochs):
+        rng.shuffle(tr)
+        total = 0.0
+        for s in range(0, len(tr), batch_size):
+            b = tr[s:s + batch_size]
+            dist = policy.get_distribution(x[b])
+            loss = -dist.log_prob(y[b]).mean() - ent_coef * dist.entropy().mean()
+            opt.zero_grad()
+            loss.backward()
+            opt.step()
+            total += loss.item() * len(b)
+        if verbose and (epoch == epochs - 1 or epoch % 5 == 0):
+            print(f"  epoch {epoch:>3}  loss {total / max(len(tr), 1):.4f}  "
+                  f"val acc {accuracy(val):.3f}")
+    policy.set_training_mode(False)
+
+    counts = np.bincount(actions, minlength=6)
+    report = dict(samples=len(obs), train_acc=accuracy(tr[:50_000]),
+                  val_acc=accuracy(val), majority=float(counts.max() / len(actions)),
+                  action_share=(counts / len(actions)).round(3).tolist(),
+                  fit_s=time.perf_counter() - t0)
+    return model, stats, report
+
+
+def fit_value(model, stats, *, steps: int = 50_000, n_envs: int = 16,
+              phase: int = 0, epochs: int = 10, batch_size: int = 512,
+              lr: float = 1e-3, seed: int = 0) -> dict[str, float]:
+    """
+    Fit the value head to the clone's own discounted returns.
+
+    The clone plays *steps* env steps of *phase* (where the curriculum
+    starts).  Observations are normalised with the frozen obs statistics
+    of *stats* – exactly what PPO's critic will see – while its return
+    statistics are updated on the way, as VecNormalize would in training.
+    Steps whose return is cut off by the end of the rollout (no episode
+    end after them within the last ~log(0.01)/log(γ) steps) are dropped
+    rather than biased towards zero.  Without this the first PPO updates
+    run on the random critic's advantages and undo the cloned policy.
+    """
+    import torch
+    from stable_baselines3.common.vec_env import VecNormalize
+
+    from rl_agent.vec_env import FootballVecEnv
+
+    venv = VecNormalize(FootballVecEnv(n_envs, phase=phase, seed=seed),
+                        norm_obs=True, norm_reward=True, clip_obs=10.0,
+                        gamma=model.gamma)
+    venv.training = False                        # obs_rms stays frozen
+    venv.obs_rms, venv.ret_rms = stats.obs_rms, stats.ret_rms
+    n_steps = max(1, steps // n_envs)
+    obs_buf = np.zeros((n_steps, n_envs, venv.observation_space.shape[0]), np.float32)
+    rew_buf = np.zeros((n_steps, n_envs), np.float32)
+    done_buf = np.zeros((n_steps, n_envs), bool)
+    disc = np.zeros(n_envs)                      # VecNormalize's running return
+    obs = venv.reset()
+    for t in range(n_steps):
+        obs_buf[t] = obs
+        actions, _ = model.predict(obs, deterministic=False)
+        obs, _, done_buf[t], _ = venv.step(actions)
+        raw = venv.get_original_reward()
+        disc = disc * model.gamma + raw          # VecNormalize._update_reward
+        stats.ret_rms.update(disc)
+        rew_buf[t] = venv.normalize_reward(raw)
+        disc[done_buf[t]] = 0
+    venv.close()
+    # normalised obs / rewards of the rollout – what PPO's critic sees next
+    returns = np.zeros_like(rew_buf)
+    ret = np.zeros(n_envs, np.float32)
+    ended = np.zeros(n_envs, bool)               # an episode end follows step t
+    keep = np.zeros_like(done_buf)
+    horizon = int(np.ceil(np.log(0.01) / np.log(model.gamma)))
+    for t in reversed(range(n_steps)):
+        ret = rew_buf[t] + model.gamma * ret * ~done_buf[t]
+        returns[t] = ret
+        ended |= done_buf[t]
+        keep[t] = ended | (t < n_steps - horizon)
+    obs_buf, returns = obs_buf[keep], returns[keep]
+
+    policy = model.policy
+    x = torch.as_tensor(obs_buf, device=policy.device)
+    y = torch.as_tensor(returns, device=policy.device)
+    params = [*policy.mlp_extractor.value_net.parameters(),
+              *policy.value_net.parameters()]
+    opt = torch.optim.Adam(params, lr=lr)
+    rng = np.random.default_rng(seed)
+    for _ in range(epochs):
+        for b in np.array_split(rng.permutation(len(x)), max(1, len(x) // batch_size)):
+            loss = torch.nn.functional.mse_loss(policy.predict_values(x[b]).flatten(), y[b])
+            opt.zero_grad()
+            loss.backward()
+            opt.step()
+    with torch.no_grad():
+        pred = policy.predict_values(x).flatten()
+    explained = 1 - float(torch.var(y - pred) / (torch.var(y) + 1e-8))
+    return dict(value_steps=n_steps * n_envs, value_targets=len(x),
+                explained_variance=explained)
+
+
+# ------------------------------------------------------------------ #
+#                      WARM START vs SCRATCH                         #
+# ------------------------------------------------------------------ #
+def compare(init_model: Path, init_vecnorm: Path, steps: list[int], *,
+            target: float, every: int, episodes: int, n_envs: int = 8,
+            seed: int = 0) -> dict[str, dict[str, Any]]:
+    """Steps-to-*target* goal rate of the curriculum from scratch and warm-started."""
+    from rl_agent.callbacks import GoalRateCallback
+    from rl_agent.train_curriculum import train_curriculum
+
+    out = {}
+    for name, kw in (("scratch", {}),
+                     ("bc", dict(init_model=init_model, init_vecnorm=init_vecnorm))):
+        print(f"\n── {name} ──")
+        cb = GoalRateCallback(every, episodes, target=target, verbose=1)
+        t0 = time.perf_counter()
+        train_curriculum(steps, n_envs=n_envs, progress_bar=False, callbacks=[cb],
+                         model_kwargs=dict(seed=seed, verbose=0, tensorboard_log=None),
+                         **kw)
+        out[name] = dict(reached=cb.reached, wall_s=time.perf_counter() - t0,
+                         final=cb.history[-1]["goal_rate"] if cb.history else None,
+                         history=[(h["step"], round(h["goal_rate"], 3))
+                                  for h in cb.history])
+    print(f"\n{'start':<9}{'steps to ' + format(target, '.2f'):>16}{'final':>8}{'wall s':>9}")
+    for name, r in out.items():
+        reached = f"{r['reached']:,}" if r["reached"] is not None else "not reached"
+        final = r["final"] if r["final"] is not None else float("nan")
+        print(f"{name:<9}{reached:>16}{final:>8.3f}{r['wall_s']:>9.0f}")
+    return out
+
+
+# ------------------------------------------------------------------ #
+#                            ENTRY POINT                             #
+# ------------------------------------------------------------------ #
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    p = argparse.ArgumentParser(description="Behavior-cloning warm start")
+    p.add_argument("recordings", nargs="*", type=Path,
+                   help="recording folders (match or train)")
+    p.add_argument("--synthetic", type=int, metavar="N",
+                   help=f"first record N scripted episodes to {SYNTH_DIR}")
+    p.add_argument("--epochs", type=int, default=20)
+    p.add_argument("--batch-size", type=int, default=512)
+    p.add_argument("--lr", type=float, default=1e-3)
+    p.add_argument("--value-steps", type=int, default=50_000,
+                   help="clone rollout steps used to fit the value head (0: skip)")
+    p.add_argument("--seed", type=int, default=0)
+    p.add_argument("--out", default="bc", help="saves models/<out>_agent.zip / _vecnorm.pkl")
+    p.add_argument("--compare", action="store_true",
+                   help="then train the curriculum from scratch and from the clone")
+    p.add_argument("--phase-steps", type=lambda s: [int(x) for x in s.split(",")],
+                   help="schedule for --compare (default: train_curriculum.STEPS)")
+    p.add_argument("--target", type=float, default=0.5,
+                   help="phase-2 goal rate counted as 'reached' in --compare")
+    p.add_argument("--eval-every", type=int, default=20_000)
+    p.add_argument("--eval-episodes", type=int, default=100)
+    return p.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> None:
+    args = parse_args(argv)
+    paths = list(args.recordings)
+    if args.synthetic:
+        paths.append(record_synthetic(SYNTH_DIR, args.synthetic, seed=args.seed))
+
+    obs, actions = load_demos(paths)
+    model, stats, report = clone_policy(obs, actions, epochs=args.epochs,
+                                        batch_size=args.batch_size, lr=args.lr,
+                                        seed=args.seed)
+    if args.value_steps:
+        report.update(fit_value(model, stats, steps=args.value_steps, seed=args.seed))
+    from rl_agent.evaluate import goal_rate
+    report.update(goal_rate(model, stats, episodes=args.eval_episodes))
+    print(f"✅ {report['samples']:,} samples  |  val acc {report['val_acc']:.3f} "
+          f"(majority {report['majority']:.3f})  |  goal rate {report['goal_rate']:.3f}"
+          + (f"  |  value expl. var {report['explained_variance']:.2f}"
+             if "explained_variance" in report else ""))
+
+    MODEL_DIR.mkdir(exist_ok=True)
+    zip_path = MODEL_DIR / f"{args.out}_agent.zip"
+    vn_path = MODEL_DIR / f"{args.out}_vecnorm.pkl"
+    model.save(zip_path)
+    stats.save(vn_path)
+    stats.close()
+    print(f"💾 {zip_path}  {vn_path}")
+
+    if args.compare:
+        from rl_agent.train_curriculum import STEPS
+        compare(zip_path, vn_path, args.phase_steps or STEPS, target=args.target,
+                every=args.eval_every, episodes=args.eval_episodes, seed=args.seed)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,550 @@
+"""
+Training callbacks
+==================
+
+``AsyncCheckpoint`` – periodic, atomic, background checkpoints
+---------------------------------------------------------------
+Every *every* env steps (checked at rollout start, i.e. right after a PPO
+update, so weights and step counter agree) the callback snapshots
+
+* the PPO zip (policy **and** optimizer state, step counter),
+* the pickled ``VecNormalize`` statistics,
+* ``meta.json`` – curriculum phase, steps done in the phase, global step,
+  the phase schedule and env settings.
+
+Serialising to bytes happens on the training thread (a few ms for the
+2×256 MLP); writing to disk happens on a background thread.  Each
+checkpoint is written into ``.tmp-…`` and renamed into place, and
+``latest.json`` is replaced atomically afterwards, so a crash at any
+moment leaves the previous checkpoint intact.  Only the *keep* most
+recently written checkpoints are kept (by the write time in their
+``meta.json``, not by step count, so a fresh run never deletes its own
+checkpoints in favour of an older, longer run's); the one ``latest.json``
+names is never deleted.
+
+    models/checkpoints/
+        ckpt_000600000/ model.zip  vecnorm.pkl  meta.json
+        latest.json     → {"name": "ckpt_000600000", …}
+
+``GoalRateCallback`` – goal rate over training steps
+----------------------------------------------------
+Every *every* env steps the deterministic policy plays *episodes* matches
+(``evaluate.goal_rate``, phase-2 spawns by default).  Results go to the
+SB3 logger (``eval/goal_rate``) and ``history``; ``reached`` is the first
+global step at which the rate hit *target* – the number used to compare
+warm starts against training from scratch.
+
+``CurriculumScheduler`` – success-driven curriculum
+---------------------------------------------------
+Tracks a rolling window of the training episodes' outcomes
+(``info["outcome"]``) and lengths at the current curriculum level and
+promotes once the window is full, at least *min_steps* were spent on the
+level, the goal rate is ≥ *promote_rate* and (optionally) the mean
+episode length is ≤ *max_len*:
+
+* ``mode="phase"``      – the level is the curriculum phase; promotion
+  stops ``learn`` so ``train_curriculum`` moves on to the next phase and
+  the fixed phase lengths become upper bounds.
+* ``mode="difficulty"`` – one run on the continuous spawn difficulty
+  (``environment.spawn_box``), raised by *step* per promotion.
+
+Either way a *replay* share of the envs is re-assigned at every rollout
+start to a random easier level, so earlier skills are not forgotten
+(their episodes do not count towards the window).  With *finish* the last
+level's promotion ends training.  Rates are of the stochastic training
+policy, so they run below ``GoalRateCallback``'s deterministic ones.
+The mutable ``state`` dict (level, promotions) is JSON-able and goes
+into checkpoint ``meta.json`` so ``--resume`` picks up the level.
+
+``TrainingProfiler`` – where the training time goes
+---------------------------------------------------
+Splits every PPO iteration into
+
+* ``env``     – ``step_async`` + ``step_wait`` of the env below VecNormalize
+* ``vecnorm`` – the VecNormalize layer on top of that
+* ``policy``  – the rest of rollout collection (forward pass, buffer, callbacks)
+* ``update``  – the 10-epoch PPO update (rollout end → next rollout start)
+
+by timing the step calls of both layers and the rollout callbacks.  The
+timing is a pass-through ``VecEnvWrapper`` slipped in above and below
+VecNormalize for the duration of ``learn`` (``model.env`` and
+``VecNormalize.venv``, neither of which is pickled), so the VecNormalize
+object itself is untouched and checkpoints can pickle it mid-run – a few
+``perf_counter`` calls per step, ≈1 µs.  Per iteration it records
+``profile/*`` seconds, env steps/sec, update samples/sec and the process'
+peak RSS to the SB3 logger (so the ``logs/`` TensorBoard runs); at every
+training end the cumulative per-phase table is written to
+``profile.txt`` in the run's log folder.  ``table()`` returns it.
+"""
+
+from __future__ import annotations
+
+import io
+import json
+import os
+import pickle
+import shutil
+import sys
+import threading
+import time
+from collections import deque
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+from stable_baselines3.common.callbacks import BaseCallback
+from stable_baselines3.common.vec_env import VecEnv, VecEnvWrapper, VecNormalize
+
+try:                                   # peak RSS; not on Windows
+    import resource
+except ImportError:                    # pragma: no cover
+    resource = None
+
+LATEST_FILE = "latest.json"
+_PREFIX     = "ckpt_"
+
+
+def _write(path: Path, data: bytes) -> None:
+    with open(path, "wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def latest_checkpoint(root: Path | str) -> tuple[Path, dict[str, Any]] | None:
+    """(directory, meta) of the newest complete checkpoint in *root*, or None."""
+    root = Path(root)
+    try:
+        with open(root / LATEST_FILE) as f:
+            name = json.load(f)["name"]
+        path = root / name
+        with open(path / "meta.json") as f:
+            return path, json.load(f)
+    except (FileNotFoundError, KeyError, json.JSONDecodeError):
+        return None
+
+
+def load_vecnorm(path: Path) -> VecNormalize:
+    """
+    Stats-only ``VecNormalize`` (no venv) from a ``.pkl`` or a checkpoint
+    directory – pass it to ``wrap_with_stats``.
+    """
+    path = Path(path)
+    with open(path / "vecnorm.pkl" if path.is_dir() else path, "rb") as f:
+        return pickle.load(f)
+
+
+class _PhaseAware(BaseCallback):
+    """Tracks the curriculum phase and the steps of earlier phases."""
+
+    phase = 0
+    phase_offset = 0
+
+    def start_phase(self, phase: int, offset: int, done: int = 0) -> None:
+        """Called before ``learn``: *offset* global steps precede this phase."""
+        self.phase, self.phase_offset, self._last = phase, offset, done
+
+    def _on_step(self) -> bool:
+        return True
+
+
+# ------------------------------------------------------------------ #
+#                        ASYNC CHECKPOINTS                           #
+# ------------------------------------------------------------------ #
+class AsyncCheckpoint(_PhaseAware):
+    """Checkpoint every *every* env steps; see the module docstring."""
+
+    def __init__(self, root: Path | str, every: int = 100_000, keep: int = 3,
+                 meta: dict[str, Any] | None = None, verbose: int = 0):
+        super().__init__(verbose)
+        self.root  = Path(root)
+        self.every = every
+        self.keep  = keep
+        self.meta  = dict(meta or {})          # schedule, n_envs, … (static)
+        self._last = 0
+        self._thread: threading.Thread | None = None
+        self.timings = dict(snapshot_s=0.0, write_s=0.0, saves=0)
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    # ------------------------------------------------------------------
+    def _on_rollout_start(self) -> None:
+        if self.model.num_timesteps - self._last >= self.every:
+            self.save()
+
+    def save(self, model=None, vec_stats: VecNormalize | None = None,
+             **extra: Any) -> None:
+        """
+        Snapshot now (training thread) and write in the background; *extra*
+        goes into ``meta.json`` (e.g. ``phase_done=True`` at a phase end).
+        """
+        model = model or self.model
+        vec_stats = vec_stats or model.get_vec_normalize_env()
+        t0 = time.perf_counter()
+        buf = io.BytesIO()
+        model.save(buf)
+        done = model.num_timesteps
+        files = {"model.zip": buf.getvalue(),
+                 "vecnorm.pkl": pickle.dumps(vec_stats) if vec_stats is not None else b""}
+        meta = dict(self.meta, phase=self.phase, phase_steps=done,
+                    total_steps=self.phase_offset + done, time=time.time(), **extra)
+        files["meta.json"] = json.dumps(meta, indent=2).encode()
+        self.timings["snapshot_s"] += time.perf_counter() - t0
+        self._last = done
+
+        self.wait()                            # keep writes in order
+        name = f"{_PREFIX}{meta['total_steps']:09d}"
+        self._thread = threading.Thread(target=self._write, args=(name, files, meta),
+                                        name="checkpoint", daemon=False)
+        self._thread.start()
+
+    def wait(self) -> None:
+        """Block until the pending write (if any) is on disk."""
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _on_training_end(self) -> None:
+        self.wait()
+
+    # ------------------------------------------------------------------
+    def _write(self, name: str, files: dict[str, bytes], meta: dict[str, Any]) -> None:
+        t0 = time.perf_counter()
+        final = self.root / name
+        tmp = self.root / f".tmp-{name}"
+        shutil.rmtree(tmp, ignore_errors=True)
+        tmp.mkdir()
+        for fname, data in files.items():
+            _write(tmp / fname, data)
+        shutil.rmtree(final, ignore_errors=True)
+        os.replace(tmp, final)
+        latest = self.root / (LATEST_FILE + ".tmp")
+        _write(latest, json.dumps(dict(name=name, **meta)).encode())
+        os.replace(latest, self.root / LATEST_FILE)
+        self._rotate(name)
+        self.timings["write_s"] += time.perf_counter() - t0
+        self.timings["saves"] += 1
+        if self.verbose:
+            print(f"💾 checkpoint {name} (phase {meta['phase']})")
+
+    def _rotate(self, latest: str) -> None:
+        """Delete all but the *keep* most recently written checkpoints."""
+        def written(p: Path) -> float:
+            try:
+                with open(p / "meta.json") as f:
+                    return json.load(f)["time"]
+            except (OSError, KeyError, json.JSONDecodeError):
+                return p.stat().st_mtime
+        ckpts = sorted((p for p in self.root.glob(f"{_PREFIX}*") if p.is_dir()),
+                       key=written)
+        for old in ckpts[:-self.keep]:
+            if old.name != latest:
+                shutil.rmtree(old, ignore_errors=True)
+
+
+# ------------------------------------------------------------------ #
+#                           GOAL RATE                                #
+# ------------------------------------------------------------------ #
+class GoalRateCallback(_PhaseAware):
+    """Periodic goal-rate evaluation; see the module docstring."""
+
+    def __init__(self, every: int = 50_000, episodes: int = 100, phase: int = 2,
+                 target: float | None = None, verbose: int = 0):
+        super().__init__(verbose)
+        self.every    = every
+        self.episodes = episodes
+        self.eval_phase = phase
+        self.target   = target
+        self.history: list[dict[str, Any]] = []
+        self.reached: int | None = None
+        self._last = 0
+
+    def _on_step(self) -> bool:
+        if self.model.num_timesteps - self._last >= self.every:
+            self.evaluate()
+        return True
+
+    def evaluate(self) -> float:
+        from rl_agent.evaluate import goal_rate
+        self._last = self.model.num_timesteps
+        step = self.phase_offset + self.model.num_timesteps
+        r = goal_rate(self.model, self.model.get_vec_normalize_env(),
+                      episodes=self.episodes, phase=self.eval_phase)
+        self.history.append(dict(step=step, phase=self.phase, **r))
+        self.logger.record("eval/goal_rate", r["goal_rate"])
+        self.logger.record("eval/own_goal_rate", r["own_goal_rate"])
+        if self.target is not None and self.reached is None \
+                and r["goal_rate"] >= self.target:
+            self.reached = step
+        if self.verbose:
+            print(f"  step {step:>9,}  goal rate {r['goal_rate']:.3f}")
+        return r["goal_rate"]
+
+
+# ------------------------------------------------------------------ #
+#                      ADAPTIVE CURRICULUM                           #
+# ------------------------------------------------------------------ #
+class CurriculumScheduler(_PhaseAware):
+    """Success-driven phase / difficulty schedule; see the module docstring."""
+
+    MODES = ("phase", "difficulty")
+
+    def __init__(self, mode: str = "phase", *, promote_rate: float = 0.7,
+                 window: int = 200, min_steps: int = 20_000,
+                 max_len: float | None = None, step: float = 0.1,
+                 replay: float = 0.2, n_phases: int = 3, finish: bool = False,
+                 seed: int | None = None, verbose: int = 0):
+        super().__init__(verbose)
+        if mode not in self.MODES:
+            raise ValueError(f"mode must be one of {self.MODES}")
+        self.mode         = mode
+        self.promote_rate = promote_rate
+        self.min_steps    = min_steps
+        self.max_len      = max_len
+        self.step         = step
+        self.replay       = replay
+        self.n_phases     = n_phases
+        self.finish       = finish
+        self.state: dict[str, Any] = dict(difficulty=0.0, promotions=[], top=False)
+        self.promoted = False                  # phase mode: this phase is done
+        self._window: deque[tuple[bool, int]] = deque(maxlen=window)
+        self._since = 0                        # num_timesteps when the level began
+        self._cur = self._next = self._len = None
+        self._rng = np.random.default_rng(seed)
+
+    # ------------------------------------------------------------------
+    @property
+    def level(self) -> float:
+        """Current frontier: the phase, or the spawn difficulty."""
+        return self.phase if self.mode == "phase" else self.state["difficulty"]
+
+    @property
+    def _attr(self) -> str:
+        return "phase" if self.mode == "phase" else "difficulty"
+
+    def _last_level(self) -> bool:
+        return self.level >= (self.n_phases - 1 if self.mode == "phase" else 1.0)
+
+    def start_phase(self, phase: int, offset: int, done: int = 0) -> None:
+        super().start_phase(phase, offset, done)
+        self.promoted = False
+        self._window.clear()
+        self._since = done
+        self._cur = None
+
+    def rates(self) -> tuple[float, float]:
+        """(goal rate, mean episode length) over the current window."""
+        if not self._window:
+            return float("nan"), float("nan")
+        goals, lengths = zip(*self._window)
+        return float(np.mean(goals)), float(np.mean(lengths))
+
+    # ------------------------------------------------------------------
+    def _on_rollout_start(self) -> None:
+        n = self.training_env.num_envs
+        if self._cur is None:                  # envs were built at the frontier
+            self._cur = np.full(n, self.level, np.float64)
+            self._next = self._cur.copy()
+            self._len = np.zeros(n, np.int64)
+        target = np.full(n, self.level, np.float64)
+        easy = self._rng.random(n) < self.replay
+        if self.level > 0 and easy.any():
+            target[easy] = (self._rng.integers(0, self.phase, easy.sum())
+                            if self.mode == "phase"
+                            else self._rng.uniform(0, self.level, easy.sum()))
+        for i in np.flatnonzero(target != self._next):   # applies at the next reset
+            value = int(target[i]) if self.mode == "phase" else float(target[i])
+            self.training_env.set_attr(self._attr, value, indices=[int(i)])
+        self._next = target
+
+    def _on_step(self) -> bool:
+        dones, infos = self.locals["dones"], self.locals["infos"]
+        self._len += 1
+        for i in np.flatnonzero(dones):
+            if self._cur[i] == self.level:
+                self._window.append((infos[i].get("outcome", 0) == 1, int(self._len[i])))
+            self._cur[i] = self._next[i]
+            self._len[i] = 0
+        if self._ready():
+            self._promote()
+        return not self.promoted
+
+    def _on_rollout_end(self) -> None:
+        rate, length = self.rates()
+        self.logger.record("curriculum/goal_rate", rate)
+        self.logger.record("curriculum/ep_len", length)
+        self.logger.record("curriculum/level", self.level)
+
+    def _ready(self) -> bool:
+        if self.state["top"] and self._last_level() \
+                or len(self._window) < self._window.maxlen \
+                or self.model.num_timesteps - self._since < self.min_steps:
+            return False
+        rate, length = self.rates()
+        return rate >= self.promote_rate and (self.max_len is None or length <= self.max_len)
+
+    def _promote(self) -> None:
+        rate, length = self.rates()
+        row = dict(step=self.phase_offset + self.model.num_timesteps, level=self.level,
+                   goal_rate=round(rate, 3), ep_len=round(length, 1),
+                   level_steps=self.model.num_timesteps - self._since)
+        self.state["promotions"].append(row)
+        if self.verbose:
+            print(f"  ⬆ level {self.level:g} passed at step {row['step']:,}  "
+                  f"(goal rate {rate:.2f}, ep len {length:.0f})")
+        last = self._last_level()
+        self.state["top"] = last               # the last level counts once
+        if self.mode == "phase":
+            self.promoted = not last or self.finish
+        elif last:
+            self.promoted = self.finish
+        else:
+            self.state["difficulty"] = round(min(1.0, self.level + self.step), 6)
+        self._window.clear()
+        self._since = self.model.num_timesteps
+
+
+# ------------------------------------------------------------------ #
+#                            PROFILER                                #
+# ------------------------------------------------------------------ #
+def peak_rss_mb() -> float:
+    """High-water mark of this process' resident memory (NaN if unknown)."""
+    if resource is None:
+        return float("nan")
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss / 2**20 if sys.platform == "darwin" else rss / 2**10   # bytes / KiB
+
+
+class _StepTimer(VecEnvWrapper):
+    """Pass-through layer adding the time of every step call to ``clock[key]``."""
+
+    def __init__(self, venv: VecEnv, clock: dict[str, float], key: str):
+        super().__init__(venv)
+        self.clock, self.key = clock, key
+
+    def reset(self):
+        return self.venv.reset()
+
+    def step_async(self, actions: np.ndarray) -> None:
+        t0 = time.perf_counter()
+        self.venv.step_async(actions)
+        self.clock[self.key] += time.perf_counter() - t0
+
+    def step_wait(self):
+        t0 = time.perf_counter()
+        out = self.venv.step_wait()
+        self.clock[self.key] += time.perf_counter() - t0
+        return out
+
+
+class TrainingProfiler(_PhaseAware):
+    """Per-stage training time; see the module docstring."""
+
+    STAGES = ("env", "vecnorm", "policy", "update")
+
+    def __init__(self, verbose: int = 0):
+        super().__init__(verbose)
+        self.totals: dict[int, dict[str, float]] = {}      # phase → accumulators
+        self._clock = dict(outer=0.0, inner=0.0)
+        self._timers: list[tuple[Any, str]] = []           # (owner, attribute) wrapped
+        self._mark: float | None = None                     # rollout start / end
+        self._in_rollout = False
+        self._steps0 = 0
+
+    # ── env instrumentation ──
+    def _time(self, owner: Any, attr: str, key: str) -> None:
+        """Put a ``_StepTimer`` between *owner* and its ``attr`` VecEnv."""
+        setattr(owner, attr, _StepTimer(getattr(owner, attr), self._clock, key))
+        self._timers.append((owner, attr))
+
+    def _on_training_start(self) -> None:
+        vecnorm = self.model.get_vec_normalize_env()
+        self._time(self.model, "env", "outer")     # learn() reads model.env per rollout
+        if vecnorm is not None:
+            self._time(vecnorm, "venv", "inner")
+        self._acc = self.totals.setdefault(self.phase, dict.fromkeys(
+            ("wall", "rollout", *self.STAGES, "steps", "samples", "rss_mb"), 0.0))
+        self._mark, self._in_rollout = time.perf_counter(), False
+
+    # ── per iteration ──
+    def _on_rollout_start(self) -> None:
+        now = time.perf_counter()
+        if self._mark is not None and not self._in_rollout and self._acc["rollout"]:
+            upd = now - self._mark
+            samples = self.model.n_steps * self.model.n_envs * getattr(self.model, "n_epochs", 1)
+            self._acc["update"] += upd
+            self._acc["samples"] += samples
+            self.logger.record("profile/update_s", upd)
+            self.logger.record("profile/update_samples_per_s", samples / max(upd, 1e-9))
+        self._acc["wall"] += now - self._mark
+        self._clock.update(outer=0.0, inner=0.0)
+        self._steps0 = self.model.num_timesteps
+        self._mark, self._in_rollout = now, True
+
+    def _on_step(self) -> bool:
+        return True
+
+    def _on_rollout_end(self) -> None:
+        stages = self._close_rollout()
+        for k, v in stages.items():
+            self.logger.record(f"profile/{k}", v)
+
+    def _close_rollout(self) -> dict[str, float]:
+        now = time.perf_counter()
+        rollout = now - self._mark
+        outer, inner = self._clock["outer"], self._clock["inner"]
+        env = inner if len(self._timers) > 1 else outer
+        steps = self.model.num_timesteps - self._steps0
+        stages = dict(rollout_s=rollout, env_s=env, vecnorm_s=outer - env,
+                      policy_s=rollout - outer,
+                      env_steps_per_s=steps / max(rollout, 1e-9),
+                      rss_mb=peak_rss_mb())
+        acc = self._acc
+        acc["wall"] += rollout
+        acc["rollout"] += rollout
+        acc["env"] += env
+        acc["vecnorm"] += outer - env
+        acc["policy"] += rollout - outer
+        acc["steps"] += steps
+        acc["rss_mb"] = max(acc["rss_mb"], stages["rss_mb"])
+        self._mark, self._in_rollout = now, False
+        return stages
+
+    def _on_training_end(self) -> None:
+        if self._in_rollout:                   # stopped mid-rollout (scheduler)
+            self._close_rollout()
+        elif self._mark is not None:           # the final update
+            upd = time.perf_counter() - self._mark
+            self._acc["update"] += upd
+            self._acc["wall"] += upd
+            self._acc["samples"] += self.model.n_steps * self.model.n_envs \
+                * getattr(self.model, "n_epochs", 1)
+        self._mark = None
+        for owner, attr in reversed(self._timers):
+            setattr(owner, attr, getattr(owner, attr).venv)    # unwrap
+        self._timers.clear()
+        log_dir = self.logger.get_dir()
+        if log_dir:
+            Path(log_dir, "profile.txt").write_text(self.table() + "\n")
+        if self.verbose:
+            print(self.table())
+
+    # ── summary ──
+    def table(self) -> str:
+        """Per-phase and total time breakdown as a plain-text table."""
+        rows = dict(self.totals)
+        if len(rows) > 1:
+            total = {k: sum(r[k] for r in rows.values()) for k in next(iter(rows.values()))}
+            total["rss_mb"] = max(r["rss_mb"] for r in rows.values())
+            rows["all"] = total
+        head = (f"{'phase':>5}{'steps':>11}{'wall s':>9}"
+                + "".join(f"{s + ' %':>10}" for s in self.STAGES)
+                + f"{'env st/s':>10}{'upd sm/s':>10}{'peak MB':>9}")
+        lines = [head, "-" * len(head)]
+        for phase, r in rows.items():
+            wall = max(r["wall"], 1e-9)
+            lines.append(f"{phase:>5}{int(r['steps']):>11,}{r['wall']:>9.1f}"
+                         + "".join(f"{100 * r[s] / wall:>10.1f}" for s in self.STAGES)
+                         + f"{r['steps'] / max(r['rollout'], 1e-9):>10,.0f}"
+                         + f"{r['samples'] / max(r['update'], 1e-9):>10,.0f}"
+                         + f"{r['rss_mb']:>9.0f}")
+        return "\n".join(lines)
@@ -10,6 +10,52 @@ Reward summary (unchanged from the original)
 −0.2        on any kick right
 −0.01       while holding and not kicking
 +30         score left goal   (−2 if ball crosses own goal line)
+
+These are the defaults in ``REWARDS``; ``rewards={"goal_rew": 50, …}``
+on ``FootballEnv`` / ``FootballVecEnv`` / ``ShmVecEnv`` overrides any subset
+(used by ``rl_agent.sweep``).
+
+Time step
+---------
+``dt=None`` (default) steps the legacy one-frame ``Ball.move``.  Any other
+``dt`` (in frames, e.g. 4.0) switches to the fixed-timestep swept engine
+in ``core.physics`` so coarse steps cannot tunnel through posts, walls or
+the goal line.  Per-frame terms (distance, holding) are scaled by ``dt``
+and ``MAX_STEPS`` is counted in game frames, so an episode covers the
+same game time with 1/dt as many env steps.
+
+Spawn difficulty
+----------------
+``difficulty=d`` (0…1) replaces the three phase boxes with one box that
+grows continuously (``spawn_box``): d=0 is the phase-0 box, d=1 the
+phase-2 one, phase 1 sits near d≈0.55.  ``None`` keeps the phase boxes.
+Every finished episode reports ``info["outcome"]``: +1 goal, −1 own
+goal, 0 time-out (used by ``callbacks.CurriculumScheduler``).
+
+State snapshots
+---------------
+``get_state()`` copies the whole match state into a flat float64 vector
+(layout ``STATE_FIELDS``; pass ``out=`` to fill a preallocated buffer or
+a row of a bank) and ``set_state()`` writes one back, so a match can be
+rolled back or searched ahead::
+
+    snap = env.get_state(snap)            # reuse the same buffer
+    for a in range(6):
+        env.set_state(snap); _, r, *_ = env.step(a)
+
+``reset`` reuses the env's ``Ball`` / ``Player`` objects instead of
+building new ones.  ``start_states=bank`` (an ``(n, STATE_SIZE)`` array,
+e.g. ``sample_start_states`` or snapshots of interesting moments) makes
+every reset start from a random row instead of the spawn box;
+``reset(options={"state": s})`` starts from *s* once.
+
+Frame skip
+----------
+``frame_skip=k`` repeats the chosen action for k internal ticks and sums
+the shaped reward, so the policy is queried k× less often for the same
+game time.  ``obs_pool`` picks what the policy sees afterwards:
+``"last"`` (final tick), ``"max"`` (element-wise max of the last two
+ticks) or ``"stack"`` (the k tick observations concatenated, 6·k dims).
 """
 
 from __future__ import annotations  # keep first!
@@ -20,7 +66,6 @@ from typing import Any
 import gymnasium as gym
 import numpy as np
 from gymnasium import spaces
-import pygame                                    # real video backend
 
 from core.ball   import Ball
 from core.player import Player
@@ -41,40 +86,120 @@ SHRINK_BON  =  0.10
 KICK_LEFT_W =  3.0
 KICK_RIGHT  = -0.2
 HOLD_PEN    = -0.01
-GOAL_REW    = 30.0          # own-goal penalty handled in step()
+GOAL_REW    = 30.0
+OWN_GOAL_PEN = -2.0
+
+# name → default weight; ``rewards={...}`` on the envs overrides any subset
+REWARDS = dict(dist_pen=DIST_PEN, shrink_bon=SHRINK_BON, kick_left_w=KICK_LEFT_W,
+               kick_right=KICK_RIGHT, hold_pen=HOLD_PEN, goal_rew=GOAL_REW,
+               own_goal_pen=OWN_GOAL_PEN)
+
+
+def reward_weights(overrides: dict[str, float] | None = None) -> dict[str, float]:
+    """``REWARDS`` with *overrides* applied; unknown names are an error."""
+    unknown = set(overrides or ()) - REWARDS.keys()
+    if unknown:
+        raise ValueError(f"unknown reward weights {sorted(unknown)}; "
+                         f"choose from {sorted(REWARDS)}")
+    return {**REWARDS, **(overrides or {})}
+
+
+OBS_POOLS   = ("last", "max", "stack")
+P_START     = (700, TOP_MARGIN + FIELD_H // 2)    # player's kick-off position
+
+# flat snapshot layout of get_state / set_state / start-state banks
+STATE_FIELDS = ("t", "player_x", "player_y", "has_ball",
+                "ball_x", "ball_y", "ball_vx", "ball_vy", "prev_dist")
+STATE_SIZE   = len(STATE_FIELDS)
+
+# spawn box (x_lo, x_hi, y_lo, y_hi) of difficulty 0 and 1 = phases 0 and 2
+_MID        = TOP_MARGIN + FIELD_H // 2
+SPAWN_EASY  = (500, 750, _MID - 60, _MID + 60)
+SPAWN_HARD  = (50, 750, TOP_MARGIN + 50, TOP_MARGIN + FIELD_H - 50)
+PHASE_DIFFICULTY = (0.0, 0.55, 1.0)           # closest difficulty per phase
+
+
+def spawn_box(difficulty: float) -> tuple[int, int, int, int]:
+    """Ball spawn box for *difficulty* in [0, 1] (linear between the extremes)."""
+    d = min(max(float(difficulty), 0.0), 1.0)
+    return tuple(round(e + d * (h - e)) for e, h in zip(SPAWN_EASY, SPAWN_HARD))
+
+
+def build_spaces(frame_skip: int = 1, obs_pool: str = "last"
+                 ) -> tuple[spaces.Box, spaces.Discrete]:
+    """Observation / action spaces shared by every env flavour."""
+    # [p_x, p_y-TM, b_x, b_y-TM, v_x/10, v_y/10]  (× frame_skip if stacked)
+    low  = np.array([0, 0, 0, 0, -1, -1], np.float32)
+    high = np.array([W, FIELD_H, W, FIELD_H, 1, 1], np.float32)
+    if obs_pool == "stack":
+        low, high = np.tile(low, frame_skip), np.tile(high, frame_skip)
+    obs_space = spaces.Box(low=low, high=high, dtype=np.float32)
+    # 0 noop, 1-4 move, 5 kick
+    return obs_space, spaces.Discrete(6)
+
+
+def pool_obs(frames: list[np.ndarray], mode: str, k: int) -> np.ndarray:
+    """
+    Combine per-tick observations (oldest first) into what the policy sees.
+    Works for single ``(6,)`` and batched ``(n, 6)`` frames alike.
+    """
+    if mode == "last" or k == 1:
+        return frames[-1]
+    if mode == "max":
+        return np.maximum(frames[-2], frames[-1]) if len(frames) > 1 else frames[-1]
+    frames = list(frames[-k:])
+    frames += [frames[-1]] * (k - len(frames))     # episode ended early
+    return np.concatenate(frames, axis=-1)
 
 
 class FootballEnv(gym.Env):
     metadata = {"render_modes": ["human"], "render_fps": 60}
 
     # ------------------------------------------------------------------
-    def __init__(self, phase: int = 0, render_mode: str | None = None):
+    def __init__(self, phase: int = 0, render_mode: str | None = None,
+                 dt: float | None = None, frame_skip: int = 1,
+                 obs_pool: str = "last",
+                 rewards: dict[str, float] | None = None,
+                 difficulty: float | None = None,
+                 start_states: np.ndarray | None = None):
         super().__init__()
+        assert frame_skip >= 1 and obs_pool in OBS_POOLS
         self.phase       = int(phase)
+        self.difficulty  = difficulty
+        self.start_states = start_states
+        self.rw          = reward_weights(rewards)
+        self.dt          = dt
+        self.frame_skip  = int(frame_skip)
+        self.obs_pool    = obs_pool
         self.render_mode = render_mode
         self.viewer      = None
         self.clock       = None
 
-        # 0 noop, 1-4 move, 5 kick
-        self.action_space = spaces.Discrete(6)
-
-        # [p_x, p_y-TM, b_x, b_y-TM, v_x/10, v_y/10]
-        self.observation_space = spaces.Box(
-            low  = np.array([0, 0, 0, 0, -1, -1], np.float32),
-            high = np.array([W, FIELD_H, W, FIELD_H, 1, 1], np.float32),
-            dtype=np.float32,
-        )
+        self.observation_space, self.action_space = build_spaces(
+            self.frame_skip, obs_pool)
 
+        # created once; reset / set_state only rewrite their fields
+        self.ball   = Ball(0, 0)
+        self.player = Player(*P_START, team="blue")
         self.reset()
 
     # ------------------------------------------------------------------
     def reset(self, seed: int | None = None,
               options: dict[str, Any] | None = None):
         super().reset(seed=seed)
+        state = (options or {}).get("state")
+        if state is None and self.start_states is not None:
+            state = self.start_states[random.randrange(len(self.start_states))]
+        if state is not None:
+            return self.set_state(state), {}
         self.t = 0
 
         # curriculum spawn rectangles (x ranges unchanged; y shifted)
-        if self.phase == 0:                           # tight ±60 px box
+        if self.difficulty is not None:               # continuous box
+            x_lo, x_hi, y_lo, y_hi = spawn_box(self.difficulty)
+            bx = random.randint(x_lo, x_hi)
+            by = random.randint(y_lo, y_hi)
+        elif self.phase == 0:                         # tight ±60 px box
             bx = random.randint(500, 750)
             by = random.randint(
                 TOP_MARGIN + FIELD_H//2 - 60,
@@ -89,38 +214,82 @@ class FootballEnv(gym.Env):
             by = random.randint(TOP_MARGIN + 50,
                                 TOP_MARGIN + FIELD_H - 50)
 
-        self.ball   = Ball(bx, by)
-        self.player = Player(700, TOP_MARGIN + FIELD_H//2, team="blue")
+        ball, player = self.ball, self.player
+        ball.x, ball.y         = bx, by
+        ball.vel_x = ball.vel_y = 0
+        player.x, player.y     = P_START
+        player.has_ball        = False
+        self.prev_dist         = self._foot_dist()
 
-        self.player.has_ball = False
-        self.prev_dist       = self._foot_dist()
+        return pool_obs([self._obs()], self.obs_pool, self.frame_skip), {}
 
-        return self._obs(), {}
+    # ------------------------------------------------------------------
+    def get_state(self, out: np.ndarray | None = None) -> np.ndarray:
+        """Match state as a flat ``STATE_FIELDS`` vector, written into *out* if given."""
+        if out is None:
+            out = np.empty(STATE_SIZE)
+        b, p = self.ball, self.player
+        out[0], out[1], out[2], out[3] = self.t, p.x, p.y, p.has_ball
+        out[4], out[5], out[6], out[7] = b.x, b.y, b.vel_x, b.vel_y
+        out[8] = self.prev_dist
+        return out
+
+    def set_state(self, state) -> np.ndarray:
+        """Restore a ``get_state`` vector; returns the observation of that state."""
+        t, px, py, has_ball, bx, by, vx, vy, prev = map(float, state)
+        b, p = self.ball, self.player
+        self.t, p.x, p.y, p.has_ball = int(t), px, py, bool(has_ball)
+        b.x, b.y, b.vel_x, b.vel_y = bx, by, vx, vy
+        self.prev_dist = prev
+        return pool_obs([self._obs()], self.obs_pool, self.frame_skip)
 
     # ------------------------------------------------------------------
     def step(self, action: int):
+        """Repeat *action* for ``frame_skip`` ticks; rewards are summed."""
+        if self.frame_skip == 1:
+            return self._tick(action)
+
+        frames, total = [], 0.0
+        terminated = truncated = False
+        for _ in range(self.frame_skip):
+            obs, r, terminated, truncated, info = self._tick(action)
+            frames.append(obs)
+            total += r
+            if terminated or truncated:
+                break
+        obs = pool_obs(frames, self.obs_pool, self.frame_skip)
+        return obs, total, terminated, truncated, info
+
+    def _tick(self, action: int):
+        """One physics tick (the original per-frame step)."""
         self.t += 1
         r = 0.0
         did_kick = False
         kick_left = False
+        dt = 1.0 if self.dt is None else self.dt
 
         # movement / kick ------------------------------------------------
         if action in (1, 2, 3, 4):
-            self.player.move(("noop", "up", "down", "left", "right")[action])
+            self.player.move(("noop", "up", "down", "left", "right")[action], dt)
         elif action == 5 and self._foot_dist() < FOOT_R:
             self.player.kick_ball(self.ball)
             did_kick  = True
             kick_left = self.ball.vel_x < 0
 
         # physics --------------------------------------------------------
-        self.ball.move()
+        goal = None
+        if self.dt is None:
+            self.ball.move()
+        else:
+            goal = self.ball.step(dt)
         self.player.has_ball = self._foot_dist() < FOOT_R
 
         # distance shaping ----------------------------------------------
         dist = self._foot_dist()
-        r += DIST_PEN * dist
+        rw = self.rw
+        r += rw["dist_pen"] * dist * dt
         if not self.player.has_ball:
-            r += SHRINK_BON * (self.prev_dist - dist)
+            r += rw["shrink_bon"] * (self.prev_dist - dist)
         self.prev_dist = dist
 
         # kick reward ----------------------------------------------------
@@ -128,25 +297,27 @@ class FootballEnv(gym.Env):
             if kick_left:
                 cos = abs(self.ball.vel_x) / (
                         abs(self.ball.vel_x) + abs(self.ball.vel_y) + 1e-6)
-                r += KICK_LEFT_W * cos
+                r += rw["kick_left_w"] * cos
             else:
-                r += KICK_RIGHT
+                r += rw["kick_right"]
 
         # holding penalty ------------------------------------------------
         if self.player.has_ball and not did_kick:
-            r += HOLD_PEN
+            r += rw["hold_pen"] * dt
 
         # goals & termination -------------------------------------------
-        terminated = False
-        if self.ball.x <= 5:                      # scored left
-            r += GOAL_REW
-            terminated = True
-        elif self.ball.x >= W - 5:                # own goal
-            r -= 2.0
-            terminated = True
-
-        truncated = self.t >= MAX_STEPS
-        return self._obs(), r, terminated, truncated, {}
+        outcome = 0
+        if goal == "left" or self.ball.x <= 5:     # scored left
+            r += rw["goal_rew"]
+            outcome = 1
+        elif goal == "right" or self.ball.x >= W - 5:   # own goal
+            r += rw["own_goal_pen"]
+            outcome = -1
+        terminated = outcome != 0
+
+        truncated = self.t * dt >= MAX_STEPS
+        info = {"outcome": outcome} if terminated or truncated else {}
+        return self._obs(), r, terminated, truncated, info
 
     # ------------------------------------------------------------------
     # helpers
@@ -160,8 +331,8 @@ class FootballEnv(gym.Env):
         return math.hypot(self.ball.x - fx, self.ball.y - fy)
 
     def _obs(self):
-        vx = np.clip(self.ball.vel_x / MAX_V, -1, 1)
-        vy = np.clip(self.ball.vel_y / MAX_V, -1, 1)
+        vx = min(max(self.ball.vel_x / MAX_V, -1.0), 1.0)   # np.clip is slow on scalars
+        vy = min(max(self.ball.vel_y / MAX_V, -1.0), 1.0)
         return np.array([
             self.player.x,
             self.player.y - TOP_MARGIN,
@@ -171,3 +342,13 @@ class FootballEnv(gym.Env):
         ], np.float32)
 
     # (render() and close() are unchanged; include if you need them)
+
+
+def sample_start_states(n: int, **env_kwargs: Any) -> np.ndarray:
+    """``(n, STATE_SIZE)`` bank of fresh kick-off states of ``FootballEnv(**env_kwargs)``."""
+    env  = FootballEnv(**env_kwargs)
+    bank = np.empty((n, STATE_SIZE))
+    for row in bank:
+        env.reset()
+        env.get_state(row)
+    return bank
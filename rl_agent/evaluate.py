@@ -0,0 +1,248 @@
+"""
+Parallel policy evaluation
+==========================
+
+Plays thousands of episodes per curriculum phase across worker processes
+and reports, per phase:
+
+* ``goal_rate`` / ``own_goal_rate`` / ``timeout_rate``
+* ``steps_to_goal``  – mean game ticks of the scoring episodes
+* ``kick_accuracy``  – kicks after which the free ball would score,
+  over all kicks (``FootballVecEnv(match_stats=True)``)
+* ``kick_forward``   – share of kicks sent towards the opponent goal
+* ``kicks_per_ep``, throughput (env steps/sec, episodes/sec)
+
+Workers run a batched ``FootballVecEnv`` and the torch-free
+``NumpyPolicy`` (a ``.zip`` checkpoint is exported to a temporary
+``.npz`` once, in the parent), so a worker starts in well under a second.
+Every env slot plays a fixed quota of episodes — counting the first N
+finished episodes instead would over-sample the short (scoring) ones.
+
+    python -m rl_agent.evaluate                         # newest registered model
+    python -m rl_agent.evaluate --model final_agent --episodes 5000
+    python -m rl_agent.evaluate --model models/policy_int8.npz --json eval.json
+    python -m rl_agent.evaluate --min-goal-rate 0.35    # exit 1 below (phase 2)
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import multiprocessing as mp
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from rl_agent.shm_vec_env import available_cores
+
+PHASES = (0, 1, 2)
+
+
+# ------------------------------------------------------------------ #
+#                          WORKER SIDE                               #
+# ------------------------------------------------------------------ #
+def _play(policy_path: str, phase: int, episodes: int, n_envs: int,
+          seed: int, deterministic: bool, frame_skip: int,
+          obs_pool: str) -> dict[str, Any]:
+    """Play *episodes* in one process; returns raw tallies for merging."""
+    from rl_agent.numpy_policy import NumpyPolicy
+    from rl_agent.vec_env import FootballVecEnv
+
+    n_envs = max(1, min(n_envs, episodes))
+    quota = np.full(n_envs, episodes // n_envs)
+    quota[: episodes % n_envs] += 1
+    pi = NumpyPolicy.load(policy_path)
+    pi.rng = np.random.default_rng(seed)
+    env = FootballVecEnv(n_envs, phase=phase, seed=seed, frame_skip=frame_skip,
+                         obs_pool=obs_pool, match_stats=True)
+    obs = env.reset()
+    done_eps = np.zeros(n_envs, np.int64)
+    tally = dict(episodes=0, goals=0, own_goals=0, goal_steps=0, steps=0,
+                 kicks=0, forward=0, on_target=0, env_steps=0)
+    t0 = time.perf_counter()
+    while (done_eps < quota).any():
+        actions, _ = pi.predict(obs, deterministic)
+        obs, _, dones, infos = env.step(actions)
+        tally["env_steps"] += int((done_eps < quota).sum())
+        for i in np.flatnonzero(dones & (done_eps < quota)):
+            m = infos[i]["match"]
+            done_eps[i] += 1
+            tally["episodes"] += 1
+            tally["goals"] += m["goal"]
+            tally["own_goals"] += m["own_goal"]
+            tally["goal_steps"] += m["steps"] if m["goal"] else 0
+            tally["steps"] += m["steps"]
+            tally["kicks"] += m["kicks"]
+            tally["forward"] += m["forward"]
+            tally["on_target"] += m["on_target"]
+    tally["busy_s"] = time.perf_counter() - t0
+    return tally
+
+
+def _summarise(phase: int, parts: list[dict[str, Any]], wall: float) -> dict[str, Any]:
+    t = {k: sum(p[k] for p in parts) for k in parts[0]}
+    n = max(t["episodes"], 1)
+    return dict(
+        phase=phase,
+        episodes=t["episodes"],
+        goal_rate=t["goals"] / n,
+        own_goal_rate=t["own_goals"] / n,
+        timeout_rate=(n - t["goals"] - t["own_goals"]) / n,
+        steps_to_goal=t["goal_steps"] / t["goals"] if t["goals"] else None,
+        mean_steps=t["steps"] / n,
+        kick_accuracy=t["on_target"] / t["kicks"] if t["kicks"] else None,
+        kick_forward=t["forward"] / t["kicks"] if t["kicks"] else None,
+        kicks_per_ep=t["kicks"] / n,
+        env_steps=t["env_steps"],
+        wall_s=wall,
+        steps_per_sec=t["env_steps"] / wall,
+        episodes_per_sec=t["episodes"] / wall,
+    )
+
+
+# ------------------------------------------------------------------ #
+#                     IN-PROCESS (training time)                     #
+# ------------------------------------------------------------------ #
+def goal_rate(model, stats, episodes: int = 200, phase: int = 2,
+              n_envs: int = 50, seed: int = 12345, frame_skip: int = 1,
+              obs_pool: str = "last") -> dict[str, float]:
+    """
+    Quick single-process check of a live SB3 *model* + its ``VecNormalize``
+    *stats* (sweeps, training callbacks); same episode quota rule as ``_play``.
+    """
+    from rl_agent.vec_env import FootballVecEnv
+
+    n_envs = max(1, min(n_envs, episodes))
+    quota = np.full(n_envs, episodes // n_envs)
+    quota[: episodes % n_envs] += 1
+    env = FootballVecEnv(n_envs, phase=phase, seed=seed, frame_skip=frame_skip,
+                         obs_pool=obs_pool, match_stats=True)
+    obs = env.reset()
+    done_eps = np.zeros(n_envs, np.int64)
+    goals = own = 0
+    while (done_eps < quota).any():
+        actions, _ = model.predict(stats.normalize_obs(obs), deterministic=True)
+        obs, _, dones, infos = env.step(actions)
+        for i in np.flatnonzero(dones & (done_eps < quota)):
+            done_eps[i] += 1
+            goals += infos[i]["match"]["goal"]
+            own += infos[i]["match"]["own_goal"]
+    n = int(done_eps.sum())
+    return dict(goal_rate=goals / n, own_goal_rate=own / n, episodes=n)
+
+
+# ------------------------------------------------------------------ #
+#                          PARENT SIDE                               #
+# ------------------------------------------------------------------ #
+def resolve_policy(model: str | None, vecnorm: Path | None,
+                   tmpdir: Path) -> tuple[Path, str]:
+    """
+    *model* is a registry name, a ``.zip`` / ``.npz`` path or None (newest
+    registered checkpoint).  Returns an ``.npz`` path and a display name.
+    """
+    from rl_agent.registry import ModelRegistry
+
+    path = Path(model) if model else None
+    if path is None or not path.exists():
+        reg = ModelRegistry()
+        reg.scan()
+        entry = reg.get(model or reg.default())
+        path = reg.root / entry["path"]
+        if vecnorm is None and entry.get("vecnorm"):
+            vecnorm = reg.root / entry["vecnorm"]
+    if path.suffix == ".npz":
+        return path, path.name
+    from rl_agent.numpy_policy import export
+    return export(path, vecnorm, tmpdir / f"{path.stem}.npz"), path.name
+
+
+def evaluate(policy_path: Path | str, *, phases: tuple[int, ...] = PHASES,
+             episodes: int = 2_000, workers: int | None = None,
+             n_envs: int = 64, seed: int = 0, deterministic: bool = True,
+             frame_skip: int = 1, obs_pool: str = "last") -> list[dict[str, Any]]:
+    """*episodes* per phase, split over *workers* processes (default: all cores)."""
+    workers = max(1, min(workers or available_cores(), episodes))
+    ctx = mp.get_context("forkserver" if "forkserver" in mp.get_all_start_methods()
+                         else "spawn")
+    rows = []
+    with ProcessPoolExecutor(workers, mp_context=ctx) as pool:
+        for phase in phases:
+            share = [episodes // workers + (w < episodes % workers) for w in range(workers)]
+            t0 = time.perf_counter()
+            futs = [pool.submit(_play, str(policy_path), phase, k, n_envs,
+                                seed + 1000 * phase + w, deterministic,
+                                frame_skip, obs_pool)
+                    for w, k in enumerate(share) if k]
+            parts = [f.result() for f in futs]
+            rows.append(_summarise(phase, parts, time.perf_counter() - t0))
+    return rows
+
+
+def report(rows: list[dict[str, Any]]) -> None:
+    def fmt(v, spec):
+        return format(v, spec) if v is not None else "—".rjust(len(format(0, spec)))
+
+    print(f"\n{'phase':>5}{'episodes':>10}{'goal':>8}{'own':>7}{'timeout':>9}"
+          f"{'→goal':>8}{'kick acc':>10}{'fwd':>7}{'kicks/ep':>10}{'steps/s':>11}{'wall s':>8}")
+    for r in rows:
+        print(f"{r['phase']:>5}{r['episodes']:>10,}{r['goal_rate']:>8.3f}"
+              f"{r['own_goal_rate']:>7.3f}{r['timeout_rate']:>9.3f}"
+              f"{fmt(r['steps_to_goal'], '>8.0f')}{fmt(r['kick_accuracy'], '>10.3f')}"
+              f"{fmt(r['kick_forward'], '>7.3f')}"
+              f"{r['kicks_per_ep']:>10.2f}{r['steps_per_sec']:>11,.0f}{r['wall_s']:>8.2f}")
+
+
+# ------------------------------------------------------------------ #
+#                            ENTRY POINT                             #
+# ------------------------------------------------------------------ #
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    p = argparse.ArgumentParser(description="Parallel policy evaluation")
+    p.add_argument("--model", default=None,
+                   help="registry name or .zip / .npz path (default: newest)")
+    p.add_argument("--vecnorm", type=Path, default=None,
+                   help="VecNormalize .pkl for a .zip given by path")
+    p.add_argument("--phases", type=lambda s: tuple(int(x) for x in s.split(",")),
+                   default=PHASES, help="comma-separated curriculum phases")
+    p.add_argument("--episodes", type=int, default=2_000, help="episodes per phase")
+    p.add_argument("--workers", type=int, default=None, help="processes (default: all cores)")
+    p.add_argument("--n-envs", type=int, default=64, help="batched matches per worker")
+    p.add_argument("--seed", type=int, default=0)
+    p.add_argument("--stochastic", action="store_true", help="sample actions")
+    p.add_argument("--frame-skip", type=int, default=1)
+    p.add_argument("--obs-pool", default="last")
+    p.add_argument("--json", type=Path, default=None, help="write results here")
+    p.add_argument("--min-goal-rate", type=float, default=None,
+                   help="exit with status 1 if the last phase scores less")
+    return p.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> None:
+    args = parse_args(argv)
+    with tempfile.TemporaryDirectory() as tmp:
+        policy, name = resolve_policy(args.model, args.vecnorm, Path(tmp))
+        t0 = time.perf_counter()
+        rows = evaluate(policy, phases=args.phases, episodes=args.episodes,
+                        workers=args.workers, n_envs=args.n_envs, seed=args.seed,
+                        deterministic=not args.stochastic,
+                        frame_skip=args.frame_skip, obs_pool=args.obs_pool)
+        total = time.perf_counter() - t0
+    print(f"model: {name}")
+    report(rows)
+    print(f"total {total:.2f}s")
+    if args.json is not None:
+        args.json.write_text(json.dumps(dict(
+            model=name, episodes_per_phase=args.episodes, seed=args.seed,
+            deterministic=not args.stochastic, wall_s=total, phases=rows), indent=2))
+        print(f"→ {args.json}")
+    if args.min_goal_rate is not None and rows[-1]["goal_rate"] < args.min_goal_rate:
+        print(f"❌ goal rate {rows[-1]['goal_rate']:.3f} < {args.min_goal_rate}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
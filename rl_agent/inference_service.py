@@ -0,0 +1,297 @@
+"""
+Micro-batched policy inference for many concurrent matches
+==========================================================
+
+Every match (thread) calls ``service.predict(obs)`` with one observation;
+a single worker thread collects the pending requests, runs them as one
+batched ``model.predict`` once *max_batch* requests are waiting or the
+oldest one has waited *max_wait_ms*, and hands each caller its action.
+
+    svc = InferenceService(PPO.load(ckpt), normalize=ObsNormalizer.load(pkl))
+    svc = InferenceService(NumpyPolicy.load(npz))  # normalisation fused in
+    with svc:
+        act = svc.predict(obs)            # from any number of threads
+    svc.report()                           # batch-size / latency histograms
+
+``submit`` only accepts requests while the worker runs (between
+``start()`` and ``stop()``) and raises ``ServiceStopped`` otherwise;
+``stop()`` serves what is already batched and fails every request still
+queued with it, so no caller is left blocking on a future nobody will
+resolve.
+
+Loopback load test (N client threads, each driving its own FootballEnv)::
+
+    python -m rl_agent.inference_service --clients 300 --steps 50
+"""
+
+from __future__ import annotations
+
+import argparse
+import queue
+import threading
+import time
+from bisect import bisect_left
+from collections import Counter
+from concurrent.futures import Future
+from pathlib import Path
+from typing import Any, Callable
+
+import numpy as np
+
+MODELS_DIR = Path(__file__).resolve().parent.parent / "models"
+LATENCY_EDGES_MS = (0.1, 0.25, 0.5, 1, 2, 5, 10, 20, 50, 100, 250)
+
+
+# ------------------------------------------------------------------ #
+#                            HISTOGRAMS                              #
+# ------------------------------------------------------------------ #
+def _pow2_bucket(n: int) -> int:
+    """Smallest power of two ≥ n (batch-size histogram bucket)."""
+    return 1 << (max(1, n) - 1).bit_length()
+
+
+def _print_hist(title: str, counts: dict[Any, int], label: Callable[[Any], str]) -> None:
+    total = sum(counts.values()) or 1
+    print(f"\n{title}")
+    for key in sorted(counts):
+        frac = counts[key] / total
+        print(f"  {label(key):>12}  {counts[key]:>8}  {frac:6.1%}  {'█' * int(40 * frac)}")
+
+
+# ------------------------------------------------------------------ #
+#                             SERVICE                                #
+# ------------------------------------------------------------------ #
+class ServiceStopped(RuntimeError):
+    """Raised by ``submit`` when the worker is not running / set on pending futures."""
+
+
+class InferenceService:
+    """Thread-based request batcher in front of an SB3 model."""
+
+    def __init__(self, model, normalize: Callable[[np.ndarray], np.ndarray] | None = None,
+                 *, max_batch: int = 256, max_wait_ms: float = 2.0,
+                 deterministic: bool = True):
+        self.model         = model
+        self.normalize     = normalize
+        self.max_batch     = int(max_batch)
+        self.max_wait      = max_wait_ms / 1000.0
+        self.deterministic = deterministic
+
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._thread: threading.Thread | None = None
+        self._stop = threading.Event()
+        self._lock = threading.Lock()             # orders submit against start / stop
+        self._accepting = False                   # worker running, submit allowed
+        self.reset_stats()
+
+    # ------------------------------------------------------------------
+    # lifecycle
+    def start(self) -> "InferenceService":
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._serve, name="inference",
+                                            daemon=True)
+            self._thread.start()
+            with self._lock:
+                self._accepting = True
+        return self
+
+    def stop(self) -> None:
+        with self._lock:                          # no submit can slip in after this
+            self._accepting = False
+        if self._thread is not None:
+            self._stop.set()
+            self._queue.put(None)                 # wake the worker
+            self._thread.join()
+            self._thread = None
+        self._fail_pending()
+
+    def _fail_pending(self) -> None:
+        """Resolve every request left in the queue with ``ServiceStopped``."""
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                return
+            if item is not None:
+                item[2].set_exception(ServiceStopped("inference service stopped"))
+
+    def __enter__(self) -> "InferenceService":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    # ------------------------------------------------------------------
+    # client API
+    def submit(self, obs: np.ndarray) -> Future:
+        """Queue one observation; the future resolves to its action."""
+        fut: Future = Future()
+        item = (np.asarray(obs, np.float32), time.perf_counter(), fut)
+        with self._lock:
+            if not self._accepting:
+                raise ServiceStopped("inference service is not running – call start() "
+                                     "or use it as a context manager")
+            self._queue.put(item)
+        return fut
+
+    def predict(self, obs: np.ndarray, timeout: float | None = None) -> Any:
+        """Blocking ``submit(obs).result()``."""
+        return self.submit(obs).result(timeout)
+
+    # ------------------------------------------------------------------
+    # stats
+    def reset_stats(self) -> None:
+        self.batch_hist:   Counter = Counter()    # pow-2 bucket → batches
+        self.latency_hist: Counter = Counter()    # edge index → requests
+        self.n_requests = 0
+        self.n_batches  = 0
+        self.forward_s  = 0.0
+
+    def stats(self) -> dict[str, Any]:
+        labels = [f"≤{e}" for e in LATENCY_EDGES_MS] + [f">{LATENCY_EDGES_MS[-1]}"]
+        return dict(
+            requests=self.n_requests,
+            batches=self.n_batches,
+            mean_batch=self.n_requests / max(1, self.n_batches),
+            forward_ms_per_batch=1e3 * self.forward_s / max(1, self.n_batches),
+            batch_hist={k: self.batch_hist[k] for k in sorted(self.batch_hist)},
+            latency_ms_hist={labels[k]: self.latency_hist[k] for k in sorted(self.latency_hist)},
+        )
+
+    def report(self) -> None:
+        s = self.stats()
+        print(f"\n{s['requests']:,} requests in {s['batches']:,} batches "
+              f"(mean {s['mean_batch']:.1f}, forward {s['forward_ms_per_batch']:.2f} ms/batch)")
+        _print_hist("batch size", self.batch_hist, lambda k: f"≤{k}")
+        _print_hist("latency (ms, submit → action)", self.latency_hist,
+                    lambda k: (f"≤{LATENCY_EDGES_MS[k]}" if k < len(LATENCY_EDGES_MS)
+                               else f">{LATENCY_EDGES_MS[-1]}"))
+
+    # ------------------------------------------------------------------
+    # worker
+    def _collect(self) -> list[tuple[np.ndarray, float, Future]]:
+        """Block for one request, then gather more until full or deadline."""
+        first = self._queue.get()
+        if first is None:
+            return []
+        batch = [first]
+        deadline = first[1] + self.max_wait
+        while len(batch) < self.max_batch:
+            timeout = deadline - time.perf_counter()
+            try:
+                item = self._queue.get(timeout=timeout) if timeout > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is None:                      # stop requested – serve what we have
+                self._stop.set()
+                break
+            batch.append(item)
+        return batch
+
+    def _serve(self) -> None:
+        while not self._stop.is_set():
+            batch = self._collect()
+            if not batch:
+                continue
+            obs = np.stack([b[0] for b in batch])
+            t0 = time.perf_counter()
+            try:
+                if self.normalize is not None:
+                    obs = self.normalize(obs)
+                actions, _ = self.model.predict(obs, deterministic=self.deterministic)
+            except Exception as exc:              # fail every waiting caller
+                for _, _, fut in batch:
+                    fut.set_exception(exc)
+                continue
+            t1 = time.perf_counter()
+            self.forward_s += t1 - t0
+            self.n_batches += 1
+            self.n_requests += len(batch)
+            self.batch_hist[_pow2_bucket(len(batch))] += 1
+            for (_, t_submit, fut), a in zip(batch, actions):
+                self.latency_hist[bisect_left(LATENCY_EDGES_MS, 1e3 * (t1 - t_submit))] += 1
+                fut.set_result(a)
+
+
+# ------------------------------------------------------------------ #
+#                          LOOPBACK TEST                             #
+# ------------------------------------------------------------------ #
+def load_policy(model_path: Path | None = None, vecnorm_path: Path | None = None):
+    """(PPO, normalize_fn | None) from ``models/`` – newest checkpoint by default."""
+    from stable_baselines3 import PPO
+    from rl_agent.numpy_policy import ObsNormalizer
+
+    model_path = model_path or max(MODELS_DIR.glob("*.zip"), key=lambda p: p.stat().st_mtime)
+    model = PPO.load(model_path, device="cpu")
+    vecnorm_path = vecnorm_path or MODELS_DIR / "final_vecnorm.pkl"
+    if not Path(vecnorm_path).exists():
+        return model, None
+    return model, ObsNormalizer.load(vecnorm_path)
+
+
+def loopback(clients: int, steps: int, max_batch: int, max_wait_ms: float,
+             numpy_policy: bool = False) -> dict[str, Any]:
+    """*clients* threads each step their own FootballEnv via the service."""
+    from rl_agent.environment import FootballEnv
+
+    if numpy_policy:                              # exported actor, normalisation fused
+        from rl_agent.numpy_policy import DEFAULT_OUT, NumpyPolicy
+        model, normalize = NumpyPolicy.load(DEFAULT_OUT), None
+    else:
+        model, normalize = load_policy()
+    svc = InferenceService(model, normalize, max_batch=max_batch, max_wait_ms=max_wait_ms)
+    envs = [FootballEnv(phase=2) for _ in range(clients)]
+    start = threading.Barrier(clients + 1)
+
+    def client(k: int) -> None:
+        env = envs[k]
+        obs, _ = env.reset(seed=k)
+        start.wait()
+        for _ in range(steps):
+            obs, _, term, trunc, _ = env.step(int(svc.predict(obs)))
+            if term or trunc:
+                obs, _ = env.reset()
+
+    threads = [threading.Thread(target=client, args=(k,)) for k in range(clients)]
+    with svc:
+        for t in threads:
+            t.start()
+        start.wait()
+        t0 = time.perf_counter()
+        for t in threads:
+            t.join()
+        batched_s = time.perf_counter() - t0
+
+    # same number of decisions, one predict() per observation (old main.py path)
+    obs = np.stack([e.reset(seed=k)[0] for k, e in enumerate(envs)])
+    n_single = min(clients * steps, 2_000)
+    t0 = time.perf_counter()
+    for i in range(n_single):
+        o = obs[i % clients][None]
+        model.predict(normalize(o) if normalize else o, deterministic=True)
+    single_s = (time.perf_counter() - t0) * clients * steps / n_single
+
+    svc.report()
+    decisions = clients * steps
+    print(f"\n{clients} clients × {steps} steps: "
+          f"batched {decisions / batched_s:,.0f} decisions/s  |  "
+          f"batch-of-one {decisions / single_s:,.0f} decisions/s (est.)")
+    return dict(svc.stats(), batched_per_s=decisions / batched_s,
+                single_per_s=decisions / single_s)
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    p = argparse.ArgumentParser(description="Loopback load test for InferenceService")
+    p.add_argument("--clients", type=int, default=300, help="concurrent matches")
+    p.add_argument("--steps", type=int, default=50, help="decisions per client")
+    p.add_argument("--max-batch", type=int, default=256)
+    p.add_argument("--max-wait-ms", type=float, default=2.0)
+    p.add_argument("--numpy", action="store_true",
+                   help="serve models/policy.npz (NumpyPolicy) instead of PPO")
+    return p.parse_args(argv)
+
+
+if __name__ == "__main__":
+    a = parse_args()
+    loopback(a.clients, a.steps, a.max_batch, a.max_wait_ms, a.numpy)
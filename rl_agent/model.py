@@ -5,7 +5,7 @@ Build a PPO agent for the football environment.
 Key points
 ~~~~~~~~~~
 * single 2×256 MLP with Tanh activations
-* linear learning-rate decay 1 e-4 → 0
+* linear learning-rate decay 1 e-4 → 0 (start value / seed overridable)
 * no VecNormalize wrapper here — the caller decides when to wrap
 """
 
@@ -39,6 +39,9 @@ def create_model(
     env: VecEnv,
     *,
     tensorboard_log: str | None = "./logs",
+    learning_rate: float = 1e-4,
+    seed: int | None = None,
+    verbose: int = 1,
 ) -> PPO:
     """Return a configured PPO instance attached to *env*."""
     policy_kwargs = dict(
@@ -54,12 +57,13 @@ def create_model(
         n_epochs=10,
         gamma=0.99,
         gae_lambda=0.95,
-        learning_rate=linear_schedule(1e-4),
+        learning_rate=linear_schedule(learning_rate),
         ent_coef=0.01,
         clip_range=0.2,
         vf_coef=0.5,
         policy_kwargs=policy_kwargs,
-        verbose=1,
+        verbose=verbose,
         tensorboard_log=tensorboard_log,
+        seed=seed,
     )
     return model
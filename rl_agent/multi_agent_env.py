@@ -0,0 +1,261 @@
+"""
+Multi-agent self-play env – both teams, 1v1 up to NvN
+=====================================================
+
+``SelfPlayEnv`` steps every player of both ``Team`` objects in one call
+and returns batched per-agent arrays.  Every agent sees the pitch from
+its own side: red observations and actions are mirrored left↔right, so
+each player "attacks the left goal" exactly like the blue player in
+``FootballEnv`` and one policy can drive all of them.
+
+Per-agent observation (mirrored, y relative to TOP_MARGIN)::
+
+    [p_x, p_y, b_x, b_y, v_x/10, v_y/10,        ← same 6 as FootballEnv
+     teammates (x, y) …, opponents (x, y) …]     ← 2·(2N−1) extra
+
+Rewards reuse the ``FootballEnv`` shaping per agent; a goal gives
++GOAL_REW to the scoring team and −GOAL_REW to the conceding team.
+
+``SelfPlayVecEnv`` exposes M matches × 2N agents as one SB3 ``VecEnv``
+(one slot per agent), so PPO trains a single shared policy and every
+``predict`` call is one batch over all players of all matches.
+"""
+
+from __future__ import annotations
+
+import math
+import random
+from typing import Any
+
+import numpy as np
+from gymnasium import spaces
+from stable_baselines3.common.vec_env.base_vec_env import (
+    VecEnv, VecEnvIndices, VecEnvStepReturn,
+)
+
+from core.ball    import Ball
+from core.player  import Player
+from core.stadium import Stadium
+from core.team    import Team
+from utils.spatial import SpatialHash
+from rl_agent.environment import (
+    W, TOP_MARGIN, FIELD_H, FOOT_R, MAX_V, MAX_STEPS,
+    DIST_PEN, SHRINK_BON, KICK_LEFT_W, KICK_RIGHT, HOLD_PEN, GOAL_REW,
+)
+
+
+_MOVES   = ("noop", "up", "down", "left", "right")
+_MIRROR_ACTION = (0, 1, 2, 4, 3, 5)          # swap left / right for red
+START_X  = 700                               # blue start x (red is mirrored)
+
+
+class SelfPlayEnv:
+    """N-vs-N match, parallel API: ``step(actions[2N]) → per-agent arrays``."""
+
+    def __init__(self, n_per_side: int = 1, max_steps: int = MAX_STEPS,
+                 seed: int | None = None):
+        self.n          = int(n_per_side)
+        self.max_steps  = max_steps
+        self.rng        = random.Random(seed)
+        self.render_mode = None
+
+        self.ball    = Ball(W // 2, TOP_MARGIN + FIELD_H // 2)
+        self.stadium = Stadium(W, FIELD_H)
+        self.blue    = Team("blue", [Player(0, 0, "blue", True, f"B{i}")
+                                     for i in range(self.n)])
+        self.red     = Team("red",  [Player(0, 0, "red",  True, f"R{i}")
+                                     for i in range(self.n)])
+        # agent order: blue players, then red players
+        self.players = self.blue.players + self.red.players
+        self.agents  = [p.player_id for p in self.players]
+        self.num_agents = len(self.players)
+
+        # kick-range lookups go through a grid instead of all 2N players
+        self.index = SpatialHash()
+        for e in (self.ball, *self.players):
+            self.index.insert(e)
+
+        obs_dim = 6 + 2 * (self.num_agents - 1)
+        low  = np.array([0, 0, 0, 0, -1, -1] + [0, 0] * (self.num_agents - 1), np.float32)
+        high = np.array([W, FIELD_H, W, FIELD_H, 1, 1]
+                        + [W, FIELD_H] * (self.num_agents - 1), np.float32)
+        self.observation_space = spaces.Box(low, high, (obs_dim,), np.float32)
+        self.action_space      = spaces.Discrete(6)
+
+        self._mirror = np.array([p.team == "red" for p in self.players])
+        self._obs    = np.zeros((self.num_agents, obs_dim), np.float32)
+        self.prev_dist = np.zeros(self.num_agents)
+        self.t = 0
+
+    # ------------------------------------------------------------------
+    def reset(self, seed: int | None = None) -> np.ndarray:
+        if seed is not None:
+            self.rng.seed(seed)
+        self.t = 0
+        mid = TOP_MARGIN + FIELD_H // 2
+        self.stadium.reset_ball_position(self.ball)
+        self.ball.x = W // 2 + self.rng.randint(-20, 20)
+        self.ball.y = mid + self.rng.randint(-60, 60)
+
+        # formation: spread each side vertically around the centre line
+        gap = FIELD_H // (self.n + 1)
+        ys  = [TOP_MARGIN + gap * (i + 1) - 20 for i in range(self.n)]
+        w   = self.players[0].width
+        self.blue.reset_positions([(START_X, y) for y in ys])
+        self.red.reset_positions([(W - w - START_X, y) for y in ys])
+        for p in self.players:
+            p.has_ball = False
+        self.index.update_all()
+
+        self.prev_dist[:] = [self._foot_dist(p) for p in self.players]
+        return self._write_obs().copy()
+
+    def step(self, actions) -> tuple[np.ndarray, np.ndarray, bool, bool, dict]:
+        """One frame for every agent; *actions* in agent order, own frame."""
+        self.t += 1
+        acts = [(_MIRROR_ACTION[a] if m else a)
+                for a, m in zip(np.asarray(actions, int).tolist(), self._mirror)]
+        rew = np.zeros(self.num_agents)
+
+        # movement (everyone), then kicks in random order ----------------
+        for p, a in zip(self.players, acts):
+            if 1 <= a <= 4:
+                p.move(_MOVES[a])
+        kicked = np.zeros(self.num_agents, bool)
+        kick_left = np.zeros(self.num_agents, bool)
+        in_range = {id(p) for p in self.index.query(
+            self.ball.x, self.ball.y, FOOT_R, exclude=self.ball)}
+        order = [i for i, a in enumerate(acts)
+                 if a == 5 and id(self.players[i]) in in_range]
+        self.rng.shuffle(order)
+        for i in order:
+            p = self.players[i]
+            if self._foot_dist(p) < FOOT_R:         # earlier kicks move the ball
+                p.kick_ball(self.ball)
+                kicked[i] = True
+                # "left" = towards the agent's attacking goal
+                kick_left[i] = (self.ball.vel_x > 0) if self._mirror[i] else (self.ball.vel_x < 0)
+
+        # physics ----------------------------------------------------------
+        self.ball.move()
+        vx, vy = abs(self.ball.vel_x), abs(self.ball.vel_y)
+        cos = vx / (vx + vy + 1e-6)
+        for i, p in enumerate(self.players):
+            dist = self._foot_dist(p)
+            p.has_ball = dist < FOOT_R
+            rew[i] += DIST_PEN * dist
+            if not p.has_ball:
+                rew[i] += SHRINK_BON * (self.prev_dist[i] - dist)
+            self.prev_dist[i] = dist
+            if kicked[i]:
+                rew[i] += KICK_LEFT_W * cos if kick_left[i] else KICK_RIGHT
+            elif p.has_ball:
+                rew[i] += HOLD_PEN
+
+        # goals ------------------------------------------------------------
+        scorer = None
+        if self.ball.x <= 5:
+            scorer = self.stadium.check_goal(self.ball, event="left")    # blue
+        elif self.ball.x >= W - 5:
+            scorer = self.stadium.check_goal(self.ball, event="right")   # red
+        if scorer is not None:
+            rew += np.where(self._mirror == (scorer == "red"), GOAL_REW, -GOAL_REW)
+
+        terminated = scorer is not None
+        truncated  = self.t >= self.max_steps
+        info = {"scorer": scorer,
+                "score": (self.stadium.score_red, self.stadium.score_blue)}
+        return self._write_obs().copy(), rew.astype(np.float32), terminated, truncated, info
+
+    # ------------------------------------------------------------------
+    # helpers
+    def _foot_dist(self, p: Player) -> float:
+        return math.hypot(self.ball.x - (p.x + p.width / 2),
+                          self.ball.y - (p.y + p.height))
+
+    def _write_obs(self) -> np.ndarray:
+        """Fill the (agents, obs_dim) buffer, mirrored for red."""
+        pw = self.players[0].width
+        px = np.array([p.x for p in self.players])
+        py = np.array([p.y for p in self.players]) - TOP_MARGIN
+        b  = self.ball
+        for i in range(self.num_agents):
+            m = self._mirror[i]
+            o = self._obs[i]
+            xs = (W - pw - px) if m else px
+            o[0], o[1] = xs[i], py[i]
+            o[2] = (W - b.x) if m else b.x
+            o[3] = b.y - TOP_MARGIN
+            o[4] = np.clip((-b.vel_x if m else b.vel_x) / MAX_V, -1, 1)
+            o[5] = np.clip(b.vel_y / MAX_V, -1, 1)
+            # teammates first, then opponents (team order is fixed per side)
+            own = [j for j in range(self.num_agents)
+                   if j != i and self._mirror[j] == m]
+            opp = [j for j in range(self.num_agents) if self._mirror[j] != m]
+            others = own + opp
+            o[6::2] = xs[others]
+            o[7::2] = py[others]
+        return self._obs
+
+
+class SelfPlayVecEnv(VecEnv):
+    """M self-play matches as one VecEnv with one slot per agent."""
+
+    def __init__(self, n_matches: int, n_per_side: int = 1,
+                 seed: int | None = None):
+        self.matches = [SelfPlayEnv(n_per_side,
+                                    seed=None if seed is None else seed + k)
+                        for k in range(n_matches)]
+        self.per_match = self.matches[0].num_agents
+        self.render_mode = None
+        m0 = self.matches[0]
+        super().__init__(n_matches * self.per_match,
+                         m0.observation_space, m0.action_space)
+
+    def reset(self) -> np.ndarray:
+        for k, m in enumerate(self.matches):
+            s = self._seeds[0]
+            m.reset(None if s is None else s + k)
+        self._reset_seeds()
+        self._reset_options()
+        return np.concatenate([m._obs for m in self.matches]).copy()
+
+    def step_async(self, actions: np.ndarray) -> None:
+        self._actions = np.asarray(actions).reshape(len(self.matches), self.per_match)
+
+    def step_wait(self) -> VecEnvStepReturn:
+        obs, rews, dones, infos = [], [], [], []
+        for m, a in zip(self.matches, self._actions):
+            o, r, te, tr, info = m.step(a)
+            done = te or tr
+            agent_infos = [dict(info) for _ in range(self.per_match)]
+            if done:
+                for i, ai in enumerate(agent_infos):
+                    ai["terminal_observation"] = o[i].copy()
+                    ai["TimeLimit.truncated"] = tr and not te
+                o = m.reset()
+            obs.append(o)
+            rews.append(r)
+            dones.append(np.full(self.per_match, done))
+            infos.extend(agent_infos)
+        return np.concatenate(obs), np.concatenate(rews), np.concatenate(dones), infos
+
+    def close(self) -> None:
+        pass
+
+    def get_attr(self, attr_name: str, indices: VecEnvIndices = None) -> list[Any]:
+        return [getattr(self.matches[i // self.per_match], attr_name)
+                for i in self._get_indices(indices)]
+
+    def set_attr(self, attr_name: str, value: Any, indices: VecEnvIndices = None) -> None:
+        for i in self._get_indices(indices):
+            setattr(self.matches[i // self.per_match], attr_name, value)
+
+    def env_method(self, method_name: str, *method_args,
+                   indices: VecEnvIndices = None, **method_kwargs) -> list[Any]:
+        return [getattr(self.matches[i // self.per_match], method_name)(
+                    *method_args, **method_kwargs)
+                for i in self._get_indices(indices)]
+
+    def env_is_wrapped(self, wrapper_class, indices: VecEnvIndices = None) -> list[bool]:
+        return [False for _ in self._get_indices(indices)]
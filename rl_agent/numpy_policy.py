@@ -0,0 +1,448 @@
+"""
+Torch-free NumPy runtime for the exported PPO actor
+===================================================
+
+The policy from ``create_model`` is a Tanh MLP (2×256) followed by a
+6-way action head.  ``export`` writes those weights together with the
+``VecNormalize`` observation statistics into one ``.npz`` file;
+``NumpyPolicy`` reloads it and runs normalisation + forward pass with
+NumPy only, so the game never has to import torch / stable-baselines3.
+
+Normalisation is fused into the first layer at load time.  VecNormalize
+computes ``clip((x − μ)/σ, −c, c)``; clipping the *raw* obs to
+``[μ − cσ, μ + cσ]`` instead is equivalent, and the remaining affine map
+folds into layer 0 (``W₀/σ``, ``b₀ − (μ/σ)·W₀``).  Inference is therefore
+one ``clip`` plus the MLP.  ``ObsNormalizer`` is the same precomputed
+stage for the SB3 path, read straight from ``final_vecnorm.pkl`` without
+building a ``DummyVecEnv``.
+
+``policy.quantize("int8" | "float16")`` shrinks the hidden and head layers
+(≈ 95 % of the weights) for hosts running many opponents: int8 uses
+per-output-channel symmetric scales with float32 accumulation, float16
+is upcast per call.  Layer 0 stays float32 – after folding 1/σ its rows
+differ in scale by orders of magnitude, and it is only obs_dim×256.
+
+    python -m rl_agent.numpy_policy export --precision int8   # policy_int8.npz
+    python -m rl_agent.numpy_policy quant                     # agreement / size / latency
+
+    python -m rl_agent.numpy_policy export            # models/policy.npz
+    python -m rl_agent.numpy_policy check             # parity vs PPO.predict
+    python -m rl_agent.numpy_policy bench             # startup + latency
+
+    pi = NumpyPolicy.load("models/policy.npz")
+    action, _ = pi.predict(obs)                        # (6,) or (B, 6) obs
+"""
+
+from __future__ import annotations
+
+import argparse
+import copy
+import pickle
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+MODELS_DIR   = PROJECT_ROOT / "models"
+DEFAULT_OUT  = MODELS_DIR / "policy.npz"
+FORMAT       = 1
+PRECISIONS   = ("float32", "float16", "int8")
+
+
+# ------------------------------------------------------------------ #
+#                             EXPORT                                 #
+# ------------------------------------------------------------------ #
+def _latest_checkpoint() -> Path:
+    return max(MODELS_DIR.glob("*.zip"), key=lambda p: p.stat().st_mtime)
+
+
+def export(model_path: Path | None = None,
+           vecnorm_path: Path | None = None,
+           out_path: Path = DEFAULT_OUT) -> Path:
+    """Write actor weights + obs normalisation of a PPO checkpoint to *out_path*."""
+    import torch.nn as nn                         # export side only
+    from stable_baselines3 import PPO
+
+    model = PPO.load(model_path or _latest_checkpoint(), device="cpu")
+    policy = model.policy
+    layers = [m for m in policy.mlp_extractor.policy_net if isinstance(m, nn.Linear)]
+    acts   = {type(m).__name__.lower() for m in policy.mlp_extractor.policy_net
+              if not isinstance(m, nn.Linear)}
+    if acts != {"tanh"}:
+        raise ValueError(f"only Tanh MLP actors are supported, got {sorted(acts)}")
+    layers.append(policy.action_net)
+
+    arrays: dict[str, np.ndarray] = {}
+    for i, lin in enumerate(layers):
+        arrays[f"W{i}"] = lin.weight.detach().numpy().T.astype(np.float32)   # (in, out)
+        arrays[f"b{i}"] = lin.bias.detach().numpy().astype(np.float32)
+
+    vecnorm_path = Path(vecnorm_path or MODELS_DIR / "final_vecnorm.pkl")
+    stats = load_obs_stats(vecnorm_path) if vecnorm_path.exists() else None
+    if stats is not None:                         # folded into layer 0 on load
+        arrays["obs_mean"], arrays["obs_std"], clip = stats
+        arrays["clip_obs"] = np.float32(clip)
+
+    out_path = Path(out_path)
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    np.savez(out_path, format=np.int64(FORMAT), n_layers=np.int64(len(layers)), **arrays)
+    return out_path
+
+
+# ------------------------------------------------------------------ #
+#                       FUSED NORMALISATION                          #
+# ------------------------------------------------------------------ #
+def load_obs_stats(vecnorm_path: Path | str) -> tuple[np.ndarray, np.ndarray, float] | None:
+    """(μ, σ, clip) from a saved VecNormalize – no env is constructed."""
+    with open(vecnorm_path, "rb") as f:
+        vn = pickle.load(f)
+    if not vn.norm_obs:
+        return None
+    std = np.sqrt(vn.obs_rms.var + vn.epsilon)
+    return vn.obs_rms.mean.astype(np.float32), std.astype(np.float32), float(vn.clip_obs)
+
+
+def fold_normalization(W0: np.ndarray, b0: np.ndarray, mean: np.ndarray,
+                       std: np.ndarray, clip: float):
+    """Fold ``clip((x−μ)/σ)`` into layer 0 → (W₀', b₀', raw lo, raw hi)."""
+    W = (W0 / std[:, None]).astype(np.float32)
+    b = (b0 - (mean / std) @ W0).astype(np.float32)
+    return W, b, (mean - clip * std).astype(np.float32), (mean + clip * std).astype(np.float32)
+
+
+class ObsNormalizer:
+    """Precomputed VecNormalize obs transform for the torch/SB3 path."""
+
+    def __init__(self, mean: np.ndarray, std: np.ndarray, clip: float):
+        self.mean    = mean
+        self.inv_std = (1.0 / std).astype(np.float32)
+        self.lo      = mean - clip * std
+        self.hi      = mean + clip * std
+
+    @classmethod
+    def load(cls, vecnorm_path: Path | str) -> "ObsNormalizer | None":
+        stats = load_obs_stats(vecnorm_path)
+        return None if stats is None else cls(*stats)
+
+    def __call__(self, obs: np.ndarray) -> np.ndarray:
+        out = np.clip(obs, self.lo, self.hi).astype(np.float32)
+        out -= self.mean
+        out *= self.inv_std
+        return out
+
+
+# ------------------------------------------------------------------ #
+#                             RUNTIME                                #
+# ------------------------------------------------------------------ #
+class NumpyPolicy:
+    """Clip → Tanh MLP (normalisation folded in) → argmax or sample."""
+
+    def __init__(self, weights: list[tuple[np.ndarray, np.ndarray]],
+                 obs_mean: np.ndarray | None = None,
+                 obs_std: np.ndarray | None = None,
+                 clip_obs: float = 10.0, seed: int | None = None):
+        # C order: exported W are transposed views, and the int8/float16
+        # mixed-type matmul is several times slower on strided operands
+        weights = [(np.ascontiguousarray(W), b) for W, b in weights]
+        self.obs_lo = self.obs_hi = None
+        if obs_mean is not None:
+            W0, b0, self.obs_lo, self.obs_hi = fold_normalization(
+                *weights[0], obs_mean, obs_std, clip_obs)
+            weights[0] = (W0, b0)
+        self.weights  = weights
+        self.scales: list[np.ndarray | None] = [None] * len(weights)   # int8 only
+        self.precision = "float32"
+        self.obs_dim  = weights[0][0].shape[0]
+        self.n_actions = weights[-1][0].shape[1]
+        self.rng = np.random.default_rng(seed)
+
+    @classmethod
+    def load(cls, path: Path | str = DEFAULT_OUT) -> "NumpyPolicy":
+        with np.load(path) as z:
+            if int(z["format"]) != FORMAT:
+                raise ValueError(f"{path}: unsupported policy format {int(z['format'])}")
+            n = int(z["n_layers"])
+            weights = [(z[f"W{i}"], z[f"b{i}"]) for i in range(n)]
+            if "obs_lo" in z:                     # saved by save(): layer 0 already folded
+                pol = cls(weights)
+                pol.obs_lo, pol.obs_hi = z["obs_lo"], z["obs_hi"]
+            elif "obs_mean" in z:
+                pol = cls(weights, z["obs_mean"], z["obs_std"], float(z["clip_obs"]))
+            else:
+                pol = cls(weights)
+            pol.scales = [z[f"s{i}"] if f"s{i}" in z else None for i in range(n)]
+            pol.precision = str(z["precision"]) if "precision" in z else "float32"
+        return pol
+
+    def save(self, path: Path | str) -> Path:
+        """Write this (possibly quantized) policy with layer 0 already folded."""
+        arrays: dict[str, np.ndarray] = {}
+        for i, ((W, b), s) in enumerate(zip(self.weights, self.scales)):
+            arrays[f"W{i}"], arrays[f"b{i}"] = W, b
+            if s is not None:
+                arrays[f"s{i}"] = s
+        if self.obs_lo is not None:
+            arrays["obs_lo"], arrays["obs_hi"] = self.obs_lo, self.obs_hi
+        path = Path(path)
+        np.savez(path, format=np.int64(FORMAT), n_layers=np.int64(len(self.weights)),
+                 precision=np.array(self.precision), **arrays)
+        return path
+
+    def quantize(self, precision: str) -> "NumpyPolicy":
+        """Copy with layers 1… stored as int8 (per-column scale) or float16."""
+        if precision not in PRECISIONS:
+            raise ValueError(f"unknown precision {precision!r}; choose from {PRECISIONS}")
+        if self.precision != "float32":
+            raise ValueError(f"policy is already {self.precision}")
+        q = copy.copy(self)
+        q.weights, q.scales, q.precision = list(self.weights), list(self.scales), precision
+        for i in range(1, len(self.weights)):     # layer 0 stays float32 (module doc)
+            W, b = self.weights[i]
+            if precision == "float16":
+                q.weights[i] = (W.astype(np.float16), b)
+            elif precision == "int8":
+                s = np.abs(W).max(axis=0) / 127.0
+                s[s == 0] = 1.0
+                q.weights[i] = (np.ascontiguousarray(np.round(W / s), np.int8), b)
+                q.scales[i] = s.astype(np.float32)
+        return q
+
+    @property
+    def nbytes(self) -> int:
+        """Resident bytes of weights, biases, scales and obs bounds."""
+        arrays = [a for wb in self.weights for a in wb] + [s for s in self.scales if s is not None]
+        if self.obs_lo is not None:
+            arrays += [self.obs_lo, self.obs_hi]
+        return sum(a.nbytes for a in arrays)
+
+    def logits(self, obs: np.ndarray) -> np.ndarray:
+        """Action logits for a (B, obs_dim) float32 batch of *raw* observations."""
+        h = obs if self.obs_lo is None else np.clip(obs, self.obs_lo, self.obs_hi)
+        last = len(self.weights) - 1
+        for i, ((W, b), s) in enumerate(zip(self.weights, self.scales)):
+            h = h @ W                             # int8 / float16 W → float32 result
+            if s is not None:
+                h *= s
+            h += b
+            if i < last:
+                np.tanh(h, out=h)
+        return h
+
+    def predict(self, obs, deterministic: bool = True):
+        """SB3-compatible ``(actions, None)``; a single obs gives a scalar action."""
+        obs = np.asarray(obs, np.float32)
+        single = obs.ndim == 1
+        logits = self.logits(obs.reshape(-1, self.obs_dim))
+        if deterministic:
+            actions = logits.argmax(axis=1)
+        else:
+            z = np.exp(logits - logits.max(axis=1, keepdims=True))
+            cdf = np.cumsum(z / z.sum(axis=1, keepdims=True), axis=1)
+            actions = (self.rng.random((len(cdf), 1)) > cdf).sum(axis=1)
+            actions = np.minimum(actions, self.n_actions - 1)
+        return (actions[0] if single else actions), None
+
+
+# ------------------------------------------------------------------ #
+#                        PARITY / BENCHMARKS                         #
+# ------------------------------------------------------------------ #
+def _reference(model_path: Path | None, vecnorm_path: Path | None):
+    """(PPO, normalize_fn | None) – the torch path main.py used to take."""
+    from stable_baselines3 import PPO
+    model = PPO.load(model_path or _latest_checkpoint(), device="cpu")
+    vecnorm_path = Path(vecnorm_path or MODELS_DIR / "final_vecnorm.pkl")
+    if not vecnorm_path.exists():
+        return model, None
+    with open(vecnorm_path, "rb") as f:
+        vn = pickle.load(f)                       # the unfused reference transform
+    return model, (vn.normalize_obs if vn.norm_obs else None)
+
+
+def _rollout_obs(n: int, seed: int = 0, policy: "NumpyPolicy | None" = None,
+                 eps: float = 0.1) -> np.ndarray:
+    """Observations from FootballEnv episodes (all phases): random actions,
+    or ε-greedy *policy* actions for the states the agent actually visits."""
+    from rl_agent.environment import FootballEnv
+    rng = np.random.default_rng(seed)
+    envs = [FootballEnv(phase=p) for p in range(3)]
+    out = []
+    obs_k = [None] * 3
+    for k in range(n):
+        env = envs[k % 3]
+        if k < 3:
+            obs_k[k], _ = env.reset(seed=seed + k)
+        if policy is None or rng.random() < eps:
+            a = int(rng.integers(6))
+        else:
+            a = int(policy.predict(obs_k[k % 3])[0])
+        obs, _, te, tr, _ = env.step(a)
+        if te or tr:
+            obs, _ = env.reset()
+        obs_k[k % 3] = obs
+        out.append(obs)
+    return np.stack(out).astype(np.float32)
+
+
+def check_parity(path: Path = DEFAULT_OUT, n: int = 5_000,
+                 model_path: Path | None = None,
+                 vecnorm_path: Path | None = None) -> dict[str, float]:
+    """Compare actions and logits against ``PPO.predict`` on rollout observations."""
+    import torch
+    model, normalize = _reference(model_path, vecnorm_path)
+    pi = NumpyPolicy.load(path)
+    obs = _rollout_obs(n)
+    ref_in = normalize(obs) if normalize else obs
+    ref_act, _ = model.predict(ref_in, deterministic=True)
+    with torch.no_grad():
+        dist = model.policy.get_distribution(torch.as_tensor(ref_in))
+        ref_logits = dist.distribution.logits.numpy()
+    np_act, _ = pi.predict(obs)
+    np_logits = pi.logits(obs)
+    # logits are compared after log-softmax (SB3 stores normalised logits)
+    m = np_logits.max(axis=1, keepdims=True)
+    np_logp = np_logits - m - np.log(np.exp(np_logits - m).sum(axis=1, keepdims=True))
+    res = dict(n=n, agreement=float((ref_act == np_act).mean()),
+               max_abs_logit_err=float(np.abs(ref_logits - np_logp).max()))
+    print(f"parity on {n:,} obs: action agreement {res['agreement']:.4%}, "
+          f"max |Δ log-prob| {res['max_abs_logit_err']:.2e}")
+    fused = ObsNormalizer.load(vecnorm_path or MODELS_DIR / "final_vecnorm.pkl") if normalize else None
+    if fused is not None:
+        res["max_abs_norm_err"] = float(np.abs(fused(obs) - ref_in).max())
+        print(f"ObsNormalizer vs VecNormalize.normalize_obs: max |Δ| {res['max_abs_norm_err']:.2e}")
+    return res
+
+
+_STARTUP_NUMPY = """
+import time; t=time.perf_counter()
+import numpy as np
+from rl_agent.numpy_policy import NumpyPolicy
+pi=NumpyPolicy.load({path!r}); pi.predict(np.zeros(pi.obs_dim, np.float32))
+print(time.perf_counter()-t)
+"""
+_STARTUP_TORCH = """
+import time; t=time.perf_counter()
+import numpy as np
+from stable_baselines3 import PPO
+from rl_agent.numpy_policy import ObsNormalizer
+m=PPO.load({model!r}, device="cpu"); norm=ObsNormalizer.load({vecnorm!r})
+m.predict(norm(np.zeros((1,)+m.observation_space.shape, np.float32)), deterministic=True)
+print(time.perf_counter()-t)
+"""
+_STARTUP_TORCH_ENV = """
+import time; t=time.perf_counter()
+import numpy as np
+from stable_baselines3 import PPO
+from stable_baselines3.common.vec_env import DummyVecEnv, VecNormalize
+from rl_agent.environment import FootballEnv
+m=PPO.load({model!r}, device="cpu")
+venv=VecNormalize.load({vecnorm!r}, DummyVecEnv([lambda: FootballEnv(phase=2)]))
+m.predict(venv.normalize_obs(np.zeros((1,)+m.observation_space.shape, np.float32)), deterministic=True)
+print(time.perf_counter()-t)
+"""
+
+
+def _startup(code: str) -> float:
+    out = subprocess.run([sys.executable, "-W", "ignore", "-c", code], cwd=PROJECT_ROOT,
+                         capture_output=True, text=True, check=True)
+    return float(out.stdout.strip().splitlines()[-1])
+
+
+def bench(path: Path = DEFAULT_OUT, reps: int = 2_000) -> dict[str, float]:
+    """Cold-start time (fresh interpreter) and per-call latency, NumPy vs torch."""
+    paths = dict(path=str(path), model=str(_latest_checkpoint()),
+                 vecnorm=str(MODELS_DIR / "final_vecnorm.pkl"))
+    res = dict(startup_numpy_s=_startup(_STARTUP_NUMPY.format(**paths)),
+               startup_torch_s=_startup(_STARTUP_TORCH.format(**paths)),
+               startup_torch_env_s=_startup(_STARTUP_TORCH_ENV.format(**paths)))
+
+    model, normalize = _reference(None, None)
+    pi = NumpyPolicy.load(path)
+    obs = _rollout_obs(256)
+    for batch in (1, 32, 256):
+        x = obs[:batch]
+        n = max(20, reps // batch)
+        t0 = time.perf_counter()
+        for _ in range(n):
+            pi.predict(x)
+        res[f"numpy_b{batch}_us"] = (time.perf_counter() - t0) / n * 1e6
+        t0 = time.perf_counter()
+        for _ in range(n):
+            model.predict(normalize(x) if normalize else x, deterministic=True)
+        res[f"torch_b{batch}_us"] = (time.perf_counter() - t0) / n * 1e6
+
+    print(f"\n{'':<16}{'numpy':>12}{'torch/SB3':>12}")
+    print(f"{'startup (s)':<16}{res['startup_numpy_s']:>12.3f}{res['startup_torch_s']:>12.3f}"
+          f"   (torch + DummyVecEnv/VecNormalize.load: {res['startup_torch_env_s']:.3f})")
+    for batch in (1, 32, 256):
+        print(f"{f'batch {batch} (µs)':<16}{res[f'numpy_b{batch}_us']:>12,.1f}"
+              f"{res[f'torch_b{batch}_us']:>12,.1f}")
+    return res
+
+
+def quant_report(path: Path = DEFAULT_OUT, n: int = 20_000,
+                 reps: int = 2_000) -> list[dict[str, float]]:
+    """Action agreement vs float32, size and latency for every precision."""
+    base = NumpyPolicy.load(path)
+    states = dict(random=_rollout_obs(n // 2, seed=1),
+                  on_policy=_rollout_obs(n // 2, seed=2, policy=base))
+    ref = {k: base.predict(v)[0] for k, v in states.items()}
+    rows = []
+    for precision in PRECISIONS:
+        pol = base if precision == "float32" else base.quantize(precision)
+        tmp = MODELS_DIR / f".quant_{precision}.npz"
+        size = pol.save(tmp).stat().st_size
+        tmp.unlink()
+        row = dict(precision=precision, nbytes=pol.nbytes, file_bytes=size)
+        for k, obs in states.items():
+            row[f"agree_{k}"] = float((pol.predict(obs)[0] == ref[k]).mean())
+        for batch in (1, 256):
+            x = states["on_policy"][:batch]
+            m = max(20, reps // batch)
+            t0 = time.perf_counter()
+            for _ in range(m):
+                pol.predict(x)
+            row[f"b{batch}_us"] = (time.perf_counter() - t0) / m * 1e6
+        rows.append(row)
+
+    print(f"\n{'precision':<10}{'agree rand':>11}{'agree π':>9}{'RAM KiB':>9}"
+          f"{'file KiB':>10}{'b1 µs':>8}{'b256 µs':>9}   ({n:,} states)")
+    for r in rows:
+        print(f"{r['precision']:<10}{r['agree_random']:>11.3%}{r['agree_on_policy']:>9.3%}"
+              f"{r['nbytes'] / 1024:>9.0f}{r['file_bytes'] / 1024:>10.0f}"
+              f"{r['b1_us']:>8.1f}{r['b256_us']:>9.1f}")
+    return rows
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    p = argparse.ArgumentParser(description="Export / check / benchmark the NumPy policy")
+    p.add_argument("cmd", choices=("export", "check", "bench", "quant"))
+    p.add_argument("--model", type=Path, default=None, help="PPO .zip (default: newest in models/)")
+    p.add_argument("--vecnorm", type=Path, default=None, help="VecNormalize .pkl")
+    p.add_argument("--out", type=Path, default=DEFAULT_OUT, help="exported .npz")
+    p.add_argument("--precision", choices=PRECISIONS, default="float32",
+                   help="export: also write a quantized copy (models/policy_<precision>.npz)")
+    return p.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> None:
+    args = parse_args(argv)
+    if args.cmd == "export":
+        out = export(args.model, args.vecnorm, args.out)
+        print(f"✅ exported {out} ({out.stat().st_size / 1024:.0f} KiB)")
+        if args.precision != "float32":
+            q = NumpyPolicy.load(out).quantize(args.precision)
+            qout = q.save(out.with_name(f"{out.stem}_{args.precision}.npz"))
+            print(f"✅ quantized {qout} ({qout.stat().st_size / 1024:.0f} KiB)")
+    elif args.cmd == "check":
+        check_parity(args.out, model_path=args.model, vecnorm_path=args.vecnorm)
+    elif args.cmd == "quant":
+        quant_report(args.out)
+    else:
+        bench(args.out)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Trajectory recording for training rollouts
+==========================================
+
+``RecordingVecEnv`` wraps any football ``VecEnv`` (FootballVecEnv,
+ShmVecEnv, DummyVecEnv of FootballEnv) *below* ``VecNormalize`` and streams
+``(state, action, reward, done)`` rows into a ``utils.recorder``
+recording — the state is the raw observation the action was chosen on,
+converted back to game pixels.  Only array copies happen on the training
+thread; files are written by the recorder's background thread.
+
+    venv = VecNormalize(RecordingVecEnv(FootballVecEnv(64), "recordings/run1"))
+
+``every`` keeps one step in *every* (all envs of that step), which bounds
+the file size for long runs: 2.85 M steps × 49 B ≈ 140 MB at ``every=1``.
+
+The state is read from the observation's last tick, which is the real
+state for ``obs_pool`` "last" and "stack".  A "max"-pooled observation
+(``frame_skip`` > 1) is an element-wise maximum over ticks, not a state,
+so such envs are rejected with a ``ValueError``.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import numpy as np
+from stable_baselines3.common.vec_env import VecEnv, VecEnvWrapper
+
+from rl_agent.environment import MAX_V, TOP_MARGIN
+from utils.recorder import TrajectoryRecorder
+
+
+class RecordingVecEnv(VecEnvWrapper):
+    """Pass-through VecEnv that records every (or every *every*-th) step."""
+
+    def __init__(self, venv: VecEnv, path: Path | str, every: int = 1, **meta):
+        pool, skip = (venv.get_attr(a, [0])[0] for a in ("obs_pool", "frame_skip"))
+        if pool == "max" and skip > 1:
+            raise ValueError("RecordingVecEnv needs obs_pool 'last' or 'stack': a "
+                             "'max'-pooled observation is not the game state")
+        super().__init__(venv)
+        self.recorder = TrajectoryRecorder(path, source="train",
+                                           n_envs=venv.num_envs, every=every, **meta)
+        self.every    = max(1, int(every))
+        self.step_no  = 0
+        self.episode  = np.zeros(venv.num_envs, np.uint32)
+        self.env_ids  = np.arange(venv.num_envs)
+        self._obs: np.ndarray | None = None
+        self._actions: np.ndarray | None = None
+
+    def reset(self) -> np.ndarray:
+        self._obs = self.venv.reset()
+        return self._obs
+
+    def step_async(self, actions: np.ndarray) -> None:
+        self._actions = np.asarray(actions).reshape(self.num_envs)
+        self.venv.step_async(actions)
+
+    def step_wait(self):
+        obs, rewards, dones, infos = self.venv.step_wait()
+        if self.step_no % self.every == 0 and self._obs is not None:
+            s = self._obs[:, -6:]                 # last tick of a stacked obs
+            self.recorder.add_batch(
+                frame=self.step_no, env=self.env_ids, episode=self.episode,
+                blue_x=s[:, 0], blue_y=s[:, 1] + TOP_MARGIN,
+                ball_x=s[:, 2], ball_y=s[:, 3] + TOP_MARGIN,
+                ball_vx=s[:, 4] * MAX_V, ball_vy=s[:, 5] * MAX_V,
+                blue_action=self._actions, reward=rewards, done=dones)
+        self.episode += dones
+        self.step_no += 1
+        self._obs = obs
+        return obs, rewards, dones, infos
+
+    def close(self) -> None:
+        self.recorder.close()
+        self.venv.close()
@@ -0,0 +1,375 @@
+"""
+Policy model registry, LRU cache and hot-swap slot
+==================================================
+
+``models/registry.json`` records every checkpoint with its normalisation
+stats, curriculum phase and a content hash::
+
+    {"name": "final_agent", "path": "final_agent.zip", "kind": "sb3",
+     "vecnorm": "final_vecnorm.pkl", "phase": 2, "sha256": "…", "mtime": …,
+     "vecnorm_mtime": …, "seq": 3}
+
+``sha256`` covers the checkpoint *and* its stats, and is the cache key;
+``scan`` re-hashes an entry when either file's mtime changes, so new
+normalisation stats next to an unchanged ``.zip`` are never served from
+the old cache slot.
+
+``seq`` is the registration order.  ``default()`` is the index's explicit
+``"default"`` entry if one is set (``--default NAME``), otherwise the most
+recent registration – never file mtimes, which a ``git checkout`` scrambles.
+``scan`` refreshes changed files in place and numbers new ones in path
+order, so a fresh checkout always picks the same model.
+
+``ModelRegistry.load(name)`` returns a ``LoadedPolicy`` and keeps the last
+*capacity* loads in an LRU keyed by content hash, so switching back to a
+recently used model is a dict lookup instead of a disk read.  A load that
+is already in flight (prefetch, a slot's background swap) is shared: a
+second caller waits for it instead of reading the same file again.
+
+``PolicySlot`` is what the game loop holds.  ``slot.request(name)`` swaps
+immediately on a cache hit; otherwise the model is loaded on a background
+thread while the old policy keeps playing, and the slot switches over on
+the next ``act`` after the load finished — the 60 FPS loop never waits.
+
+    python -m rl_agent.registry                 # scan models/ and list
+    python -m rl_agent.registry --default final_agent
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from pathlib import Path
+from typing import Any, Callable
+
+import numpy as np
+
+MODELS_DIR    = Path(__file__).resolve().parent.parent / "models"
+INDEX_FILE    = "registry.json"
+VECNORM_FILE  = "final_vecnorm.pkl"
+_PHASE_RE     = re.compile(r"phase[_-]?(\d+)")
+_KINDS        = {".zip": "sb3", ".npz": "numpy"}
+
+
+def _mtime(path: Path | None) -> float | None:
+    return path.stat().st_mtime if path is not None and path.exists() else None
+
+
+def content_hash(*paths: Path | None) -> str:
+    """SHA-256 over the bytes of every existing *path* (checkpoint + stats)."""
+    h = hashlib.sha256()
+    for p in paths:
+        if p is not None and Path(p).exists():
+            with open(p, "rb") as f:
+                for chunk in iter(lambda: f.read(1 << 20), b""):
+                    h.update(chunk)
+    return h.hexdigest()
+
+
+# ------------------------------------------------------------------ #
+#                          LOADED POLICY                             #
+# ------------------------------------------------------------------ #
+class LoadedPolicy:
+    """An agent + its obs normaliser; ``act(obs)`` → int action."""
+
+    def __init__(self, entry: dict[str, Any], agent,
+                 normalize_obs: Callable[[np.ndarray], np.ndarray] | None = None):
+        self.entry         = entry
+        self.name          = entry["name"]
+        self.agent         = agent
+        self.normalize_obs = normalize_obs
+
+    def act(self, obs: np.ndarray, deterministic: bool = True) -> int:
+        obs = np.asarray(obs, np.float32).reshape(1, -1)
+        if self.normalize_obs is not None:
+            obs = self.normalize_obs(obs)
+        return int(self.agent.predict(obs, deterministic=deterministic)[0][0])
+
+    def warmup(self) -> None:
+        """One dummy forward pass (torch's first call is far slower than the rest)."""
+        dim = getattr(self.agent, "obs_dim", None) or self.agent.observation_space.shape[0]
+        self.act(np.zeros(dim, np.float32))
+
+
+def _load_entry(root: Path, entry: dict[str, Any]) -> LoadedPolicy:
+    path = root / entry["path"]
+    if entry["kind"] == "numpy":                  # normalisation already folded in
+        from rl_agent.numpy_policy import NumpyPolicy
+        return LoadedPolicy(entry, NumpyPolicy.load(path))
+
+    from stable_baselines3 import PPO
+    from rl_agent.numpy_policy import ObsNormalizer
+    agent = PPO.load(path, device="cpu")
+    norm = None
+    if entry.get("vecnorm") and (root / entry["vecnorm"]).exists():
+        norm = ObsNormalizer.load(root / entry["vecnorm"])
+    return LoadedPolicy(entry, agent, norm)
+
+
+# ------------------------------------------------------------------ #
+#                            REGISTRY                                #
+# ------------------------------------------------------------------ #
+class ModelRegistry:
+    """JSON index of checkpoints in *root* + LRU cache of loaded policies."""
+
+    def __init__(self, root: Path | str = MODELS_DIR, capacity: int = 4):
+        self.root     = Path(root)
+        self.capacity = capacity
+        self._cache: OrderedDict[str, LoadedPolicy] = OrderedDict()   # sha → policy
+        self._loading: dict[str, Future] = {}                          # sha → in flight
+        self._lock    = threading.Lock()
+        self.stats    = dict(hits=0, misses=0, waits=0, load_s=0.0)
+        self._entries: dict[str, dict[str, Any]] = {}
+        self._default: str | None = None
+        index = self.root / INDEX_FILE
+        if index.exists():
+            with open(index) as f:
+                data = json.load(f)
+            self._entries = {e["name"]: e for e in data["models"]}
+            self._default = data.get("default")
+
+    # ------------------------------------------------------------------
+    # index
+    def _save(self) -> None:
+        index = self.root / INDEX_FILE
+        tmp = index.with_suffix(".json.tmp")
+        with open(tmp, "w") as f:
+            json.dump({"default": self._default,
+                       "models": sorted(self._entries.values(), key=lambda e: e["name"])},
+                      f, indent=2)
+        os.replace(tmp, index)
+
+    def register(self, path: Path | str, *, vecnorm: Path | str | None = None,
+                 phase: int | None = None, name: str | None = None,
+                 save: bool = True, **meta: Any) -> dict[str, Any]:
+        """Add or refresh *path* in the index (hash recomputed, newest ``seq``)."""
+        path = Path(path)
+        if path.suffix not in _KINDS:
+            raise ValueError(f"unsupported checkpoint type {path.suffix!r}")
+        vec = Path(vecnorm) if vecnorm is not None else None
+        if phase is None and (m := _PHASE_RE.search(path.stem)):
+            phase = int(m.group(1))
+        entry = dict(
+            name=name or path.stem,
+            path=os.path.relpath(path, self.root),
+            kind=_KINDS[path.suffix],
+            vecnorm=os.path.relpath(vec, self.root) if vec is not None else None,
+            phase=phase,
+            sha256=content_hash(path, vec),
+            mtime=path.stat().st_mtime,
+            vecnorm_mtime=_mtime(vec),
+            **meta,
+        )
+        with self._lock:
+            entry["seq"] = 1 + max((e.get("seq", 0) for e in self._entries.values()),
+                                   default=0)
+            self._entries[entry["name"]] = entry
+            if save:
+                self._save()
+        return entry
+
+    def scan(self) -> list[dict[str, Any]]:
+        """Register new / changed checkpoints in *root*; drop vanished ones."""
+        changed = False
+        for name in [n for n, e in self._entries.items()
+                     if not (self.root / e["path"]).exists()]:
+            del self._entries[name]
+            changed = True
+        by_path = {e["path"]: e for e in self._entries.values()}
+        for path in sorted(self.root.glob("*")):
+            if path.suffix not in _KINDS:
+                continue
+            old = by_path.get(path.name)
+            vec = self.root / VECNORM_FILE
+            vec = vec if path.suffix == ".zip" and vec.exists() else None
+            if old is not None and old["mtime"] == path.stat().st_mtime \
+                    and old.get("vecnorm_mtime") == _mtime(vec) \
+                    and old.get("vecnorm") == (vec.name if vec else None):
+                continue
+            if old is not None:
+                name = old["name"]
+            else:                                 # final_agent.zip + final_agent.npz
+                name = path.name if path.stem in self._entries else path.stem
+            entry = self.register(
+                path, vecnorm=vec,
+                phase=None if old is None else old.get("phase"), name=name, save=False)
+            if old is not None:                   # a refresh, not a new registration
+                entry["seq"] = old.get("seq", 0)
+            changed = True
+        if changed:
+            with self._lock:
+                self._save()
+        return self.entries()
+
+    def entries(self) -> list[dict[str, Any]]:
+        """All entries in registration order (the last one is the fallback default)."""
+        return sorted(self._entries.values(), key=lambda e: (e.get("seq", 0), e["name"]))
+
+    def get(self, name: str) -> dict[str, Any]:
+        try:
+            return self._entries[name]
+        except KeyError:
+            raise KeyError(f"no model {name!r} in {self.root / INDEX_FILE}") from None
+
+    def default(self) -> str:
+        """The explicit default entry, else the most recently registered one."""
+        if self._default in self._entries:
+            return self._default
+        entries = self.entries()
+        if not entries:
+            raise FileNotFoundError(f"no checkpoints registered in {self.root}")
+        return entries[-1]["name"]
+
+    def set_default(self, name: str | None) -> None:
+        """Pin ``default()`` to *name* (``None`` → most recent registration)."""
+        if name is not None:
+            self.get(name)
+        with self._lock:
+            self._default = name
+            self._save()
+
+    # ------------------------------------------------------------------
+    # cached loads
+    def is_cached(self, name: str) -> bool:
+        return self.get(name)["sha256"] in self._cache
+
+    def load(self, name: str) -> LoadedPolicy:
+        """Cached load by name; identical content shares one cache slot."""
+        entry = self.get(name)
+        key = entry["sha256"]
+        with self._lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                self.stats["hits"] += 1
+                return self._for_entry(self._cache[key], entry)
+            pending = self._loading.get(key)
+            if pending is None:                   # this caller does the load
+                self._loading[key] = fut = Future()
+            else:
+                self.stats["waits"] += 1
+        if pending is not None:                   # someone else is loading it
+            return self._for_entry(pending.result(), entry)
+
+        t0 = time.perf_counter()
+        try:
+            pol = _load_entry(self.root, entry)   # disk + torch work outside the lock
+            pol.warmup()
+        except BaseException as exc:
+            with self._lock:
+                del self._loading[key]
+            fut.set_exception(exc)
+            raise
+        with self._lock:
+            self.stats["misses"] += 1
+            self.stats["load_s"] += time.perf_counter() - t0
+            self._cache[key] = pol
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.capacity:
+                self._cache.popitem(last=False)
+            del self._loading[key]
+        fut.set_result(pol)
+        return pol
+
+    @staticmethod
+    def _for_entry(pol: LoadedPolicy, entry: dict[str, Any]) -> LoadedPolicy:
+        """*pol* under *entry*'s name (identical content registered twice)."""
+        return pol if pol.entry is entry else LoadedPolicy(entry, pol.agent, pol.normalize_obs)
+
+
+# ------------------------------------------------------------------ #
+#                         HOT-SWAP SLOT                              #
+# ------------------------------------------------------------------ #
+class PolicySlot:
+    """The policy a match is currently using; swaps without blocking."""
+
+    def __init__(self, registry: ModelRegistry, name: str | None = None):
+        self.registry = registry
+        self.current: LoadedPolicy = registry.load(name or registry.default())
+        self.pending: str | None = None
+        self.error: tuple[str, Exception] | None = None   # last failed background load
+        self._ready: LoadedPolicy | None = None
+        self._lock = threading.Lock()
+        self.on_swap: Callable[[LoadedPolicy], None] | None = None
+
+    @property
+    def name(self) -> str:
+        return self.current.name
+
+    def request(self, name: str) -> bool:
+        """Switch to *name*; True if it took effect immediately (cache hit)."""
+        self.error = None
+        if name == self.current.name:
+            return True
+        if self.registry.is_cached(name):
+            self._swap(self.registry.load(name))
+            return True
+        with self._lock:
+            self.pending = name
+        threading.Thread(target=self._load_async, args=(name,), daemon=True).start()
+        return False
+
+    def prefetch(self, names: list[str]) -> None:
+        """Warm the LRU in the background (e.g. every difficulty level)."""
+        def work():
+            for n in names:
+                self.registry.load(n)
+        threading.Thread(target=work, daemon=True).start()
+
+    def act(self, obs: np.ndarray, deterministic: bool = True) -> int:
+        if self._ready is not None:
+            with self._lock:
+                ready, self._ready = self._ready, None
+            if ready is not None:
+                self._swap(ready)
+        return self.current.act(obs, deterministic)
+
+    # ------------------------------------------------------------------
+    def _load_async(self, name: str) -> None:
+        try:
+            pol = self.registry.load(name)
+        except Exception as exc:                  # keep playing the current policy
+            print(f"⚠ loading {name!r} failed: {exc!r}")
+            with self._lock:
+                if self.pending == name:
+                    self.pending = None
+                    self.error = (name, exc)
+            return
+        with self._lock:
+            if self.pending == name:              # a later request wins
+                self._ready = pol
+                self.pending = None
+
+    def _swap(self, pol: LoadedPolicy) -> None:
+        with self._lock:
+            self.current = pol
+            self.pending = None
+            self._ready = None
+        if self.on_swap is not None:
+            self.on_swap(pol)
+
+
+if __name__ == "__main__":
+    p = argparse.ArgumentParser(description="Scan models/ and list the registry")
+    p.add_argument("--default", metavar="NAME",
+                   help="pin the model the game / evaluate use by default")
+    args = p.parse_args()
+    reg = ModelRegistry()
+    reg.scan()
+    if args.default:
+        reg.set_default(args.default)
+    d = reg.default()
+    print(f"  {'name':<24}{'kind':<7}{'phase':>6}  {'sha256':<14}{'vecnorm'}")
+    for e in reg.entries():
+        print(f"{'*' if e['name'] == d else ' '} {e['name']:<24}{e['kind']:<7}"
+              f"{str(e['phase']):>6}  {e['sha256'][:12]:<14}{e['vecnorm'] or '—'}")
+    for label in ("cold", "cached"):
+        t0 = time.perf_counter()
+        reg.load(d)
+        print(f"load {d} ({label}): {1e3 * (time.perf_counter() - t0):.1f} ms")
@@ -0,0 +1,232 @@
+"""
+Multi-process shared-memory vector env
+======================================
+
+Splits N matches across worker processes.  Every worker owns a slice of
+the matches as a ``FootballVecEnv`` and writes its observations, rewards,
+dones and terminal observations straight into shared-memory NumPy
+buffers; the parent only sends one-word commands over a pipe, so no
+arrays are ever pickled on the hot path.
+
+    venv = ShmVecEnv(256, n_workers=None, phase=0)   # None → all cores
+    VecNormalize(venv, ...)                          # works as usual
+"""
+
+from __future__ import annotations
+
+import multiprocessing as mp
+import os
+from multiprocessing.connection import Connection
+from typing import Any, Sequence
+
+import numpy as np
+from stable_baselines3.common.vec_env.base_vec_env import (
+    VecEnv, VecEnvIndices, VecEnvStepReturn,
+)
+
+from rl_agent.environment import build_spaces
+from rl_agent.vec_env import FootballVecEnv
+
+
+def available_cores() -> int:
+    """CPU cores this process may run on (respects affinity / cgroups)."""
+    if hasattr(os, "sched_getaffinity"):
+        return max(1, len(os.sched_getaffinity(0)))
+    return max(1, os.cpu_count() or 1)
+
+
+# ------------------------------------------------------------------ #
+#                         SHARED BUFFERS                             #
+# ------------------------------------------------------------------ #
+_BUFFERS = {                       # name → (dtype, per-env trailing shape)
+    "actions":  (np.int64,   ()),
+    "obs":      (np.float32, ("obs",)),
+    "rewards":  (np.float32, ()),
+    "dones":    (np.bool_,   ()),
+    "trunc":    (np.bool_,   ()),
+    "outcome":  (np.int8,    ()),
+    "term_obs": (np.float32, ("obs",)),
+}
+
+
+def _alloc(ctx, n: int, obs_dim: int) -> dict[str, Any]:
+    raw = {}
+    for name, (dtype, tail) in _BUFFERS.items():
+        size = n * (obs_dim if tail else 1) * np.dtype(dtype).itemsize
+        raw[name] = ctx.RawArray("b", size)
+    return raw
+
+
+def _views(raw: dict[str, Any], n: int, obs_dim: int) -> dict[str, np.ndarray]:
+    out = {}
+    for name, (dtype, tail) in _BUFFERS.items():
+        shape = (n, obs_dim) if tail else (n,)
+        out[name] = np.frombuffer(raw[name], dtype=dtype).reshape(shape)
+    return out
+
+
+# ------------------------------------------------------------------ #
+#                              WORKER                                #
+# ------------------------------------------------------------------ #
+def _worker(conn: Connection, raw: dict[str, Any], n: int, obs_dim: int,
+            lo: int, hi: int, env_kwargs: dict[str, Any], seed: int | None) -> None:
+    """Run matches [lo, hi) and write results into the shared buffers."""
+    os.environ.setdefault("OMP_NUM_THREADS", "1")
+    buf = {k: v[lo:hi] for k, v in _views(raw, n, obs_dim).items()}
+    env = FootballVecEnv(hi - lo, seed=seed, **env_kwargs)
+    try:
+        while True:
+            cmd, arg = conn.recv()
+            if cmd == "step":
+                obs, rew, dones, infos = env.step(buf["actions"])
+                buf["obs"][:] = obs
+                buf["rewards"][:] = rew
+                buf["dones"][:] = dones
+                for i in np.flatnonzero(dones):
+                    buf["term_obs"][i] = infos[i]["terminal_observation"]
+                    buf["trunc"][i] = infos[i]["TimeLimit.truncated"]
+                    buf["outcome"][i] = infos[i]["outcome"]
+                conn.send(None)
+            elif cmd == "reset":
+                if arg is not None:
+                    env.seed(arg)
+                buf["obs"][:] = env.reset()
+                conn.send(None)
+            elif cmd == "get_attr":
+                conn.send(env.get_attr(*arg))
+            elif cmd == "set_attr":
+                conn.send(env.set_attr(*arg))
+            elif cmd == "env_method":
+                name, args, kwargs, idx = arg
+                conn.send(env.env_method(name, *args, indices=idx, **kwargs))
+            elif cmd == "close":
+                conn.send(None)
+                break
+    except (KeyboardInterrupt, EOFError):
+        pass
+    finally:
+        env.close()
+
+
+# ------------------------------------------------------------------ #
+#                          PARENT VEC ENV                            #
+# ------------------------------------------------------------------ #
+class ShmVecEnv(VecEnv):
+    """``FootballVecEnv`` slices in worker processes, shared-memory I/O."""
+
+    def __init__(self, num_envs: int, n_workers: int | None = None,
+                 phase: int | Sequence[int] = 0, seed: int | None = None,
+                 frame_skip: int = 1, obs_pool: str = "last",
+                 rewards: dict[str, float] | None = None,
+                 difficulty: float | Sequence[float] | None = None,
+                 start_method: str | None = None):
+        n = int(num_envs)
+        n_workers = min(n, n_workers or available_cores())
+        obs_space, act_space = build_spaces(frame_skip, obs_pool)
+        obs_dim = obs_space.shape[0]
+
+        if start_method is None:
+            start_method = "forkserver" if "forkserver" in mp.get_all_start_methods() else "spawn"
+        ctx = mp.get_context(start_method)
+
+        self._raw = _alloc(ctx, n, obs_dim)
+        self._buf = _views(self._raw, n, obs_dim)
+        self.render_mode = None
+
+        phases = np.broadcast_to(np.asarray(phase, np.int64), (n,))
+        diffs = np.broadcast_to(np.asarray(
+            np.nan if difficulty is None else difficulty, np.float64), (n,))
+        bounds = np.linspace(0, n, n_workers + 1).astype(int)
+        self._slices = list(zip(bounds[:-1], bounds[1:]))
+        self._remotes: list[Connection] = []
+        self._procs: list[mp.Process] = []
+        for rank, (lo, hi) in enumerate(self._slices):
+            parent, child = ctx.Pipe()
+            kwargs = dict(phase=phases[lo:hi].tolist(), difficulty=diffs[lo:hi].tolist(),
+                          frame_skip=frame_skip, obs_pool=obs_pool, rewards=rewards)
+            wseed = None if seed is None else seed + rank
+            p = ctx.Process(target=_worker, daemon=True,
+                            args=(child, self._raw, n, obs_dim, lo, hi, kwargs, wseed))
+            p.start()
+            child.close()
+            self._remotes.append(parent)
+            self._procs.append(p)
+
+        self.n_workers = n_workers
+        self.closed = False
+        super().__init__(n, obs_space, act_space)
+
+    # ------------------------------------------------------------------
+    # VecEnv API
+    def reset(self) -> np.ndarray:
+        for rank, remote in enumerate(self._remotes):
+            s = self._seeds[0]
+            remote.send(("reset", None if s is None else s + rank))
+        for remote in self._remotes:
+            remote.recv()
+        self._reset_seeds()
+        self._reset_options()
+        return self._buf["obs"].copy()
+
+    def step_async(self, actions: np.ndarray) -> None:
+        self._buf["actions"][:] = np.asarray(actions).reshape(self.num_envs)
+        for remote in self._remotes:
+            remote.send(("step", None))
+
+    def step_wait(self) -> VecEnvStepReturn:
+        for remote in self._remotes:
+            remote.recv()
+        b = self._buf
+        dones = b["dones"].copy()
+        infos: list[dict[str, Any]] = [{} for _ in range(self.num_envs)]
+        for i in np.flatnonzero(dones):
+            infos[i]["terminal_observation"] = b["term_obs"][i].copy()
+            infos[i]["TimeLimit.truncated"] = bool(b["trunc"][i])
+            infos[i]["outcome"] = int(b["outcome"][i])
+        return b["obs"].copy(), b["rewards"].copy(), dones, infos
+
+    def close(self) -> None:
+        if self.closed:
+            return
+        for remote in self._remotes:
+            try:
+                remote.send(("close", None))
+                remote.recv()
+            except (BrokenPipeError, EOFError):
+                pass
+        for p in self._procs:
+            p.join(timeout=5)
+        self.closed = True
+
+    def get_attr(self, attr_name: str, indices: VecEnvIndices = None) -> list[Any]:
+        return [v for rank, local in self._route(indices)
+                for v in self._call(rank, "get_attr", (attr_name, local))]
+
+    def set_attr(self, attr_name: str, value: Any, indices: VecEnvIndices = None) -> None:
+        for rank, local in self._route(indices):
+            self._call(rank, "set_attr", (attr_name, value, local))
+
+    def env_method(self, method_name: str, *method_args,
+                   indices: VecEnvIndices = None, **method_kwargs) -> list[Any]:
+        return [v for rank, local in self._route(indices)
+                for v in self._call(rank, "env_method",
+                                    (method_name, method_args, method_kwargs, local))]
+
+    def env_is_wrapped(self, wrapper_class, indices: VecEnvIndices = None) -> list[bool]:
+        return [False for _ in self._get_indices(indices)]
+
+    # ------------------------------------------------------------------
+    # helpers
+    def _call(self, rank: int, cmd: str, arg: Any) -> Any:
+        self._remotes[rank].send((cmd, arg))
+        return self._remotes[rank].recv()
+
+    def _route(self, indices: VecEnvIndices) -> list[tuple[int, list[int]]]:
+        """Map global env indices → [(worker rank, local indices)]."""
+        idx = list(self._get_indices(indices))
+        out = []
+        for rank, (lo, hi) in enumerate(self._slices):
+            local = [i - lo for i in idx if lo <= i < hi]
+            if local:
+                out.append((rank, local))
+        return out
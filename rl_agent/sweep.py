@@ -0,0 +1,231 @@
+"""
+Parallel curriculum sweep across seeds and hyperparameters
+==========================================================
+
+Every trial is a full curriculum run (``train_curriculum``) in its own
+process.  Trials run side by side, each capped to ``--threads`` CPU
+threads, so that *k* trials do not each spin up one torch / BLAS thread
+per core and end up fighting over the machine.  By default the number of
+parallel trials is ``available_cores() // threads``.
+
+Every finished trial appends one row to ``sweeps/<name>/results.csv``:
+
+    trial, seed, learning_rate, phase_steps, rewards, n_envs,
+    goal_rate, own_goal_rate, wall_s, steps_per_sec, total_steps, status
+
+``goal_rate`` is measured with the deterministic policy on phase-2
+spawns (``evaluate.goal_rate``).  Models and TensorBoard logs go
+to ``sweeps/<name>/trial_XXX/``.
+
+Usage
+-----
+python -m rl_agent.sweep --seeds 0,1,2 --lr 1e-4,3e-4
+python -m rl_agent.sweep --reward goal_rew=50,100 --reward hold_pen=-0.01,-0.05
+python -m rl_agent.sweep --random 12 --lr 5e-5,1e-4,3e-4 --threads 2
+python -m rl_agent.sweep --phase-steps 20000,40000,60000 --seeds 0,1 --name quick
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import itertools
+import json
+import multiprocessing as mp
+import os
+import random
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Any
+
+from rl_agent.environment import REWARDS
+from rl_agent.shm_vec_env import available_cores
+
+SWEEP_DIR = Path("sweeps")
+FIELDS = ("trial", "seed", "learning_rate", "phase_steps", "rewards", "n_envs",
+          "goal_rate", "own_goal_rate", "wall_s", "steps_per_sec",
+          "total_steps", "status")
+_THREAD_VARS = ("OMP_NUM_THREADS", "MKL_NUM_THREADS", "OPENBLAS_NUM_THREADS")
+
+
+# ------------------------------------------------------------------ #
+#                           TRIAL GRID                               #
+# ------------------------------------------------------------------ #
+def build_trials(seeds: list[int], lrs: list[float],
+                 phase_steps: list[list[int]],
+                 rewards: dict[str, list[float]],
+                 n_random: int | None = None,
+                 rng_seed: int = 0) -> list[dict[str, Any]]:
+    """Full grid, or *n_random* distinct points sampled from it."""
+    keys = sorted(rewards)
+    grid = list(itertools.product(seeds, lrs, phase_steps,
+                                  itertools.product(*(rewards[k] for k in keys))))
+    if n_random is not None and n_random < len(grid):
+        grid = random.Random(rng_seed).sample(grid, n_random)
+    return [dict(trial=i, seed=seed, learning_rate=lr, phase_steps=list(steps),
+                 rewards=dict(zip(keys, values)))
+            for i, (seed, lr, steps, values) in enumerate(grid)]
+
+
+# ------------------------------------------------------------------ #
+#                          ONE TRIAL (child)                         #
+# ------------------------------------------------------------------ #
+def _run_trial(trial: dict[str, Any], out: str, n_envs: int, threads: int,
+               eval_episodes: int) -> dict[str, Any]:
+    """Train one curriculum and evaluate it.  Runs in a pool process."""
+    import torch                              # heavy imports stay in the child
+
+    from rl_agent.evaluate import goal_rate
+    from rl_agent.train_curriculum import train_curriculum
+
+    torch.set_num_threads(threads)
+    tdir = Path(out) / f"trial_{trial['trial']:03d}"
+    tdir.mkdir(parents=True, exist_ok=True)
+    row = dict(trial=trial["trial"], seed=trial["seed"],
+               learning_rate=trial["learning_rate"],
+               phase_steps=",".join(map(str, trial["phase_steps"])),
+               rewards=json.dumps(trial["rewards"], sort_keys=True),
+               n_envs=n_envs)
+    t0 = time.perf_counter()
+    try:
+        model, stats = train_curriculum(
+            trial["phase_steps"], n_envs=n_envs, backend="batched",
+            rewards=trial["rewards"], progress_bar=False,
+            model_kwargs=dict(learning_rate=trial["learning_rate"],
+                              seed=trial["seed"], verbose=0,
+                              tensorboard_log=str(tdir / "logs")))
+        wall = time.perf_counter() - t0
+        model.save(tdir / "final_agent")
+        stats.save(tdir / "final_vecnorm.pkl")
+        rates = goal_rate(model, stats, episodes=eval_episodes)
+        stats.close()
+        total = sum(trial["phase_steps"])
+        row.update(goal_rate=round(rates["goal_rate"], 4),
+                   own_goal_rate=round(rates["own_goal_rate"], 4),
+                   wall_s=round(wall, 1), steps_per_sec=round(total / wall),
+                   total_steps=total, status="ok")
+    except Exception:                         # one bad trial must not end the sweep
+        (tdir / "error.txt").write_text(traceback.format_exc())
+        row.update(wall_s=round(time.perf_counter() - t0, 1),
+                   status="error: " + traceback.format_exc().strip().splitlines()[-1])
+    return row
+
+
+# ------------------------------------------------------------------ #
+#                          SWEEP (parent)                            #
+# ------------------------------------------------------------------ #
+def run_sweep(trials: list[dict[str, Any]], out: Path, *, n_envs: int = 8,
+              threads: int = 1, parallel: int | None = None,
+              eval_episodes: int = 200) -> list[dict[str, Any]]:
+    """Run *trials* in a process pool; rows land in ``out/results.csv`` as they finish."""
+    out.mkdir(parents=True, exist_ok=True)
+    parallel = parallel or max(1, available_cores() // threads)
+    with open(out / "trials.json", "w") as f:
+        json.dump(trials, f, indent=2)
+
+    # BLAS / OpenMP read these once at import, so they must be in the
+    # environment the pool's children inherit, before the pool exists.
+    saved = {v: os.environ.get(v) for v in _THREAD_VARS}
+    os.environ.update({v: str(threads) for v in _THREAD_VARS})
+    methods = mp.get_all_start_methods()
+    ctx = mp.get_context("forkserver" if "forkserver" in methods else "spawn")
+
+    results_csv = out / "results.csv"
+    new_file = not results_csv.exists()
+    rows = []
+    print(f"{len(trials)} trials  |  {parallel} parallel × {threads} threads  |  {out}")
+    try:
+        with open(results_csv, "a", newline="") as f, \
+             ProcessPoolExecutor(parallel, mp_context=ctx) as pool:
+            writer = csv.DictWriter(f, FIELDS)
+            if new_file:
+                writer.writeheader()
+            futures = [pool.submit(_run_trial, t, str(out), n_envs, threads,
+                                   eval_episodes) for t in trials]
+            for fut in as_completed(futures):
+                row = fut.result()
+                writer.writerow(row)
+                f.flush()
+                rows.append(row)
+                print(f"  trial {row['trial']:>3}  {row['status']:<6} "
+                      f"goal {row.get('goal_rate', float('nan')):.3f}  "
+                      f"{row['wall_s']:>7.1f}s")
+    finally:
+        for v, old in saved.items():
+            if old is None:
+                os.environ.pop(v, None)
+            else:
+                os.environ[v] = old
+    return rows
+
+
+def summary(rows: list[dict[str, Any]], top: int = 10) -> None:
+    ok = sorted((r for r in rows if r["status"] == "ok"),
+                key=lambda r: (-r["goal_rate"], r["own_goal_rate"]))
+    print(f"\n{'trial':>5}{'seed':>6}{'lr':>10}{'goal':>8}{'own':>7}"
+          f"{'wall s':>9}{'steps/s':>9}  rewards")
+    for r in ok[:top]:
+        print(f"{r['trial']:>5}{r['seed']:>6}{r['learning_rate']:>10.1e}"
+              f"{r['goal_rate']:>8.3f}{r['own_goal_rate']:>7.3f}"
+              f"{r['wall_s']:>9.1f}{r['steps_per_sec']:>9,}  {r['rewards']}")
+    failed = len(rows) - len(ok)
+    if failed:
+        print(f"{failed} trial(s) failed — see trial_XXX/error.txt")
+
+
+# ------------------------------------------------------------------ #
+#                            ENTRY POINT                             #
+# ------------------------------------------------------------------ #
+def _floats(s: str) -> list[float]:
+    return [float(x) for x in s.split(",")]
+
+
+def _reward_axis(s: str) -> tuple[str, list[float]]:
+    key, _, values = s.partition("=")
+    if key not in REWARDS or not values:
+        raise argparse.ArgumentTypeError(
+            f"expected name=v1,v2 with name in {sorted(REWARDS)}")
+    return key, _floats(values)
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    from rl_agent.train_curriculum import STEPS
+    p = argparse.ArgumentParser(description="Parallel curriculum sweep")
+    p.add_argument("--name", default=time.strftime("%Y%m%d-%H%M%S"),
+                   help="output folder under sweeps/")
+    p.add_argument("--seeds", type=lambda s: [int(x) for x in s.split(",")],
+                   default=[0], help="comma-separated seeds")
+    p.add_argument("--lr", type=_floats, default=[1e-4],
+                   help="comma-separated initial learning rates")
+    p.add_argument("--phase-steps", action="append",
+                   type=lambda s: [int(x) for x in s.split(",")],
+                   help="per-phase steps 'a,b,c' (repeat for several schedules)")
+    p.add_argument("--reward", action="append", type=_reward_axis, default=[],
+                   help="reward weight axis, e.g. goal_rew=50,100 (repeatable)")
+    p.add_argument("--random", type=int, metavar="N",
+                   help="sample N grid points instead of running the full grid")
+    p.add_argument("--n-envs", type=int, default=8, help="matches per trial")
+    p.add_argument("--threads", type=int, default=1,
+                   help="CPU threads per trial (torch + BLAS)")
+    p.add_argument("--parallel", type=int,
+                   help="concurrent trials (default: cores // threads)")
+    p.add_argument("--eval-episodes", type=int, default=200)
+    args = p.parse_args(argv)
+    args.phase_steps = args.phase_steps or [STEPS]
+    return args
+
+
+def main(argv: list[str] | None = None) -> None:
+    args = parse_args(argv)
+    trials = build_trials(args.seeds, args.lr, args.phase_steps,
+                          dict(args.reward), args.random)
+    rows = run_sweep(trials, SWEEP_DIR / args.name, n_envs=args.n_envs,
+                     threads=args.threads, parallel=args.parallel,
+                     eval_episodes=args.eval_episodes)
+    summary(rows)
+
+
+if __name__ == "__main__":
+    main()
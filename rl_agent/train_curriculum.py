@@ -6,45 +6,119 @@ Phase 0 : ball near player   • 450 000 steps
 Phase 1 : mid-field spawn    • 900 000 steps
 Phase 2 : anywhere spawn     • 1 500 000 steps
 Total   :                    • 2 850 000 steps
+
+Usage
+-----
+python -m rl_agent.train_curriculum                       # batched, 1 process
+python -m rl_agent.train_curriculum --vec subproc         # workers = all cores
+python -m rl_agent.train_curriculum --vec subproc --workers 4 --n-envs 256
+python -m rl_agent.train_curriculum --bench --n-envs 256  # steps/sec table
+python -m rl_agent.train_curriculum --resume              # continue last run
+python -m rl_agent.train_curriculum --record recordings/run1 --record-every 4
+python -m rl_agent.train_curriculum --init-model models/bc_agent.zip \
+                                    --init-vecnorm models/bc_vecnorm.pkl
+python -m rl_agent.train_curriculum --adaptive phase --promote-rate 0.7
+python -m rl_agent.train_curriculum --adaptive difficulty --finish
+python -m rl_agent.train_curriculum --no-profile          # skip the time breakdown
+
+Checkpoints (model + optimizer, VecNormalize stats, phase, step counter)
+are written every ``--ckpt-every`` steps to ``models/checkpoints/`` in the
+background; ``--resume`` restarts from the newest one, mid-phase included.
+
+``--adaptive`` hands the schedule to ``callbacks.CurriculumScheduler``:
+phases end as soon as the rolling training goal rate reaches
+``--promote-rate`` (the step counts above become upper bounds), or one
+run climbs the continuous spawn difficulty instead of the three phases.
+
+``callbacks.TrainingProfiler`` is on by default: ``profile/*`` scalars
+(env / VecNormalize / policy / update seconds, steps/sec, peak RSS) go to
+the TensorBoard runs in ``logs/`` and the per-phase table is printed at
+the end and saved as ``profile.txt`` next to each run.
 """
 
 from __future__ import annotations           # ← must stay first!
 
-# ── head-less pygame safeguard ────────────────────────────────────
-import os
-os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
-
-import pygame
-pygame.init()
-pygame.display.set_mode((1, 1), pygame.HIDDEN if hasattr(pygame, "HIDDEN") else 0)
+# core/ is pygame-free, so no SDL / display init is needed here.
 
 # ── standard imports ──────────────────────────────────────────────
+import argparse
+import time
 from pathlib import Path
-from typing import Callable
+from typing import Any, Callable
 
 import numpy as np
 from stable_baselines3 import PPO
-from stable_baselines3.common.vec_env import DummyVecEnv, VecNormalize
+from stable_baselines3.common.callbacks import BaseCallback
+from stable_baselines3.common.vec_env import DummyVecEnv, VecEnv, VecNormalize
 
+from rl_agent.callbacks import (
+    AsyncCheckpoint, CurriculumScheduler, TrainingProfiler, latest_checkpoint,
+    load_vecnorm,
+)
 from rl_agent.environment import FootballEnv
 from rl_agent.model import create_model
+from rl_agent.recording import RecordingVecEnv
+from rl_agent.registry import ModelRegistry
+from rl_agent.shm_vec_env import ShmVecEnv, available_cores
+from rl_agent.vec_env import FootballVecEnv
 
 
 # ------------------------------------------------------------------
 #                       TRAINING SCHEDULE
 # ------------------------------------------------------------------
 STEPS    = [400_000, 800_000, 1_200_000]      # per-phase timesteps
-N_ENVS   = 8                                  # parallel workers
+N_ENVS   = 8                                  # parallel matches
+VEC_BACKEND = "batched"                       # batched / subproc / dummy
+N_WORKERS   = None                            # subproc only; None → all cores
+FRAME_SKIP = 1                                # action repeat (policy calls ÷ k)
+OBS_POOL   = "last"                           # last / max / stack
 MODEL_DIR = Path("models")
 MODEL_DIR.mkdir(exist_ok=True)
+CKPT_DIR   = MODEL_DIR / "checkpoints"
+CKPT_EVERY = 100_000                          # env steps between checkpoints
+CKPT_KEEP  = 3                                # newest checkpoints kept on disk
 
 
 # ------------------------------------------------------------------
 #                   ENV & STAT-COPY HELPERS
 # ------------------------------------------------------------------
-def make_env(phase: int) -> Callable[[], FootballEnv]:
+def make_env(phase: int,
+             rewards: dict[str, float] | None = None,
+             difficulty: float | None = None) -> Callable[[], FootballEnv]:
     """Factory so we can pass a lambda to DummyVecEnv."""
-    return lambda: FootballEnv(phase=phase, render_mode=None)
+    return lambda: FootballEnv(phase=phase, render_mode=None,
+                               frame_skip=FRAME_SKIP, obs_pool=OBS_POOL,
+                               rewards=rewards, difficulty=difficulty)
+
+
+def make_vec_env(phase: int, n_envs: int = N_ENVS,
+                 backend: str = VEC_BACKEND,
+                 workers: int | None = N_WORKERS,
+                 rewards: dict[str, float] | None = None,
+                 seed: int | None = None,
+                 difficulty: float | None = None) -> VecEnv:
+    """
+    *n_envs* matches behind one VecEnv:
+    ``batched`` → one FootballVecEnv in this process,
+    ``subproc`` → FootballVecEnv slices in *workers* processes (shared memory),
+    ``dummy``   → the original DummyVecEnv of FootballEnv objects.
+    *rewards* overrides reward weights (see ``environment.REWARDS``);
+    *difficulty* replaces the phase spawn box (``environment.spawn_box``).
+    """
+    if backend == "batched":
+        return FootballVecEnv(n_envs, phase=phase, seed=seed,
+                              frame_skip=FRAME_SKIP, obs_pool=OBS_POOL,
+                              rewards=rewards, difficulty=difficulty)
+    if backend == "subproc":
+        return ShmVecEnv(n_envs, n_workers=workers, phase=phase, seed=seed,
+                         frame_skip=FRAME_SKIP, obs_pool=OBS_POOL,
+                         rewards=rewards, difficulty=difficulty)
+    if backend == "dummy":
+        venv = DummyVecEnv([make_env(phase, rewards, difficulty)
+                            for _ in range(n_envs)])
+        venv.seed(seed)
+        return venv
+    raise ValueError(f"unknown vec backend {backend!r}")
 
 
 def _copy(src: np.ndarray, dst: np.ndarray) -> None:
@@ -69,7 +143,7 @@ def clone_stats(src: VecNormalize, dst: VecNormalize) -> None:
 
 
 def wrap_with_stats(prev: VecNormalize | None,
-                    raw:  DummyVecEnv) -> VecNormalize:
+                    raw:  VecEnv) -> VecNormalize:
     """Create a VecNormalize wrapper, cloning stats if *prev* exists."""
     v = VecNormalize(raw, norm_obs=True, norm_reward=True, clip_obs=10.0)
     if prev is not None:
@@ -83,33 +157,237 @@ def wrap_with_stats(prev: VecNormalize | None,
 def train_phase(phase: int,
                 steps: int,
                 model: PPO | None,
-                stats: VecNormalize | None) -> tuple[PPO, VecNormalize]:
-    """Train or continue training for one curriculum phase."""
-    raw_env  = DummyVecEnv([make_env(phase) for _ in range(N_ENVS)])
+                stats: VecNormalize | None,
+                *,
+                n_envs: int = N_ENVS,
+                backend: str = VEC_BACKEND,
+                workers: int | None = N_WORKERS,
+                rewards: dict[str, float] | None = None,
+                difficulty: float | None = None,
+                model_kwargs: dict[str, Any] | None = None,
+                progress_bar: bool = True,
+                checkpoint: AsyncCheckpoint | None = None,
+                callbacks: list[BaseCallback] | None = None,
+                offset: int = 0,
+                init: Path | None = None,
+                done: int = 0,
+                record: Path | None = None,
+                record_every: int = 1) -> tuple[PPO, VecNormalize]:
+    """
+    Train or continue training for one curriculum phase.
+
+    *init* is a PPO ``.zip`` to start from: a checkpoint that has already
+    trained *done* of this phase's *steps* (the LR schedule carries on from
+    there) or a warm start such as ``behavior_cloning``'s.  Callbacks with
+    ``start_phase`` get the phase and global step offset.  *record* streams
+    the raw rollouts to ``record/phase<k>/``.
+    """
+    seed     = (model_kwargs or {}).get("seed")
+    raw_env  = make_vec_env(phase, n_envs, backend, workers, rewards,
+                            seed=None if seed is None else seed + 1000 * phase,
+                            difficulty=difficulty)
+    if record is not None:
+        raw_env = RecordingVecEnv(raw_env, Path(record) / f"phase{phase}",
+                                  every=record_every, phase=phase)
     venv     = wrap_with_stats(stats, raw_env)
+    if getattr(stats, "venv", None) is not None:
+        stats.close()                      # stop the previous phase's workers
 
-    if model is None:
-        model = create_model(venv)
+    if init is not None:
+        model = PPO.load(init, env=venv)
+    elif model is None:
+        model = create_model(venv, **(model_kwargs or {}))
     else:
         model.set_env(venv)
 
-    print(f"\n▶ Phase {phase}  |  {steps:,} steps")
-    model.learn(total_timesteps=steps, progress_bar=True)
+    print(f"\n▶ Phase {phase}  |  {steps:,} steps"
+          + (f"  (resuming at {done:,})" if done else ""))
+    cbs = [c for c in (checkpoint, *(callbacks or ())) if c is not None]
+    for c in cbs:
+        if hasattr(c, "start_phase"):
+            c.start_phase(phase, offset, done)
+    if steps > done:
+        model.learn(total_timesteps=steps - done, progress_bar=progress_bar,
+                    callback=cbs or None, reset_num_timesteps=not done)
+    if checkpoint is not None:             # phase boundary: resume starts the next one
+        checkpoint.save(model, venv, phase_done=True)
     return model, venv
 
 
+def train_curriculum(steps: list[int] = STEPS, *,
+                     checkpoint: AsyncCheckpoint | None = None,
+                     resume: bool = False,
+                     init_model: Path | None = None,
+                     init_vecnorm: Path | None = None,
+                     scheduler: CurriculumScheduler | None = None, **kwargs: Any
+                     ) -> tuple[PPO, VecNormalize]:
+    """
+    All phases in order; *kwargs* go to ``train_phase``.  *init_model* /
+    *init_vecnorm* warm-start phase 0 (ignored when a checkpoint resumes).
+    With a ``phase`` *scheduler* the lengths in *steps* are upper bounds;
+    a ``difficulty`` one runs ``sum(steps)`` steps on the continuous spawn
+    difficulty instead of the phases.
+    """
+    schedule = list(steps)
+    if scheduler is not None:
+        kwargs["callbacks"] = [*(kwargs.get("callbacks") or ()), scheduler]
+        scheduler.n_phases = len(steps)
+        if scheduler.mode == "difficulty":
+            steps = [sum(steps)]
+        if checkpoint is not None:         # level & promotions go into meta.json
+            checkpoint.meta["scheduler"] = scheduler.state
+
+    model: PPO | None              = None
+    vec_stats: VecNormalize | None = None
+    start, done, offset, init = 0, 0, 0, None
+    if resume:
+        found = latest_checkpoint(checkpoint.root if checkpoint else CKPT_DIR)
+        if found is None:
+            print("No checkpoint found – starting from scratch.")
+        else:
+            ckpt, meta = found
+            init = ckpt / "model.zip"
+            if meta.get("schedule", schedule) != schedule:
+                raise ValueError(f"checkpoint schedule {meta['schedule']} "
+                                 f"differs from {schedule}")
+            start, done = meta["phase"], meta["phase_steps"]
+            offset = meta["total_steps"] - done
+            vec_stats = load_vecnorm(ckpt)
+            if scheduler is not None:
+                scheduler.state.update(meta.get("scheduler", {}))
+            if meta.get("phase_done") or done >= steps[start]:
+                model = PPO.load(init)     # phase finished: continue with the next
+                start, done, offset, init = start + 1, 0, offset + done, None
+            print(f"Resuming from {found[0].name}: phase {start}, "
+                  f"{meta['total_steps']:,} steps done")
+
+    if init is None and model is None and init_model is not None:
+        init = Path(init_model)
+        if init_vecnorm is not None:
+            vec_stats = load_vecnorm(init_vecnorm)
+        print(f"Warm start from {init}")
+
+    if scheduler is not None and scheduler.mode == "difficulty":
+        kwargs["difficulty"] = scheduler.state["difficulty"]
+    for phase in range(start, len(steps)):
+        model, vec_stats = train_phase(phase, steps[phase], model, vec_stats,
+                                       checkpoint=checkpoint, offset=offset,
+                                       init=init, done=done, **kwargs)
+        offset += model.num_timesteps
+        init, done = None, 0
+        if scheduler is not None and scheduler.promoted and scheduler.state["top"]:
+            break                          # finish=True: skill reached early
+    if checkpoint is not None:
+        checkpoint.wait()
+    return model, vec_stats
+
+
 # ------------------------------------------------------------------
 #                          ENTRY POINT
 # ------------------------------------------------------------------
-def main() -> None:
-    model: PPO | None          = None
-    vec_stats: VecNormalize | None = None
+def throughput_report(n_envs: int, steps: int = 300,
+                      worker_counts: list[int] | None = None) -> list[dict]:
+    """Random-action env steps/sec for each backend / worker count."""
+    if worker_counts is None:
+        cores = available_cores()
+        worker_counts = sorted({1, *[w for w in (2, 4, 8, 16, 32, 64) if w < cores], cores})
+    configs = [("batched", None)] + [("subproc", w) for w in worker_counts
+                                     if w <= n_envs]
+    rows = []
+    for backend, workers in configs:
+        venv = make_vec_env(0, n_envs, backend, workers)
+        venv.reset()
+        acts = np.random.randint(0, 6, size=(steps, n_envs))
+        t0 = time.perf_counter()
+        for a in acts:
+            venv.step(a)
+        dt = time.perf_counter() - t0
+        venv.close()
+        rows.append(dict(backend=backend, workers=workers or 1,
+                         steps_per_sec=steps * n_envs / dt))
+
+    print(f"\n{'backend':<10}{'workers':>8}{'steps/sec':>14}   ({n_envs} envs)")
+    for r in rows:
+        print(f"{r['backend']:<10}{r['workers']:>8}{r['steps_per_sec']:>14,.0f}")
+    return rows
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    p = argparse.ArgumentParser(description="Curriculum PPO training")
+    p.add_argument("--vec", choices=("batched", "subproc", "dummy"),
+                   default=VEC_BACKEND, help="vector env backend")
+    p.add_argument("--n-envs", type=int, default=N_ENVS,
+                   help="parallel matches")
+    p.add_argument("--workers", type=int, default=N_WORKERS,
+                   help="subproc worker processes (default: all cores)")
+    p.add_argument("--resume", action="store_true",
+                   help="continue from the newest checkpoint in models/checkpoints")
+    p.add_argument("--ckpt-every", type=int, default=CKPT_EVERY,
+                   help="env steps between checkpoints (0 disables)")
+    p.add_argument("--ckpt-keep", type=int, default=CKPT_KEEP,
+                   help="checkpoints kept on disk")
+    p.add_argument("--init-model", type=Path, default=None,
+                   help="warm-start phase 0 from this PPO .zip (e.g. models/bc_agent.zip)")
+    p.add_argument("--init-vecnorm", type=Path, default=None,
+                   help="VecNormalize stats that go with --init-model")
+    p.add_argument("--adaptive", choices=CurriculumScheduler.MODES, default=None,
+                   help="success-driven schedule: early phase ends / continuous difficulty")
+    p.add_argument("--promote-rate", type=float, default=0.7,
+                   help="rolling training goal rate that passes a level")
+    p.add_argument("--window", type=int, default=200,
+                   help="episodes in the rolling window")
+    p.add_argument("--replay", type=float, default=0.2,
+                   help="share of envs replaying easier levels")
+    p.add_argument("--finish", action="store_true",
+                   help="stop once the last level is passed")
+    p.add_argument("--record", type=Path, default=None,
+                   help="record rollouts (state, action, reward) to this folder")
+    p.add_argument("--record-every", type=int, default=1,
+                   help="record one env step in N")
+    p.add_argument("--no-profile", dest="profile", action="store_false",
+                   help="do not record the per-stage time breakdown")
+    p.add_argument("--bench", action="store_true",
+                   help="print env steps/sec per backend / worker count and exit")
+    return p.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> None:
+    args = parse_args(argv)
+    if args.bench:
+        throughput_report(args.n_envs)
+        return
 
-    for phase, steps in enumerate(STEPS):
-        model, vec_stats = train_phase(phase, steps, model, vec_stats)
+    ckpt = None
+    if args.ckpt_every > 0:
+        ckpt = AsyncCheckpoint(CKPT_DIR, args.ckpt_every, args.ckpt_keep, verbose=1,
+                               meta=dict(schedule=STEPS, n_envs=args.n_envs))
+    sched = None
+    if args.adaptive:
+        sched = CurriculumScheduler(args.adaptive, promote_rate=args.promote_rate,
+                                    window=args.window, replay=args.replay,
+                                    finish=args.finish, verbose=1)
+    profiler = TrainingProfiler() if args.profile else None
+    model, vec_stats = train_curriculum(STEPS, n_envs=args.n_envs,
+                                        backend=args.vec, workers=args.workers,
+                                        checkpoint=ckpt, resume=args.resume,
+                                        init_model=args.init_model,
+                                        init_vecnorm=args.init_vecnorm,
+                                        scheduler=sched, record=args.record,
+                                        record_every=args.record_every,
+                                        callbacks=[profiler] if profiler else None)
 
     model.save(MODEL_DIR / "final_agent")
     vec_stats.save(MODEL_DIR / "final_vecnorm.pkl")
+    vec_stats.close()
+    ModelRegistry(MODEL_DIR).register(MODEL_DIR / "final_agent.zip",
+                                      vecnorm=MODEL_DIR / "final_vecnorm.pkl",
+                                      phase=len(STEPS) - 1)
+    if sched is not None:
+        for row in sched.state["promotions"]:
+            print(f"  level {row['level']:<5g} passed at {row['step']:>10,}  "
+                  f"after {row['level_steps']:>9,} steps  goal rate {row['goal_rate']:.2f}")
+    if profiler is not None:
+        print("\n" + profiler.table())
     print("✅ Training finished.")
 
 
@@ -0,0 +1,359 @@
+"""
+Batched NumPy vector env – N FootballEnv matches in one process
+===============================================================
+
+Drop-in replacement for ``DummyVecEnv([FootballEnv] * N)``.  All match
+state lives in struct-of-arrays buffers (one float64 array per field,
+length N) and every ``step`` moves, kicks, rewards, terminates and
+auto-resets all N matches in a single vectorised pass.
+
+The physics and reward terms mirror ``FootballEnv.step`` exactly:
+
+* ``Player.move``  → ±speed on one axis, clamped to the 800×600 window
+* ``Player.kick_ball`` / ``Ball.kick`` → foot-to-ball impulse, speed cap
+* ``Ball.move``    → Euler step, friction, small-velocity clamp, walls
+* reward terms     → see ``rl_agent.environment`` module docstring
+* ``frame_skip`` / ``obs_pool`` → same action-repeat semantics as
+  ``FootballEnv``; envs that finish mid-repeat are frozen until reset
+
+``difficulty`` (scalar or one per env, NaN = phase box) spawns from the
+continuous ``environment.spawn_box``; like ``phase`` it can be changed
+per env with ``set_attr`` and applies from that env's next reset.
+Every finished episode carries ``info["outcome"]`` (+1 / −1 / 0).
+
+``match_stats=True`` adds ``info["match"]`` to every finished episode:
+``goal`` / ``own_goal`` flags, ``steps`` (ticks), ``kicks``, ``forward``
+(kicks towards the opponent goal) and ``on_target`` – kicks after which the ball, untouched, would cross the
+goal line between the posts (``core.trajectory.crossing_x``).  Used by
+``rl_agent.evaluate``; off by default so training pays nothing for it.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Sequence
+
+import numpy as np
+from stable_baselines3.common.vec_env.base_vec_env import (
+    VecEnv, VecEnvIndices, VecEnvStepReturn,
+)
+
+from core.ball import Ball
+from core.trajectory import crossing_x
+from rl_agent.environment import (
+    W, TOP_MARGIN, FIELD_H, FOOT_R, MAX_V, MAX_STEPS, SPAWN_EASY, SPAWN_HARD,
+    OBS_POOLS, build_spaces, pool_obs, reward_weights,
+)
+
+
+# ── entity constants (must match core.ball / core.player) ───────────
+WIN_H        = 600                     # Ball/Player clamp to the full window
+P_W, P_H     = 40, 40                  # Player.width / Player.height
+P_SPEED      = 2.5
+P_START      = (700.0, float(TOP_MARGIN + FIELD_H // 2))
+KICK_POWER   = 2.5
+B_RADIUS     = 6
+B_MAX_SPEED  = 5.0
+B_FRICTION   = 0.97
+B_STOP_V     = 0.05
+GOAL_TOP, GOAL_BOTTOM = 240, 360
+
+# action id → (dx, dy) unit move, matches FootballEnv.step
+_MOVE_DX = np.array([0, 0, 0, -1, 1, 0], np.float64)
+_MOVE_DY = np.array([0, -1, 1, 0, 0, 0], np.float64)
+
+# per-env state arrays (frozen for envs that finish mid action-repeat)
+_STATE_FIELDS = ("t", "px", "py", "bx", "by", "bvx", "bvy",
+                 "has_ball", "prev_dist", "kicks", "forward", "on_target")
+
+
+class FootballVecEnv(VecEnv):
+    """Vectorised ``FootballEnv`` with struct-of-arrays state."""
+
+    def __init__(self, num_envs: int, phase: int | Sequence[int] = 0,
+                 seed: int | None = None, frame_skip: int = 1,
+                 obs_pool: str = "last",
+                 rewards: dict[str, float] | None = None,
+                 match_stats: bool = False,
+                 difficulty: float | Sequence[float] | None = None):
+        assert frame_skip >= 1 and obs_pool in OBS_POOLS
+        self.render_mode = None
+        self.match_stats = match_stats
+        self.rw          = reward_weights(rewards)
+        self.frame_skip  = int(frame_skip)
+        self.obs_pool    = obs_pool
+        obs_space, act_space = build_spaces(self.frame_skip, obs_pool)
+
+        n = int(num_envs)
+        self.phase = np.broadcast_to(
+            np.asarray(phase, np.int64), (n,)).copy()
+        self.difficulty = np.broadcast_to(np.asarray(
+            np.nan if difficulty is None else difficulty, np.float64), (n,)).copy()
+        self.rng   = np.random.default_rng(seed)
+
+        # ── struct-of-arrays match state ────────────────────────────
+        self.t         = np.zeros(n, np.int64)
+        self.px        = np.zeros(n, np.float64)
+        self.py        = np.zeros(n, np.float64)
+        self.bx        = np.zeros(n, np.float64)
+        self.by        = np.zeros(n, np.float64)
+        self.bvx       = np.zeros(n, np.float64)
+        self.bvy       = np.zeros(n, np.float64)
+        self.has_ball  = np.zeros(n, bool)
+        self.prev_dist = np.zeros(n, np.float64)
+        self.kicks     = np.zeros(n, np.int64)        # match_stats only
+        self.forward   = np.zeros(n, np.int64)
+        self.on_target = np.zeros(n, np.int64)
+
+        self._obs      = np.zeros((n, 6), np.float32)
+        self._actions  = np.zeros(n, np.int64)
+
+        super().__init__(n, obs_space, act_space)
+
+    # ------------------------------------------------------------------
+    # VecEnv API
+    def reset(self) -> np.ndarray:
+        if self._seeds[0] is not None:
+            self.rng = np.random.default_rng(self._seeds[0])
+        self._reset_seeds()
+        self._reset_options()
+        self._reset_idx(np.arange(self.num_envs))
+        return self._pooled([self._write_obs()])
+
+    def step_async(self, actions: np.ndarray) -> None:
+        self._actions = np.asarray(actions, np.int64).reshape(self.num_envs)
+
+    def step_wait(self) -> VecEnvStepReturn:
+        a, n = self._actions, self.num_envs
+        rew        = np.zeros(n, np.float64)
+        terminated = np.zeros(n, bool)
+        truncated  = np.zeros(n, bool)
+        frames: list[np.ndarray] = []
+
+        # action repeat: envs that finish mid-repeat are frozen -----------
+        for k in range(self.frame_skip):
+            active = ~(terminated | truncated)
+            if k and not active.any():
+                break
+            r, te, tr = self._tick(a, None if k == 0 else active)
+            rew += np.where(active, r, 0.0)
+            terminated |= te & active
+            truncated  |= tr & active
+            if self.frame_skip > 1:
+                cur = self._write_obs().copy()
+                if self.obs_pool == "max" and frames:
+                    # keep each env's own last two live ticks
+                    live = active[:, None]
+                    frames = [np.where(live, frames[-1], frames[0]),
+                              np.where(live, cur, frames[-1])]
+                else:
+                    frames.append(cur)
+
+        dones = terminated | truncated
+        obs = self._pooled(frames)
+        infos: list[dict[str, Any]] = [{} for _ in range(n)]
+        if dones.any():
+            idx = np.flatnonzero(dones)
+            for i in idx:
+                infos[i]["terminal_observation"] = obs[i].copy()
+                infos[i]["TimeLimit.truncated"] = bool(
+                    truncated[i] and not terminated[i])
+                infos[i]["outcome"] = int(self.bx[i] <= 5) - int(self.bx[i] >= W - 5) \
+                    if terminated[i] else 0
+                if self.match_stats:
+                    infos[i]["match"] = dict(
+                        goal=bool(self.bx[i] <= 5), own_goal=bool(self.bx[i] >= W - 5),
+                        steps=int(self.t[i]), kicks=int(self.kicks[i]),
+                        forward=int(self.forward[i]), on_target=int(self.on_target[i]))
+            self._reset_idx(idx)
+            fresh = self._pooled([self._write_obs()])
+            obs[idx] = fresh[idx]
+
+        return obs, rew.astype(np.float32), dones, infos
+
+    def _tick(self, a: np.ndarray, active: np.ndarray | None
+              ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """One physics tick for all envs (inactive ones are rolled back)."""
+        saved = None
+        if active is not None and not active.all():
+            saved = [getattr(self, f).copy() for f in _STATE_FIELDS]
+        self.t += 1
+
+        # movement -------------------------------------------------------
+        self.px += _MOVE_DX[a] * P_SPEED
+        self.py += _MOVE_DY[a] * P_SPEED
+        np.clip(self.px, 0, W - P_W, out=self.px)
+        np.clip(self.py, 0, WIN_H - P_H, out=self.py)
+
+        # kick (dist measured before the ball moves) ---------------------
+        dx, dy, dist = self._foot_delta()
+        did_kick = (a == 5) & (dist < FOOT_R)
+        hit = did_kick & (dist != 0)
+        if hit.any():
+            safe = np.where(hit, dist, 1.0)
+            self.bvx += np.where(hit, dx / safe * KICK_POWER, 0.0)
+            self.bvy += np.where(hit, dy / safe * KICK_POWER, 0.0)
+            speed = np.hypot(self.bvx, self.bvy)
+            scale = np.where(hit & (speed > B_MAX_SPEED),
+                             B_MAX_SPEED / np.maximum(speed, 1e-12), 1.0)
+            self.bvx *= scale
+            self.bvy *= scale
+        kick_left = did_kick & (self.bvx < 0)
+        if self.match_stats and did_kick.any():
+            self._count_kicks(did_kick)
+
+        # physics --------------------------------------------------------
+        self._ball_move()
+        _, _, dist = self._foot_delta()
+        self.has_ball = dist < FOOT_R
+
+        # distance shaping ----------------------------------------------
+        rw = self.rw
+        r = rw["dist_pen"] * dist
+        r += np.where(self.has_ball, 0.0, rw["shrink_bon"] * (self.prev_dist - dist))
+        self.prev_dist = dist
+
+        # kick reward ----------------------------------------------------
+        avx, avy = np.abs(self.bvx), np.abs(self.bvy)
+        cos = avx / (avx + avy + 1e-6)
+        r += np.where(kick_left, rw["kick_left_w"] * cos, 0.0)
+        r += np.where(did_kick & ~kick_left, rw["kick_right"], 0.0)
+
+        # holding penalty ------------------------------------------------
+        r += np.where(self.has_ball & ~did_kick, rw["hold_pen"], 0.0)
+
+        # goals & termination -------------------------------------------
+        scored   = self.bx <= 5
+        own_goal = ~scored & (self.bx >= W - 5)
+        r += np.where(scored, rw["goal_rew"], 0.0)
+        r += np.where(own_goal, rw["own_goal_pen"], 0.0)
+        terminated = scored | own_goal
+        truncated  = self.t >= MAX_STEPS
+
+        if saved is not None:
+            for f, old in zip(_STATE_FIELDS, saved):
+                np.copyto(getattr(self, f), old, where=~active)
+        return r, terminated, truncated
+
+    def close(self) -> None:
+        pass
+
+    def get_attr(self, attr_name: str, indices: VecEnvIndices = None) -> list[Any]:
+        idx = self._get_indices(indices)
+        value = getattr(self, attr_name)
+        if isinstance(value, np.ndarray) and value.shape[:1] == (self.num_envs,):
+            return [value[i].item() if value.ndim == 1 else value[i] for i in idx]
+        return [value for _ in idx]
+
+    def set_attr(self, attr_name: str, value: Any, indices: VecEnvIndices = None) -> None:
+        current = getattr(self, attr_name)
+        if isinstance(current, np.ndarray) and current.shape[:1] == (self.num_envs,):
+            current[list(self._get_indices(indices))] = value
+        else:
+            setattr(self, attr_name, value)
+
+    def env_method(self, method_name: str, *method_args,
+                   indices: VecEnvIndices = None, **method_kwargs) -> list[Any]:
+        result = getattr(self, method_name)(*method_args, **method_kwargs)
+        return [result for _ in self._get_indices(indices)]
+
+    def env_is_wrapped(self, wrapper_class, indices: VecEnvIndices = None) -> list[bool]:
+        return [False for _ in self._get_indices(indices)]
+
+    # ------------------------------------------------------------------
+    # helpers
+    def _reset_idx(self, idx: np.ndarray) -> None:
+        """Re-spawn the matches in *idx* (same boxes as FootballEnv.reset)."""
+        if len(idx) == 0:
+            return
+        phase = self.phase[idx]
+        mid = TOP_MARGIN + FIELD_H // 2
+
+        x_lo = np.select([phase == 0, phase == 1], [500, 250], 50)
+        y_lo = np.select([phase == 0, phase == 1],
+                         [mid - 60, mid - 150], TOP_MARGIN + 50)
+        y_hi = np.select([phase == 0, phase == 1],
+                         [mid + 60, mid + 150], TOP_MARGIN + FIELD_H - 50)
+
+        x_hi = np.full(len(idx), 750)
+        d = self.difficulty[idx]
+        cont = np.isfinite(d)
+        if cont.any():                                # environment.spawn_box
+            e, h = np.array(SPAWN_EASY), np.array(SPAWN_HARD)
+            box = np.rint(e + np.clip(d[cont], 0, 1)[:, None] * (h - e)).astype(np.int64)
+            x_lo[cont], x_hi[cont], y_lo[cont], y_hi[cont] = box.T
+
+        self.bx[idx]  = self.rng.integers(x_lo, x_hi + 1)
+        self.by[idx]  = self.rng.integers(y_lo, y_hi + 1)
+        self.bvx[idx] = 0.0
+        self.bvy[idx] = 0.0
+        self.px[idx], self.py[idx] = P_START
+        self.t[idx]   = 0
+        self.has_ball[idx] = False
+        self.kicks[idx] = 0
+        self.forward[idx] = 0
+        self.on_target[idx] = 0
+
+        fx = self.px[idx] + P_W / 2
+        fy = self.py[idx] + P_H
+        self.prev_dist[idx] = np.hypot(self.bx[idx] - fx, self.by[idx] - fy)
+
+    def _count_kicks(self, did_kick: np.ndarray) -> None:
+        """Kick tally; a kick is on target if the free ball would score."""
+        self.kicks += did_kick
+        self.forward += did_kick & (self.bvx < 0)
+        # x travel is bounded by |v|/(1−f): most dribbling taps cannot reach;
+        # without a wall bounce the ball meets x=5 on its straight line, so
+        # a crossing clearly outside the posts is a miss
+        cand = did_kick & (self.bvx < 0) & (self.bx - 5 <= -self.bvx / (1 - B_FRICTION))
+        y5 = self.by + self.bvy * (self.bx - 5) / np.maximum(-self.bvx, 1e-12)
+        wide = ((y5 < GOAL_TOP - 2) | (y5 > GOAL_BOTTOM + 2)) \
+            & (y5 > B_RADIUS) & (y5 < WIN_H - B_RADIUS)
+        for i in np.flatnonzero(cand & ~wide):
+            ball = Ball(self.bx[i], self.by[i])
+            ball.vel_x, ball.vel_y = self.bvx[i], self.bvy[i]
+            if crossing_x(ball, 5) is not None:
+                self.on_target[i] += 1
+
+    def _foot_delta(self) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Ball offset from every player's foot point and its length."""
+        dx = self.bx - (self.px + P_W / 2)
+        dy = self.by - (self.py + P_H)
+        return dx, dy, np.hypot(dx, dy)
+
+    def _ball_move(self) -> None:
+        """Vectorised ``Ball.move``."""
+        self.bx += self.bvx
+        self.by += self.bvy
+        self.bvx *= B_FRICTION
+        self.bvy *= B_FRICTION
+        self.bvx[np.abs(self.bvx) < B_STOP_V] = 0.0
+        self.bvy[np.abs(self.bvy) < B_STOP_V] = 0.0
+
+        top = self.by - B_RADIUS <= 0
+        bot = ~top & (self.by + B_RADIUS >= WIN_H)
+        self.by[top] = B_RADIUS
+        self.by[bot] = WIN_H - B_RADIUS
+        self.bvy[top | bot] *= -1
+
+        wall  = (self.by < GOAL_TOP) | (self.by > GOAL_BOTTOM)
+        left  = wall & (self.bx - B_RADIUS < 0)
+        right = wall & ~left & (self.bx + B_RADIUS > W)
+        self.bx[left]  = B_RADIUS
+        self.bx[right] = W - B_RADIUS
+        self.bvx[left | right] *= -1
+
+    def _pooled(self, frames: list[np.ndarray]) -> np.ndarray:
+        """Fresh (copied) policy observation from per-tick frames."""
+        if not frames:
+            frames = [self._write_obs()]
+        return np.array(pool_obs(frames, self.obs_pool, self.frame_skip))
+
+    def _write_obs(self) -> np.ndarray:
+        o = self._obs
+        o[:, 0] = self.px
+        o[:, 1] = self.py - TOP_MARGIN
+        o[:, 2] = self.bx
+        o[:, 3] = self.by - TOP_MARGIN
+        o[:, 4] = np.clip(self.bvx / MAX_V, -1, 1)
+        o[:, 5] = np.clip(self.bvy / MAX_V, -1, 1)
+        return o
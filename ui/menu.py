@@ -1,6 +1,6 @@
 # ui/menu.py
 from __future__ import annotations
-import os, pygame
+import os, time, pygame
 from pathlib import Path
 from utils.save_load import list_users, delete_game
 
@@ -22,7 +22,12 @@ class Menu:
     BTN_HOVER = (180, 200, 225)
     TXT_COLOR = (0, 0, 0)
 
-    def __init__(self, screen: pygame.Surface):
+    def __init__(self, screen: pygame.Surface, loader=None):
+        """
+        loader : utils.loader.BackgroundLoader (isteğe bağlı). Verilirse
+                 arka plan ve logo `queue_assets` işleriyle yüklenir; menü
+                 hemen açılır, görseller hazır olunca belirir.
+        """
         self.sc        = screen
         self.W, self.H = screen.get_size()
 
@@ -45,14 +50,15 @@ class Menu:
         self.mode = "main"                 # main / new / load
         self.last_mode_switch_time = 0
 
-        # Graphics
-        self.bg   = pygame.transform.scale(pygame.image.load(BG_FILE), (self.W, self.H))
-        self.logo = pygame.image.load(LOGO_FILE)
-        lw = self.W // 4
-        lh = int(self.logo.get_height() * (lw / self.logo.get_width()))
-        self.logo = pygame.transform.scale(self.logo, (lw, lh))
+        # Graphics (loader varsa arka planda; o zamana kadar düz renk)
+        self.loader = loader
+        self.bg = self.logo = None
+        if loader is None:
+            self._set_bg(pygame.image.load(BG_FILE))
+            self._set_logo(pygame.image.load(LOGO_FILE))
         self.logo_alpha = 0
         self.fade_in_speed = 3
+        self.first_frame_t = None          # time.perf_counter() of first flip
 
         # Sounds
         self.snd_hover = pygame.mixer.Sound(HOVER_SND)
@@ -64,6 +70,30 @@ class Menu:
         self.scroll_y = 0
         self._refresh_users()
 
+    # ───────────── arka plan yükleme ─────────────
+    @staticmethod
+    def queue_assets(loader):
+        """Büyük menü görsellerini (1–2 MB PNG) loader kuyruğuna ekle."""
+        loader.add("menu_bg", pygame.image.load, BG_FILE)
+        loader.add("logo", pygame.image.load, LOGO_FILE)
+
+    def _set_bg(self, img):
+        self.bg = pygame.transform.scale(img, (self.W, self.H)).convert()
+
+    def _set_logo(self, img):
+        lw = self.W // 4
+        lh = int(img.get_height() * (lw / img.get_width()))
+        self.logo = pygame.transform.scale(img, (lw, lh)).convert_alpha()
+        self.logo.set_alpha(self.logo_alpha)
+
+    def _poll_assets(self):
+        if self.loader is None:
+            return
+        if self.bg is None and (img := self.loader.poll("menu_bg")) is not None:
+            self._set_bg(img)
+        if self.logo is None and (img := self.loader.poll("logo")) is not None:
+            self._set_logo(img)
+
     # ───────────── yardımcılar ─────────────
     def _refresh_users(self):
         self.users = list_users()
@@ -173,14 +203,19 @@ class Menu:
                         else:
                             self.text += ev.unicode
 
-            # ---- logo fade ----
-            if self.logo_alpha < 255:
+            # ---- logo fade (logo hazır olunca başlar) ----
+            self._poll_assets()
+            if self.logo is not None and self.logo_alpha < 255:
                 self.logo_alpha = min(255, self.logo_alpha + self.fade_in_speed)
                 self.logo.set_alpha(self.logo_alpha)
 
             # ---- draw ----
-            self.sc.blit(self.bg, (0,0))
-            self.sc.blit(self.logo, ((self.W - self.logo.get_width())//2, 50))
+            if self.bg is not None:
+                self.sc.blit(self.bg, (0,0))
+            else:
+                self.sc.fill(self.BLUE_BG)
+            if self.logo is not None:
+                self.sc.blit(self.logo, ((self.W - self.logo.get_width())//2, 50))
             title = self.big_font.render("Goalai", True, (0,255,255))
             self.sc.blit(title, title.get_rect(center=(self.W//2, self.H-80)))
 
@@ -270,7 +305,15 @@ class Menu:
             pygame.draw.rect(self.sc,(50,50,50),(x,y,bar_w,bar_h))
             pygame.draw.rect(self.sc,(0,200,0),(x,y,int(bar_w*volume),bar_h))
 
+            # AI hazır mı? (arka plan yükleme sürüyorsa küçük gösterge)
+            if self.loader is not None and not self.loader.ready.is_set():
+                done, total = self.loader.progress()
+                s = self.font.render(f"Loading AI… {done}/{total}", True, (255,255,255))
+                self.sc.blit(s, (20, self.H - s.get_height() - 14))
+
             pygame.display.flip()
+            if self.first_frame_t is None:
+                self.first_frame_t = time.perf_counter()
             clock.tick(60)
 
         # dönüş
@@ -0,0 +1,69 @@
+# ui/sprites.py
+#
+# Sunum katmanı: core/ içindeki saf simülasyon nesneleri (Ball, Player)
+# için sprite, yazı tipi ve vuruş sesi.  Eğitim süreçleri bu modülü hiç
+# import etmez; böylece SDL / ses başlatılmaz.
+from __future__ import annotations
+import pygame
+from pathlib import Path
+
+from core.player import Player
+
+# ─────────────────────────── PROJE & ASSET YOLLARI ──────────────────────────
+PROJECT_ROOT = Path(__file__).resolve().parent.parent          # …/AI‑Football‑Game
+ASSETS_DIR   = PROJECT_ROOT / "assets"
+
+BALL_FILE    = ASSETS_DIR / "ball.png"
+SPRITE_FILES = {
+    "red":  ASSETS_DIR / "sprite_team1.png",
+    "blue": ASSETS_DIR / "sprite_team2.png",
+}
+KICK_SOUND   = ASSETS_DIR / "kick.wav"
+
+# ─────────────────────────────── CACHE'LER ─────────────────────────────────
+# Sprite'lar sadece bir kez yüklenir (display açıldıktan sonra, ilk çizimde)
+_ball_cache:   dict[int, pygame.Surface] = {}
+_player_cache: dict[str, pygame.Surface] = {}
+_id_font:      pygame.font.Font | None   = None
+
+
+def ball_sprite(radius: int) -> pygame.Surface:
+    """radius*3 boyutuna ölçeklenmiş top sprite'ı (yarıçap başına cache)."""
+    if radius not in _ball_cache:
+        img = pygame.image.load(BALL_FILE).convert_alpha()
+        _ball_cache[radius] = pygame.transform.scale(img, (radius * 3, radius * 3))
+    return _ball_cache[radius]
+
+
+def player_sprite(team: str) -> pygame.Surface:
+    """50×50 takım sprite'ı (takım başına cache)."""
+    if team not in _player_cache:
+        img = pygame.image.load(SPRITE_FILES[team]).convert_alpha()
+        _player_cache[team] = pygame.transform.scale(img, (50, 50))
+    return _player_cache[team]
+
+
+def draw_ball(screen: pygame.Surface, ball) -> None:
+    """Top sprite’ını merkez konumuna göre blit’ler."""
+    # Sprite’ın üst-sol köşe koordinatını hesapla
+    blit_x = int(ball.x - ball.radius)
+    blit_y = int(ball.y - ball.radius)
+    screen.blit(ball_sprite(ball.radius), (blit_x, blit_y))
+
+
+def draw_player(screen: pygame.Surface, player) -> None:
+    """Oyuncu sprite’ını ve isteğe bağlı ID’sini çizer."""
+    global _id_font
+    screen.blit(player_sprite(player.team), (int(player.x), int(player.y)))
+    if player.player_id:
+        if _id_font is None:
+            _id_font = pygame.font.SysFont(None, 16)
+        txt_surf = _id_font.render(player.player_id, True, (255, 255, 255))
+        screen.blit(txt_surf, (player.x, player.y - 12))
+
+
+def enable_kick_sound(volume: float = 0.5) -> None:
+    """Vuruş sesini yükle ve Player.on_kick kancasına bağla (sadece oyun)."""
+    snd = pygame.mixer.Sound(KICK_SOUND)
+    snd.set_volume(volume)
+    Player.on_kick = lambda _player: snd.play()
@@ -0,0 +1,75 @@
+# utils/loader.py
+#
+# Background loading for startup: named jobs (agent checkpoint, big images,
+# sounds) run on one daemon thread while the menu is already on screen.
+# The main thread polls (`poll`) or blocks (`get`) per job; `ready` is set
+# once every required job has finished.  `optional=True` jobs (cache warming
+# and the like) run after the required ones and count towards neither
+# `ready` nor `progress`, so the menu never waits on them.  Jobs should return plain data / unconverted
+# surfaces – anything that touches the display (`convert()`) belongs on the
+# main thread.
+
+import threading
+import time
+
+
+class BackgroundLoader:
+    def __init__(self):
+        self._jobs = []                    # (name, fn, args, optional)
+        self._done = {}                    # name -> threading.Event
+        self.results = {}
+        self.errors = {}
+        self.timings = {}                  # name -> seconds spent in fn
+        self.ready = threading.Event()
+        self._thread = None
+
+    def add(self, name, fn, *args, optional=False):
+        """Queue *fn(*args)* under *name* (required jobs first, each in insertion order)."""
+        self._jobs.append((name, fn, args, optional))
+        self._done[name] = threading.Event()
+        return self
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="loader", daemon=True)
+        self._thread.start()
+        return self
+
+    def _run(self):
+        for optional in (False, True):
+            for name, fn, args, opt in self._jobs:
+                if opt == optional:
+                    self._run_job(name, fn, args)
+            if not optional:
+                self.ready.set()
+
+    def _run_job(self, name, fn, args):
+        t0 = time.perf_counter()
+        try:
+            self.results[name] = fn(*args)
+        except Exception as exc:           # re-raised in the caller's thread by get()
+            self.errors[name] = exc
+        self.timings[name] = time.perf_counter() - t0
+        self._done[name].set()
+
+    # ── main-thread access ──
+    def is_done(self, name):
+        return self._done[name].is_set()
+
+    def poll(self, name, default=None):
+        """Result of *name* if it has finished, else *default* (never blocks)."""
+        if not self._done[name].is_set():
+            return default
+        return self.get(name)
+
+    def get(self, name, timeout=None):
+        """Block until *name* has finished and return its result."""
+        if not self._done[name].wait(timeout):
+            raise TimeoutError(f"loader job {name!r} not finished")
+        if name in self.errors:
+            raise self.errors[name]
+        return self.results[name]
+
+    def progress(self):
+        """(finished, total) over the required jobs."""
+        required = [self._done[name] for name, _, _, opt in self._jobs if not opt]
+        return sum(e.is_set() for e in required), len(required)
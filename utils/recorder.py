@@ -0,0 +1,223 @@
+# utils/recorder.py
+#
+# Compact per-frame trajectory recorder for live matches and training
+# rollouts.  Every row is one fixed-size record (FRAME_DTYPE, 49 bytes);
+# rows are appended to chunk files of raw records that np.memmap can open
+# directly, so a recording is read back chunk by chunk without ever being
+# loaded into RAM as a whole:
+#
+#     recordings/<name>/meta.json        dtype, source, chunk sizes, extras
+#     recordings/<name>/chunk_00000.bin  chunk_rows × FRAME_DTYPE, no header
+#
+# The caller's thread only copies values into a preallocated block (a few
+# µs per frame); full blocks go through a queue to a writer thread that
+# does the file I/O and rolls chunk files.  A chunk's row count is its file
+# size / itemsize, so recordings cut short by a crash stay readable.
+#
+# Coordinates are game (screen) pixels, blue = the PPO agent, red = the
+# human (NaN when there is none, e.g. training).  `red_keys` is a bitmask
+# of the human's held keys (KEY_BITS) so diagonal / multi-key play is kept.
+
+import json
+import os
+import queue
+import threading
+import time
+
+import numpy as np
+
+FRAME_DTYPE = np.dtype([
+    ("frame",       "<u4"),      # step / frame counter of the stream
+    ("env",         "<u2"),      # env index (0 for a live match)
+    ("episode",     "<u4"),      # per-env episode (live match: goal count)
+    ("blue_x",      "<f4"), ("blue_y", "<f4"),
+    ("red_x",       "<f4"), ("red_y",  "<f4"),
+    ("ball_x",      "<f4"), ("ball_y", "<f4"),
+    ("ball_vx",     "<f4"), ("ball_vy", "<f4"),
+    ("blue_action", "i1"),       # 0 noop, 1-4 up/down/left/right, 5 kick; -1 none
+    ("red_keys",    "u1"),       # KEY_BITS mask
+    ("reward",      "<f4"),      # env reward (0 in live matches)
+    ("done",        "u1"),       # episode ended on this row
+])
+KEY_BITS = {"up": 1, "down": 2, "left": 4, "right": 8,
+            "kick": 16, "pass": 32, "tackle": 64}
+
+META_FILE  = "meta.json"
+CHUNK_ROWS = 1 << 16             # ≈ 3 MB per chunk, ~18 min of a 60 FPS match
+BLOCK_ROWS = 1024                # rows handed to the writer at once
+
+
+def state_of(blue, ball, red=None):
+    """(blue x/y, red x/y, ball x/y/vx/vy) of game objects, in FRAME_DTYPE order."""
+    return (blue.x, blue.y,
+            red.x if red is not None else np.nan, red.y if red is not None else np.nan,
+            ball.x, ball.y, ball.vel_x, ball.vel_y)
+
+
+def key_mask(keys, controls):
+    """KEY_BITS mask of the held keys; *controls* is HumanController.controls."""
+    return sum(bit for name, bit in KEY_BITS.items()
+               if name in controls and keys[controls[name]])
+
+
+def _chunk_name(i):
+    return f"chunk_{i:05d}.bin"
+
+
+class TrajectoryRecorder:
+    def __init__(self, path, source="match", chunk_rows=CHUNK_ROWS,
+                 block_rows=BLOCK_ROWS, **meta):
+        """
+        path       : recording directory (created; existing chunks are replaced)
+        source     : "match" / "train" – stored in meta.json
+        chunk_rows : rows per chunk file (multiple of block_rows)
+        meta       : extra JSON-able fields for meta.json (user, model, …)
+        """
+        self.path = str(path)
+        os.makedirs(self.path, exist_ok=True)
+        for f in os.listdir(self.path):
+            if f.startswith("chunk_"):
+                os.remove(os.path.join(self.path, f))
+        self.block_rows = block_rows
+        self.chunk_rows = max(block_rows, chunk_rows // block_rows * block_rows)
+        self.meta = dict(format=1, source=source,
+                         dtype=np.lib.format.dtype_to_descr(FRAME_DTYPE),
+                         itemsize=FRAME_DTYPE.itemsize, chunk_rows=self.chunk_rows,
+                         created=time.strftime("%Y-%m-%dT%H:%M:%S"), **meta)
+        self._write_meta()
+
+        self._free = queue.SimpleQueue()         # recycled blocks
+        self._full = queue.SimpleQueue()         # (block, rows) or None = stop
+        self._block = self._new_block()
+        self._n = 0                              # rows in the current block
+        self.rows = 0
+        self.add_s = 0.0                         # caller-thread time spent in add*
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="recorder", daemon=True)
+        self._thread.start()
+
+    # ── caller side (game loop / VecEnv wrapper) ──
+    def _new_block(self):
+        try:
+            return self._free.get_nowait()
+        except queue.Empty:
+            return np.zeros(self.block_rows, FRAME_DTYPE)
+
+    def _flush_block(self):
+        self._full.put((self._block, self._n))
+        self._block, self._n = self._new_block(), 0
+
+    def add(self, frame, state, action=-1, keys=0, reward=0.0, done=False,
+            env=0, episode=0):
+        """One row; *state* is a `state_of(...)` tuple taken when the frame began."""
+        t0 = time.perf_counter()
+        self._block[self._n] = (frame, env, episode, *state,
+                                action, keys, reward, done)
+        self._n += 1
+        self.rows += 1
+        if self._n == self.block_rows:
+            self._flush_block()
+        self.add_s += time.perf_counter() - t0
+
+    def add_batch(self, **columns):
+        """Many rows at once: equal-length arrays / scalars per FRAME_DTYPE field."""
+        t0 = time.perf_counter()
+        n = max(np.size(v) for v in columns.values())
+        done = 0
+        while done < n:
+            k = min(n - done, self.block_rows - self._n)
+            rows = self._block[self._n:self._n + k]
+            rows[:] = 0
+            rows["red_x"] = rows["red_y"] = np.nan
+            rows["blue_action"] = -1
+            for name, v in columns.items():
+                rows[name] = v[done:done + k] if np.ndim(v) else v
+            self._n += k
+            done += k
+            if self._n == self.block_rows:
+                self._flush_block()
+        self.rows += n
+        self.add_s += time.perf_counter() - t0
+
+    def close(self):
+        """Flush the partial block, stop the writer and finalise meta.json."""
+        if self._closed:
+            return
+        self._closed = True
+        if self._n:
+            self._full.put((self._block, self._n))
+        self._full.put(None)
+        self._thread.join()
+        self.meta.update(rows=self.rows, closed=time.strftime("%Y-%m-%dT%H:%M:%S"))
+        self._write_meta()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # ── writer thread ──
+    def _run(self):
+        chunk, in_chunk, f = 0, 0, None
+        while True:
+            item = self._full.get()
+            if item is None:
+                break
+            block, n = item
+            if f is None:
+                f = open(os.path.join(self.path, _chunk_name(chunk)), "wb")
+            f.write(memoryview(block[:n]).cast("B"))
+            in_chunk += n
+            self._free.put(block)
+            if in_chunk >= self.chunk_rows:
+                f.close()
+                f, chunk, in_chunk = None, chunk + 1, 0
+        if f is not None:
+            f.close()
+
+    def _write_meta(self):
+        tmp = os.path.join(self.path, META_FILE + ".tmp")
+        with open(tmp, "w") as f:
+            json.dump(self.meta, f, indent=2)
+        os.replace(tmp, os.path.join(self.path, META_FILE))
+
+
+class Recording:
+    """Read side: one read-only memmap per chunk, nothing loaded up front."""
+
+    def __init__(self, path):
+        self.path = str(path)
+        with open(os.path.join(self.path, META_FILE)) as f:
+            self.meta = json.load(f)
+        self.dtype = np.lib.format.descr_to_dtype(
+            [tuple(d) for d in self.meta["dtype"]])
+        self.chunks = []
+        i = 0
+        while os.path.exists(p := os.path.join(self.path, _chunk_name(i))):
+            n = os.path.getsize(p) // self.dtype.itemsize
+            if n:
+                self.chunks.append(np.memmap(p, self.dtype, "r", shape=(n,)))
+            i += 1
+        self._starts = np.cumsum([0] + [len(c) for c in self.chunks])
+
+    def __len__(self):
+        return int(self._starts[-1])
+
+    def __iter__(self):
+        """Chunks in order (memmaps – slicing them reads only what is touched)."""
+        return iter(self.chunks)
+
+    def rows(self, start, stop):
+        """Copy of rows [start, stop) across chunk boundaries."""
+        out = []
+        for c, s in zip(self.chunks, self._starts):
+            lo, hi = max(start - s, 0), min(stop - s, len(c))
+            if lo < hi:
+                out.append(np.asarray(c[lo:hi]))
+        return np.concatenate(out) if out else np.zeros(0, self.dtype)
+
+    def column(self, name):
+        """One field over the whole recording (only that field is copied)."""
+        return np.concatenate([np.asarray(c[name]) for c in self.chunks]) \
+            if self.chunks else np.zeros(0, self.dtype[name])
@@ -0,0 +1,93 @@
+# utils/spatial.py
+#
+# Uniform-grid spatial hash over the pitch for player / ball proximity
+# queries.  Entities are bucketed by their contact point – a Player's foot
+# (x + width/2, y + height), the Ball's centre – so radius queries use the
+# same distances as kick_ball / dribble.  Player.move / Ball.move / Ball.step
+# call `index.update(self)` themselves; after teleporting an entity
+# (resets, save-game loads) call `update(entity)` by hand.
+
+KICK_RANGE   = 40     # Player.kick_ball foot-to-ball radius
+TACKLE_RANGE = 25     # HumanController.try_tackle
+PASS_RANGE   = 120    # AIController pass distance
+
+
+def contact_point(e):
+    """Foot point for players (anything with width/height), centre otherwise."""
+    if hasattr(e, "height"):
+        return e.x + e.width / 2, e.y + e.height
+    return e.x, e.y
+
+
+class SpatialHash:
+    def __init__(self, cell=50):
+        self.cell = cell
+        self._cells = {}          # (cx, cy) -> list of entities
+        self._where = {}          # id(entity) -> (cx, cy)
+
+    def __len__(self):
+        return len(self._where)
+
+    def _key(self, x, y):
+        return int(x // self.cell), int(y // self.cell)
+
+    # ── bakım ──
+    def insert(self, e):
+        """Add *e* and make its move() keep the index up to date."""
+        key = self._key(*contact_point(e))
+        self._cells.setdefault(key, []).append(e)
+        self._where[id(e)] = key
+        e.index = self
+
+    def remove(self, e):
+        key = self._where.pop(id(e), None)
+        if key is not None:
+            self._cells[key].remove(e)
+        e.index = None
+
+    def update(self, e):
+        """O(1): only touches the buckets when the entity changes cell."""
+        key = self._key(*contact_point(e))
+        old = self._where[id(e)]
+        if key != old:
+            self._cells[old].remove(e)
+            self._cells.setdefault(key, []).append(e)
+            self._where[id(e)] = key
+
+    def update_all(self):
+        for bucket in list(self._cells.values()):
+            for e in list(bucket):
+                self.update(e)
+
+    # ── sorgular ──
+    def query(self, x, y, radius, team=None, exclude=None):
+        """Entities whose contact point lies strictly within *radius* of (x, y)."""
+        c = self.cell
+        x0, y0 = int((x - radius) // c), int((y - radius) // c)
+        x1, y1 = int((x + radius) // c), int((y + radius) // c)
+        r2 = radius * radius
+        out = []
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                for e in self._cells.get((cx, cy), ()):
+                    if e is exclude or (team is not None and getattr(e, "team", None) != team):
+                        continue
+                    ex, ey = contact_point(e)
+                    if (ex - x) ** 2 + (ey - y) ** 2 < r2:
+                        out.append(e)
+        return out
+
+    def near(self, e, radius, team=None):
+        """Entities within *radius* of *e*'s contact point (excluding *e*)."""
+        x, y = contact_point(e)
+        return self.query(x, y, radius, team=team, exclude=e)
+
+    def nearest(self, x, y, radius, team=None, exclude=None):
+        """Closest entity within *radius*, or None."""
+        best, best_d = None, radius * radius
+        for e in self.query(x, y, radius, team=team, exclude=exclude):
+            ex, ey = contact_point(e)
+            d = (ex - x) ** 2 + (ey - y) ** 2
+            if d < best_d:
+                best, best_d = e, d
+        return best